@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark sentinel matching with and without git pathspec pushdown.
+
+Builds a synthetic tree with ``--files`` paths in a throwaway repository
+(index-only, so no working tree is written), then lists candidates for the
+sentinel globs both ways and checks that the matches are identical.
+
+    PYTHONPATH=src python scripts/bench_sentinels.py --files 1000000 --glob 'config/**'
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess as sp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from forked import gitutil as g
+from forked.guards import _make_spec, glob_pathspecs
+
+DEFAULT_GLOBS = ["config/**", "**/settings.yml", "branding/*.svg"]
+
+
+def _build_tree(repo: Path, files: int) -> str:
+    sp.run(["git", "init", "-q", str(repo)], check=True)
+    blob = g.ensure_empty_blob(cwd=str(repo))
+    lines = []
+    for n in range(files):
+        top = ("src", "lib", "config", "branding", "vendor")[n % 5]
+        name = ("module.py", "settings.yml", "logo.svg", "README.md")[n % 4]
+        lines.append(f"100644 {blob}\t{top}/d{n % 97}/e{n % 31}/{n}-{name}\n")
+    sp.run(
+        ["git", "update-index", "--add", "--index-info"],
+        cwd=repo,
+        input="".join(sorted(lines, key=lambda line: line.split("\t", 1)[1])).encode(),
+        check=True,
+    )
+    return sp.run(
+        ["git", "write-tree"], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def _timed(label: str, tree: str, pathspecs: list[str], globs: list[str], cwd: str):
+    spec = _make_spec(globs)
+    start = time.perf_counter()
+    listed = g.tree_paths(tree, pathspecs, cwd=cwd)
+    matched = [path for path in listed if spec.match_file(path)]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} listed={len(listed):>9} matched={len(matched):>8} {elapsed:8.2f}s")
+    return matched
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--glob", action="append", dest="globs")
+    args = parser.parse_args(argv)
+    globs = args.globs or DEFAULT_GLOBS
+
+    pathspecs = glob_pathspecs(globs)
+    if pathspecs is None:
+        print("globs have no pathspec translation; guard falls back to the full listing")
+        return 1
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        start = time.perf_counter()
+        tree = _build_tree(repo, args.files)
+        print(f"built {args.files} paths in {time.perf_counter() - start:.2f}s")
+        full = _timed("full", tree, [], globs, str(repo))
+        pushed = _timed("pathspec", tree, pathspecs, globs, str(repo))
+    if full != pushed:
+        print("MISMATCH between full listing and pathspec listing", file=sys.stderr)
+        return 2
+    print("results identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
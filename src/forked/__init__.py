@@ -3,9 +3,13 @@
 __all__ = [
     "cli",
     "build",
+    "cache",
     "config",
+    "conflict_index",
     "conflicts",
     "guards",
+    "matrix",
+    "plan",
     "resolver",
     "sync",
 ]
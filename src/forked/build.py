@@ -4,41 +4,31 @@ import json
 import os
 import re
 import subprocess
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import typer
-from pathspec import PathSpec
 
 from . import gitutil as g
+from .cache import PatchIdIndex, PickMemo
 from .config import Config
-from .conflicts import ConflictContext, apply_recommendations, create_conflict_writer
+from .conflicts import (
+    DEFAULT_CONFLICT_JOBS,
+    ConflictContext,
+    apply_recommendations,
+    create_conflict_writer,
+    precedence_matcher,
+    precedence_payload,
+    record_conflict_outcomes,
+)
+from .journal import StepJournal, build_journal_path
+from .plan import BuildPlan, PatchPlan, PlannedCommit, plan_build
 from .resolver import ResolvedSelection
 
-
-def _conflict_paths(cwd: str | None = None) -> list[str]:
-    out = g.run(["status", "--porcelain"], cwd=cwd).stdout.splitlines()
-    return [line.split()[-1] for line in out if line.startswith(("U", "AA", "DD", "DU", "UD"))]
-
-
-def _apply_path_bias(cfg: Config, cwd: str | None = None) -> bool:
-    ours = PathSpec.from_lines("gitwildmatch", cfg.path_bias.ours or [])
-    theirs = PathSpec.from_lines("gitwildmatch", cfg.path_bias.theirs or [])
-    conflicted = _conflict_paths(cwd)
-    applied = False
-    for path in conflicted:
-        if ours.match_file(path):
-            g.run(["checkout", "--ours", "--", path], cwd=cwd)
-            g.run(["add", path], cwd=cwd)
-            applied = True
-        elif theirs.match_file(path):
-            g.run(["checkout", "--theirs", "--", path], cwd=cwd)
-            g.run(["add", path], cwd=cwd)
-            applied = True
-    return applied
-
-
 WINDOWS_ABS_PATTERN = re.compile(r"^[A-Za-z]:[\\/]")
 
 
@@ -87,28 +77,284 @@ def _resolve_worktree_dir(cfg: Config, overlay_id: str) -> Path:
     return target
 
 
-def _rev_list_range(base: str, tip: str) -> list[str]:
-    revs = g.run(["rev-list", "--reverse", f"{base}..{tip}"]).stdout.splitlines()
-    return [rev for rev in revs if rev]
+def _trunk_ranges(trunk_sha: str, bases: Sequence[str]) -> dict[str, list[str]]:
+    """Return ``base..trunk`` commit lists for every base from one ``rev-list`` walk."""
+    floor = (
+        g.run(["merge-base", "--octopus", *bases]).stdout.strip() if len(bases) > 1 else bases[0]
+    )
+    out = g.run(["rev-list", "--parents", trunk_sha, f"^{floor}"]).stdout.splitlines()
+    parents = {fields[0]: fields[1:] for fields in (line.split() for line in out) if fields}
+    ranges: dict[str, list[str]] = {}
+    for base in bases:
+        # Drop everything ``base`` can reach; what remains is base..trunk.
+        reachable: set[str] = set()
+        stack = [base] if base in parents else []
+        while stack:
+            sha = stack.pop()
+            if sha in reachable:
+                continue
+            reachable.add(sha)
+            stack.extend(parent for parent in parents[sha] if parent in parents)
+        ranges[base] = [sha for sha in parents if sha not in reachable]
+    return ranges
+
+
+def _upstream_equivalents(trunk_sha: str, patches: Sequence[PatchPlan]) -> dict[str, set[str]]:
+    """Map each patch branch to its commits whose patch-id already landed in trunk.
+
+    Mirrors ``git cherry trunk branch`` for the whole stack at once: patch-ids
+    come from the persistent index in ``.forked/cache`` and only commits it has
+    not seen yet are diffed, so the per-branch decision is a set lookup.
+    """
+    pending = [patch for patch in patches if patch.commits]
+    if not pending:
+        return {}
+    ranges = _trunk_ranges(trunk_sha, list(dict.fromkeys(p.merge_base for p in pending)))
+    index = PatchIdIndex.load(g.repo_root())
+    index.ensure(
+        [sha for commits in ranges.values() for sha in commits]
+        + [commit.sha for patch in pending for commit in patch.commits]
+    )
+    index.save()
+    upstream_ids = {
+        base: {pid for sha in commits if (pid := index.get(sha))}
+        for base, commits in ranges.items()
+    }
+    return {
+        patch.branch: {
+            commit.sha
+            for commit in patch.commits
+            if (pid := index.get(commit.sha)) and pid in upstream_ids[patch.merge_base]
+        }
+        for patch in pending
+    }
 
 
 def _upstream_equivalent_commits(trunk: str, branch: str) -> set[str]:
-    """Return commit SHAs already contained in the trunk branch."""
-    cp = g.run(["cherry", trunk, branch], check=False)
+    """Return commit SHAs of ``branch`` already contained in the trunk branch."""
+    plan = plan_build(
+        trunk, [branch], skip_upstream_equivalents=True, upstream_equivalents=_upstream_equivalents
+    )
+    return set(plan.patches[0].skipped)
+
+
+def plan_overlay(
+    trunk: str, selection: ResolvedSelection, skip_upstream_equivalents: bool = False
+) -> BuildPlan:
+    """Return the batched build plan for ``selection`` replayed onto ``trunk``."""
+    return plan_build(
+        trunk,
+        selection.patches,
+        skip_upstream_equivalents=skip_upstream_equivalents,
+        upstream_equivalents=_upstream_equivalents,
+    )
+
+
+BUILD_ENGINES = ("worktree", "tree")
+CHERRY_PICK_PREFIX = "(cherry picked from commit "
+TRAILER_PATTERN = re.compile(r"^[A-Za-z0-9-]+:\s")
+
+
+@dataclass
+class CommitMeta:
+    """Fields of a raw commit object needed to replay it."""
+
+    tree: str
+    parents: list[str]
+    author: tuple[str, str, str]
+    message: str
+
+
+def _read_commit(sha: str, cwd: str | None = None) -> CommitMeta:
+    raw = g.read_blob(sha, cwd=cwd)
+    if raw is None:
+        raise RuntimeError(f"Unable to read commit {sha}")
+    header, _, message = raw.decode("utf-8", "replace").partition("\n\n")
+    tree = ""
+    parents: list[str] = []
+    author = ("", "", "")
+    for line in header.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "tree":
+            tree = value
+        elif key == "parent":
+            parents.append(value)
+        elif key == "author":
+            name, _, rest = value.partition(" <")
+            email, _, date = rest.partition("> ")
+            author = (name, email, date)
+    return CommitMeta(tree=tree, parents=parents, author=author, message=message)
+
+
+def _has_trailer_footer(message: str) -> bool:
+    paragraphs = message.strip().split("\n\n")
+    if len(paragraphs) < 2:
+        return False
+    lines = [line for line in paragraphs[-1].splitlines() if line.strip()]
+    return bool(lines) and all(
+        TRAILER_PATTERN.match(line) or line.startswith(CHERRY_PICK_PREFIX) for line in lines
+    )
+
+
+def _cherry_pick_message(sha: str, message: str) -> str:
+    """Mirror the message ``git cherry-pick -x`` records."""
+    body = message if message.endswith("\n") else message + "\n"
+    if not _has_trailer_footer(body):
+        body += "\n"
+    return f"{body}{CHERRY_PICK_PREFIX}{sha})\n"
+
+
+@dataclass
+class PickOutcome:
+    """Result of simulating one cherry-pick in the object database."""
+
+    status: str  # clean | conflict | empty | unsupported
+    commit: str | None = None
+    conflicts: list[str] = field(default_factory=list)
+
+
+def simulate_pick(head: str, sha: str, cwd: str | None = None) -> PickOutcome:
+    """Cherry-pick ``sha`` onto ``head`` in the object database.
+
+    Only a ``clean`` outcome carries a commit. Conflicts, empty results and
+    merge/root commits (which ``cherry-pick`` itself refuses) need a worktree.
+    """
+    meta = _read_commit(sha, cwd=cwd)
+    if len(meta.parents) != 1:
+        return PickOutcome(status="unsupported")
+    tree, conflicts = g.merge_tree(meta.parents[0], head, sha, cwd=cwd)
+    if conflicts:
+        return PickOutcome(status="conflict", conflicts=conflicts)
+    head_tree = g.object_info(f"{head}^{{tree}}", cwd=cwd)
+    if head_tree is not None and head_tree[0] == tree:
+        return PickOutcome(status="empty")
+    name, email, date = meta.author
+    env = {"GIT_AUTHOR_NAME": name, "GIT_AUTHOR_EMAIL": email, "GIT_AUTHOR_DATE": date}
+    commit = g.commit_tree(tree, [head], _cherry_pick_message(sha, meta.message), cwd=cwd, env=env)
+    return PickOutcome(status="clean", commit=commit)
+
+
+def replay_commit(head: str, sha: str, cwd: str | None = None) -> str | None:
+    """Return the commit for ``sha`` picked onto ``head``, or None if it needs a worktree."""
+    return simulate_pick(head, sha, cwd=cwd).commit
+
+
+@dataclass
+class StackSimulation:
+    """Outcome of replaying a whole plan in the object database."""
+
+    head: str
+    applied: int
+    stop: tuple[PatchPlan, PlannedCommit, PickOutcome] | None = None
+
+
+def simulate_stack(plan: BuildPlan, memo: PickMemo | None = None) -> StackSimulation:
+    """Replay ``plan`` onto its trunk commit pick by pick, stopping at the first non-clean pick.
+
+    Nothing is checked out; clean picks are written as unreferenced commits
+    and recorded in ``memo`` (when given) so a later build can reuse them.
+    """
+    head = plan.trunk_sha
+    applied = 0
+    for patch in plan.patches:
+        for commit in patch.to_apply:
+            picked = memo.get(head, commit.sha) if memo is not None else None
+            if picked is None:
+                outcome = simulate_pick(head, commit.sha)
+                if outcome.commit is None:
+                    return StackSimulation(head, applied, (patch, commit, outcome))
+                picked = outcome.commit
+                if memo is not None:
+                    memo.put(head, commit.sha, picked)
+            head = picked
+            applied += 1
+    return StackSimulation(head, applied)
+
+
+def predict_overlay(
+    cfg: Config,
+    trunk: str,
+    selection: ResolvedSelection,
+    *,
+    skip_upstream_equivalents: bool = False,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """Simulate the whole selected stack on ``trunk`` and report the first stop.
+
+    Conflicted paths carry the same precedence block a conflict bundle would.
+    """
+    plan = plan_overlay(trunk, selection, skip_upstream_equivalents)
+    memo = PickMemo.load(g.repo_root()) if use_cache else None
+    simulation = simulate_stack(plan, memo)
+    if memo is not None:
+        memo.save()
+    first_stop: dict[str, Any] | None = None
+    if simulation.stop is not None:
+        patch, commit, outcome = simulation.stop
+        feature_names = selection.patch_feature_map.get(patch.branch, [])
+        matcher = precedence_matcher(cfg, feature_names)
+        precedence = {
+            path: precedence_payload(cfg, path, feature_names, matcher)
+            for path in outcome.conflicts
+        }
+        first_stop = {
+            "reason": outcome.status,
+            "patch_branch": patch.branch,
+            "patch_commit": commit.sha,
+            "summary": commit.summary,
+            "feature": feature_names[0] if feature_names else None,
+            "files": [{"path": path, "precedence": block} for path, block in precedence.items()],
+            "auto_resolvable": bool(precedence)
+            and all(
+                block["recommended"] in ("ours", "theirs", "hunks") for block in precedence.values()
+            ),
+        }
+    return {
+        "predict_version": 1,
+        "status": "clean" if first_stop is None else first_stop["reason"],
+        "trunk": plan.trunk,
+        "trunk_sha": plan.trunk_sha,
+        "estimated_cost": plan.estimated_cost,
+        "applied": simulation.applied,
+        "head": simulation.head,
+        "first_conflict": first_stop,
+    }
+
+
+def _prepare_trunk(cfg: Config) -> str:
+    """Fetch upstream and reset trunk to it; return the ref that was checked out before."""
+    g.run(["fetch", cfg.upstream.remote])
+    prev_ref = g.current_ref()
+    g.run(["checkout", "-B", cfg.branches.trunk, f"{cfg.upstream.remote}/{cfg.upstream.branch}"])
+    return prev_ref
+
+
+def write_build_note(telemetry: dict[str, Any]):
+    """Record build provenance for ``telemetry['overlay']`` in refs/notes/forked-meta."""
+    overlay = telemetry["overlay"]
+    selection = telemetry["selection"]
+    note_lines = [
+        f"forked.build {telemetry['timestamp']}",
+        f"overlay={overlay}",
+        f"source={selection['source']}",
+    ]
+    if selection.get("overlay_profile"):
+        note_lines.append(f"overlay_profile={selection['overlay_profile']}")
+    if selection.get("features"):
+        note_lines.append("features=" + ", ".join(selection["features"]))
+    note_lines.append("patches=" + ", ".join(selection["patches"]))
+    if selection.get("skip_upstream_equivalents"):
+        note_lines.append("skip_upstream_equivalents=true")
+    note = "\n".join(note_lines)
+    cp = g.run(
+        ["notes", "--ref", "refs/notes/forked-meta", "add", "-f", "-m", note, overlay],
+        check=False,
+    )
     if cp.returncode != 0:
         typer.echo(
-            f"[build] Failed to compute upstream-equivalent commits for {branch}: {cp.stderr.strip()}",
+            f"[build] Warning: failed to write git note for {overlay}: {cp.stderr.strip()}",
             err=True,
         )
-        return set()
-    skip: set[str] = set()
-    for line in cp.stdout.splitlines():
-        if not line.startswith("- "):
-            continue
-        parts = line.split()
-        if len(parts) >= 2:
-            skip.add(parts[1])
-    return skip
 
 
 def build_overlay(
@@ -124,10 +370,21 @@ def build_overlay(
     conflict_blobs_dir: str | None = None,
     on_conflict: str = "stop",
     on_conflict_exec: str | None = None,
+    engine: str = "worktree",
+    use_cache: bool = True,
+    prepare_trunk: bool = True,
+    resume: bool = False,
+    conflict_jobs: int = DEFAULT_CONFLICT_JOBS,
+    conflict_format: str = "json",
+    lazy_diffs: bool | None = None,
 ) -> tuple[str, Path, dict[str, Any]]:
     conflict_mode = (on_conflict or "stop").lower()
     if conflict_mode not in {"stop", "bias", "exec"}:
         raise typer.BadParameter(f"Unsupported --on-conflict mode '{on_conflict}'.")
+    if engine not in BUILD_ENGINES:
+        raise typer.BadParameter(f"Unsupported --engine '{engine}'.")
+    if engine == "tree":
+        g.require_merge_tree("--engine tree")
     if auto_continue and conflict_mode == "stop":
         conflict_mode = "bias"
     if conflict_mode == "exec" and not on_conflict_exec:
@@ -144,9 +401,22 @@ def build_overlay(
     conflict_writer = None
     repo = g.repo_root()
 
-    g.run(["fetch", cfg.upstream.remote])
-    prev_ref = g.current_ref()
-    g.run(["checkout", "-B", cfg.branches.trunk, f"{cfg.upstream.remote}/{cfg.upstream.branch}"])
+    journal_path = build_journal_path(repo, overlay_id)
+    resumed_from: StepJournal | None = None
+    if resume:
+        resumed_from = StepJournal.load(journal_path)
+        if resumed_from is None or resumed_from.kind != "build":
+            typer.secho(
+                f"[build] No interrupted build of {overlay_id} to resume.", fg=typer.colors.RED
+            )
+            raise typer.Exit(code=2)
+        # Resuming keeps the trunk commit the interrupted build started from.
+        prepare_trunk = False
+    trunk_ref = resumed_from.trunk_sha if resumed_from else cfg.branches.trunk
+
+    prev_ref: str | None = None
+    if prepare_trunk:
+        prev_ref = _prepare_trunk(cfg)
 
     if selection is None:
         selection = ResolvedSelection(
@@ -162,27 +432,54 @@ def build_overlay(
         )
 
     overlay = f"{cfg.branches.overlay_prefix}{overlay_id}"
+    resumed: set[str] = set()
+    resume_head: str | None = None
+    if resumed_from is not None:
+        in_worktree = use_worktree and cfg.worktree.enabled
+        resumed, resume_head = _resume_point(
+            overlay, resumed_from, g.worktree_for_branch(overlay) if in_worktree else None
+        )
     wt_existing: Path | None = None
+    cwd: str | None = None
     if use_worktree and cfg.worktree.enabled:
         wt_existing = g.worktree_for_branch(overlay)
         if wt_existing and not wt_existing.exists():
             g.run(["worktree", "prune"])
             wt_existing = g.worktree_for_branch(overlay)
-
-        if wt_existing:
-            wt_path = wt_existing
-            cwd = str(wt_path)
-            g.run(["checkout", overlay], cwd=cwd)
-            g.run(["reset", "--hard", cfg.branches.trunk], cwd=cwd)
-        else:
-            wt_path = _resolve_worktree_dir(cfg, overlay_id)
-            g.run(["worktree", "add", "-B", overlay, str(wt_path), cfg.branches.trunk])
-            cwd = str(wt_path)
+        wt_path = wt_existing or _resolve_worktree_dir(cfg, overlay_id)
     else:
         g.ensure_clean()
-        g.run(["checkout", "-B", overlay, cfg.branches.trunk])
         wt_path = Path.cwd() / f".overlay-{overlay_id}"
-        cwd = None
+
+    worktree_added = False
+
+    def materialize(target: str) -> str | None:
+        """Point the overlay branch at ``target`` and check it out where picks happen."""
+        nonlocal worktree_added
+        if not (use_worktree and cfg.worktree.enabled):
+            g.run(["checkout", "-B", overlay, target])
+            return None
+        if wt_existing or worktree_added:
+            g.run(["checkout", overlay], cwd=str(wt_path))
+            g.run(["reset", "--hard", target], cwd=str(wt_path))
+        else:
+            g.run(["worktree", "add", "-B", overlay, str(wt_path), target])
+            worktree_added = True
+        return str(wt_path)
+
+    # While ``pending_head`` is set the overlay only exists in the object
+    # database: memoised picks (any engine) and tree-engine picks advance it
+    # without touching files. The overlay is checked out once it is needed;
+    # the tree engine goes back to memory after each pick that needed it.
+    memo = PickMemo.load(repo) if use_cache else None
+    pending_head: str | None = None
+    worktree_head: str | None = None
+    if resume_head is not None:
+        pending_head = resume_head
+    elif engine == "tree" or memo is not None:
+        pending_head = g.run(["rev-parse", cfg.branches.trunk]).stdout.strip()
+    else:
+        cwd = materialize(cfg.branches.trunk)
 
     selection_data = {
         "source": selection.source,
@@ -215,6 +512,10 @@ def build_overlay(
         rebuild_tokens.extend(["--exclude", pattern])
     if skip_upstream_equivalents:
         rebuild_tokens.append("--skip-upstream-equivalents")
+    if engine != "worktree":
+        rebuild_tokens.extend(["--engine", engine])
+    if not use_cache:
+        rebuild_tokens.append("--no-cache")
     rebuild_tokens.extend(["--on-conflict", conflict_mode])
     rebuild_command = " ".join(_quote_cli(token) for token in rebuild_tokens)
 
@@ -241,14 +542,48 @@ def build_overlay(
         }
         if bias_logs:
             telemetry["bias_actions"] = bias_logs
+        if resumed:
+            telemetry["resumed_steps"] = len(resumed)
+        if memo is not None:
+            memo.save()
+        record_conflict_outcomes(repo, conflict_records)
         log_path = logs_dir / "forked-build.log"
         with log_path.open("a", encoding="utf-8") as fh:
             fh.write(json.dumps(telemetry) + "\n")
         return telemetry
 
-    for branch in selection.patches:
-        base = g.merge_base(cfg.branches.trunk, branch)
-        commits = _rev_list_range(base, branch)
+    plan = plan_overlay(trunk_ref, selection, skip_upstream_equivalents)
+    typer.echo(
+        f"[build] Plan: {plan.commit_count} commit(s) across {len(plan.patches)} branch(es), "
+        f"{plan.estimated_cost} to apply"
+    )
+    if resumed:
+        typer.echo(f"[build] Resuming after {len(resumed)} completed pick(s)")
+    journal = StepJournal(
+        path=journal_path,
+        kind="build",
+        trunk_sha=plan.trunk_sha,
+        done=[],
+        options={
+            "overlay_id": overlay_id,
+            "selection": asdict(selection),
+            "skip_upstream_equivalents": skip_upstream_equivalents,
+            "engine": engine,
+            "use_cache": use_cache,
+            "use_worktree": use_worktree,
+        },
+    )
+
+    def checkpoint(stopped_at: str | None = None):
+        """Record completed picks and the commit they produced for ``--resume``."""
+        journal.head = pending_head or g.run(["rev-parse", "HEAD"], cwd=cwd).stdout.strip()
+        journal.stopped_at = stopped_at
+        journal.save()
+
+    for patch_plan in plan.patches:
+        branch = patch_plan.branch
+        base = patch_plan.merge_base
+        commits = patch_plan.commits
         commit_entries: list[dict[str, str]] = []
         skipped_entries: list[dict[str, str]] = []
 
@@ -268,16 +603,41 @@ def build_overlay(
             patch_summaries.append(summary_entry)
             continue
 
-        skip_shas: set[str] = set()
-        if skip_upstream_equivalents:
-            skip_shas = _upstream_equivalent_commits(cfg.branches.trunk, branch)
+        skip_shas = patch_plan.skipped
 
-        for sha in commits:
-            summary = g.run(["show", "-s", "--format=%s", sha]).stdout.strip()
+        for planned in commits:
+            sha = planned.sha
+            summary = planned.summary
             if skip_shas and sha in skip_shas:
                 skipped_entries.append({"sha": sha, "summary": summary})
                 summary_entry["skipped_count"] += 1
                 continue
+            if sha in resumed:
+                journal.done.append(sha)
+                commit_entries.append({"sha": sha, "summary": summary})
+                summary_entry["commit_count"] += 1
+                continue
+
+            if pending_head is not None:
+                picked = memo.get(pending_head, sha) if memo is not None else None
+                if picked is None and engine == "tree":
+                    picked = replay_commit(pending_head, sha)
+                    if picked is not None and memo is not None:
+                        memo.put(pending_head, sha, picked)
+                    elif picked is None:
+                        typer.echo(
+                            f"[build] {sha[:7]} cannot be applied in memory; "
+                            "continuing with cherry-pick in a worktree"
+                        )
+                if picked is not None:
+                    pending_head = picked
+                    journal.done.append(sha)
+                    commit_entries.append({"sha": sha, "summary": summary})
+                    summary_entry["commit_count"] += 1
+                    continue
+                cwd = materialize(pending_head)
+                worktree_head = pending_head
+                pending_head = None
 
             cp = g.run(["cherry-pick", "-x", sha], cwd=cwd, check=False)
             if cp.returncode != 0:
@@ -289,6 +649,7 @@ def build_overlay(
                     if not summary_appended:
                         patch_summaries.append(summary_entry)
                         summary_appended = True
+                    checkpoint(sha)
                     log_build("failed")
                     raise typer.Exit(code=cp.returncode or 1)
                 if emit_option is None:
@@ -297,6 +658,7 @@ def build_overlay(
                     if not summary_appended:
                         patch_summaries.append(summary_entry)
                         summary_appended = True
+                    checkpoint(sha)
                     log_build("conflict")
                     raise typer.Exit(code=1)
 
@@ -308,6 +670,10 @@ def build_overlay(
                         conflict_blobs_dir=blob_option,
                         overlay_id=overlay_id,
                         cwd=cwd,
+                        jobs=conflict_jobs,
+                        bundle_format=conflict_format,
+                        # Bias mode resolves from precedence alone; skip diffs unless asked.
+                        lazy_diffs=conflict_mode == "bias" if lazy_diffs is None else lazy_diffs,
                     )
 
                 feature_names = selection.patch_feature_map.get(branch, [])
@@ -316,6 +682,7 @@ def build_overlay(
                     "continue": "git cherry-pick --continue",
                     "abort": "git cherry-pick --abort",
                     "rebuild": rebuild_command,
+                    "resume": f"forked build --resume --id {_quote_cli(overlay_id)}",
                 }
                 context = ConflictContext(
                     mode="build",
@@ -352,6 +719,10 @@ def build_overlay(
                     cont = g.run(["cherry-pick", "--continue"], cwd=cwd, check=False)
                     if cont.returncode == 0:
                         record["result"] = "auto-continued"
+                        worktree_head = None
+                        if engine == "tree":
+                            pending_head = g.run(["rev-parse", "HEAD"], cwd=cwd).stdout.strip()
+                        journal.done.append(sha)
                         continue
 
                     record["result"] = "auto-continue-failed"
@@ -386,6 +757,7 @@ def build_overlay(
                     if not summary_appended:
                         patch_summaries.append(summary_entry)
                         summary_appended = True
+                    checkpoint(sha)
                     log_build("conflict")
                     raise typer.Exit(code=10)
 
@@ -403,6 +775,7 @@ def build_overlay(
                     if not summary_appended:
                         patch_summaries.append(summary_entry)
                         summary_appended = True
+                    checkpoint(sha)
                     log_build("conflict")
                     raise typer.Exit(code=result.returncode)
 
@@ -411,15 +784,33 @@ def build_overlay(
                 if not summary_appended:
                     patch_summaries.append(summary_entry)
                     summary_appended = True
+                checkpoint(sha)
                 log_build("conflict")
                 raise typer.Exit(code=10)
 
+            if memo is not None:
+                # Bias-resolved picks depend on config, so only clean picks are memoised.
+                new_head = g.run(["rev-parse", "HEAD"], cwd=cwd).stdout.strip()
+                if worktree_head is not None:
+                    memo.put(worktree_head, sha, new_head)
+                worktree_head = new_head
+            if engine == "tree":
+                # Only this pick needed the worktree; the rest of the stack replays in memory.
+                pending_head = worktree_head or g.run(["rev-parse", "HEAD"], cwd=cwd).stdout.strip()
+                worktree_head = None
+            journal.done.append(sha)
             commit_entries.append({"sha": sha, "summary": summary})
             summary_entry["commit_count"] += 1
 
         if not summary_appended:
             summary_entry["status"] = "applied"
             patch_summaries.append(summary_entry)
+        checkpoint()
+
+    if pending_head is not None:
+        materialize(pending_head)
+    if memo is not None and memo.hits:
+        typer.echo(f"[build] Reused {memo.hits} cached cherry-pick(s)")
 
     if use_worktree and cfg.worktree.enabled and prev_ref:
         g.run(["checkout", prev_ref])
@@ -451,29 +842,157 @@ def build_overlay(
         typer.echo("[build] No patches selected; overlay matches trunk.")
 
     telemetry = log_build("success")
+    journal.discard()
 
     if write_git_note:
-        note_lines = [
-            f"forked.build {telemetry['timestamp']}",
-            f"overlay={overlay}",
-            f"source={selection.source}",
-        ]
-        if selection.overlay_profile:
-            note_lines.append(f"overlay_profile={selection.overlay_profile}")
-        if selection.active_features:
-            note_lines.append("features=" + ", ".join(selection.active_features))
-        note_lines.append("patches=" + ", ".join(selection.patches))
-        if skip_upstream_equivalents:
-            note_lines.append("skip_upstream_equivalents=true")
-        note = "\n".join(note_lines)
-        cp = g.run(
-            ["notes", "--ref", "refs/notes/forked-meta", "add", "-f", "-m", note, overlay],
-            check=False,
+        write_build_note(telemetry)
+
+    return overlay, wt_path, telemetry
+
+
+def _resume_point(overlay: str, journal: StepJournal, cwd: Path | None) -> tuple[set[str], str]:
+    """Return (picks already done, commit to continue from) for an interrupted build.
+
+    The pick that stopped counts as done when the overlay moved past the
+    journal head, i.e. the user resolved and committed it; otherwise it is
+    replayed.
+    """
+    in_progress = g.run(
+        ["rev-parse", "-q", "--verify", "CHERRY_PICK_HEAD"],
+        cwd=str(cwd) if cwd else None,
+        check=False,
+    )
+    if in_progress.returncode == 0:
+        typer.secho(
+            "[build] A cherry-pick is still in progress; commit the resolution "
+            "(git cherry-pick --continue) or abort it before resuming.",
+            fg=typer.colors.RED,
         )
-        if cp.returncode != 0:
-            typer.echo(
-                f"[build] Warning: failed to write git note for {overlay}: {cp.stderr.strip()}",
-                err=True,
+        raise typer.Exit(code=2)
+    done = set(journal.done)
+    head = journal.head or journal.trunk_sha
+    tip_cp = g.run(["rev-parse", "-q", "--verify", overlay], check=False)
+    tip = tip_cp.stdout.strip() if tip_cp.returncode == 0 else head
+    if journal.stopped_at and tip != head:
+        if g.run(["merge-base", "--is-ancestor", head, tip], check=False).returncode != 0:
+            typer.secho(
+                f"[build] {overlay} no longer contains the checkpoint {head[:12]}; "
+                "run a full build instead.",
+                fg=typer.colors.RED,
             )
+            raise typer.Exit(code=2)
+        done.add(journal.stopped_at)
+        head = tip
+    return done, head
+
+
+@dataclass
+class OverlayBuildResult:
+    """Outcome of one overlay built by :func:`build_all_overlays`."""
+
+    overlay_id: str
+    exit_code: int
+    overlay: str | None = None
+    worktree: str | None = None
+    telemetry: dict[str, Any] | None = None
+    error: str | None = None
+
+
+def _build_overlay_job(
+    cfg: Config, overlay_id: str, selection: ResolvedSelection, options: dict[str, Any]
+) -> OverlayBuildResult:
+    try:
+        overlay, wt_path, telemetry = build_overlay(
+            cfg,
+            overlay_id,
+            selection,
+            use_worktree=True,
+            write_git_note=False,
+            prepare_trunk=False,
+            **options,
+        )
+    except typer.Exit as exc:
+        # ``--on-conflict exec`` exits with the delegated command's status, 0 included.
+        return OverlayBuildResult(overlay_id=overlay_id, exit_code=exc.exit_code)
+    except subprocess.CalledProcessError as exc:
+        detail = (exc.stderr or "").strip() if isinstance(exc.stderr, str) else ""
+        return OverlayBuildResult(
+            overlay_id=overlay_id, exit_code=1, error=detail or f"{exc.cmd} failed"
+        )
+    except Exception as exc:
+        # Report any other failure against this overlay so the roll-up keeps the rest.
+        return OverlayBuildResult(overlay_id=overlay_id, exit_code=1, error=str(exc) or repr(exc))
+    return OverlayBuildResult(
+        overlay_id=overlay_id,
+        exit_code=0,
+        overlay=overlay,
+        worktree=str(wt_path),
+        telemetry=telemetry,
+    )
+
+
+def build_all_overlays(
+    cfg: Config,
+    selections: dict[str, ResolvedSelection],
+    *,
+    jobs: int,
+    write_git_note: bool = True,
+    **options: Any,
+) -> tuple[int, list[OverlayBuildResult]]:
+    """Build several overlays concurrently, each in its own worktree.
+
+    Trunk is fetched and reset once up front; every overlay is then built in a
+    separate process so per-overlay git state (index, HEAD, sequencer) never
+    collides. Provenance notes are written afterwards from the parent because
+    they all update the same notes ref. Returns the aggregate exit code (the
+    highest non-zero code, or 0) and per-overlay results in input order.
+    """
+    if not cfg.worktree.enabled:
+        raise typer.BadParameter("Parallel builds require worktrees (worktree.enabled: true).")
+
+    prev_ref = _prepare_trunk(cfg)
+    results: dict[str, OverlayBuildResult] = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {
+                executor.submit(_build_overlay_job, cfg, overlay_id, selection, options): overlay_id
+                for overlay_id, selection in selections.items()
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.overlay_id] = result
+                state = "ok" if result.exit_code == 0 else f"exit {result.exit_code}"
+                typer.echo(f"[build] {result.overlay_id}: {state}")
+    finally:
+        if prev_ref:
+            g.run(["checkout", prev_ref])
+
+    ordered = [results[overlay_id] for overlay_id in selections]
+    if write_git_note:
+        for result in ordered:
+            if result.telemetry is not None:
+                write_build_note(result.telemetry)
 
-    return overlay, wt_path, telemetry
+    exit_code = max((result.exit_code for result in ordered), default=0)
+    repo = g.repo_root()
+    logs_dir = repo / ".forked" / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    summary = {
+        "event": "forked.build-all",
+        "status": "success" if exit_code == 0 else "failed",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "jobs": jobs,
+        "exit_code": exit_code,
+        "overlays": [
+            {
+                "id": result.overlay_id,
+                "overlay": result.overlay,
+                "exit_code": result.exit_code,
+                **({"error": result.error} if result.error else {}),
+            }
+            for result in ordered
+        ],
+    }
+    with (logs_dir / "forked-build.log").open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(summary) + "\n")
+    return exit_code, ordered
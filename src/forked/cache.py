@@ -0,0 +1,155 @@
+"""Persistent caches stored under ``.forked/cache``."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import gitutil as g
+
+PICK_MEMO_FILE = "cherry-pick-memo.json"
+# Least recently used picks beyond this many are dropped when the memo is saved.
+PICK_MEMO_MAX_ENTRIES = 20_000
+
+
+def cache_dir(repo_root: Path) -> Path:
+    """Return (and create) the cache directory for ``repo_root``."""
+    path = repo_root / ".forked" / "cache"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_json(path: Path) -> Any:
+    """Return the parsed contents of ``path`` or None if missing/corrupt."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_json_atomic(path: Path, payload: Any):
+    """Write JSON via a temp file + rename so concurrent readers never see partial data."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class PickMemo:
+    """Content-addressed memo of clean cherry-picks: (parent, picked) -> result commit.
+
+    A clean pick is fully determined by the parent commit and the picked
+    commit, so a hit can be reused as long as the result object still exists.
+    Each entry records when it was last stored or hit; ``save()`` keeps only
+    the ``PICK_MEMO_MAX_ENTRIES`` most recently used.
+    """
+
+    path: Path
+    entries: dict[str, str] = field(default_factory=dict)
+    added: dict[str, str] = field(default_factory=dict)
+    hits: int = 0
+    used: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, repo_root: Path) -> PickMemo:
+        path = cache_dir(repo_root) / PICK_MEMO_FILE
+        raw = load_json(path)
+        entries = raw.get("picks", {}) if isinstance(raw, dict) else {}
+        return cls(path=path, entries=dict(entries))
+
+    @staticmethod
+    def _key(parent: str, picked: str) -> str:
+        return f"{parent}:{picked}"
+
+    def get(self, parent: str, picked: str, cwd: str | None = None) -> str | None:
+        result = self.entries.get(self._key(parent, picked))
+        if result is None:
+            return None
+        info = g.object_info(result, cwd=cwd)
+        if info is None or info[1] != "commit":
+            self.entries.pop(self._key(parent, picked), None)
+            return None
+        self.hits += 1
+        self.used.add(self._key(parent, picked))
+        return result
+
+    def put(self, parent: str, picked: str, result: str):
+        key = self._key(parent, picked)
+        self.entries[key] = result
+        self.added[key] = result
+
+    def save(self):
+        if not self.added and not self.used:
+            return
+        # Merge with whatever other builds wrote since we loaded.
+        raw = load_json(self.path)
+        merged = dict(raw.get("picks", {})) if isinstance(raw, dict) else {}
+        last_used = dict(raw.get("last_used", {})) if isinstance(raw, dict) else {}
+        merged.update(self.added)
+        now = int(time.time())
+        for key in (*self.added, *self.used):
+            last_used[key] = now
+        if len(merged) > PICK_MEMO_MAX_ENTRIES:
+            recent = sorted(merged, key=lambda key: last_used.get(key, 0), reverse=True)
+            merged = {key: merged[key] for key in recent[:PICK_MEMO_MAX_ENTRIES]}
+        last_used = {key: last_used[key] for key in merged if key in last_used}
+        write_json_atomic(self.path, {"version": 1, "picks": merged, "last_used": last_used})
+        self.added.clear()
+        self.used.clear()
+
+
+PATCH_ID_INDEX_FILE = "patch-ids.json"
+
+
+@dataclass
+class PatchIdIndex:
+    """Persistent ``commit -> patch-id`` map shared by every build.
+
+    Commits are immutable, so entries never go stale; the index only grows as
+    trunk advances and new patch commits appear. Commits without a patch-id
+    (merges, empty commits) are stored as ``""`` so they are not diffed again.
+    """
+
+    path: Path
+    ids: dict[str, str] = field(default_factory=dict)
+    added: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, repo_root: Path) -> PatchIdIndex:
+        path = cache_dir(repo_root) / PATCH_ID_INDEX_FILE
+        raw = load_json(path)
+        ids = raw.get("patch_ids", {}) if isinstance(raw, dict) else {}
+        return cls(path=path, ids=dict(ids))
+
+    def ensure(self, commits: Iterable[str], cwd: str | None = None):
+        """Compute patch-ids for any of ``commits`` not yet indexed."""
+        missing = [commit for commit in dict.fromkeys(commits) if commit not in self.ids]
+        if not missing:
+            return
+        computed = g.patch_ids(missing, cwd=cwd)
+        for commit in missing:
+            self.ids[commit] = self.added[commit] = computed.get(commit, "")
+
+    def get(self, commit: str) -> str | None:
+        return self.ids.get(commit) or None
+
+    def save(self):
+        if not self.added:
+            return
+        raw = load_json(self.path)
+        merged = dict(raw.get("patch_ids", {})) if isinstance(raw, dict) else {}
+        merged.update(self.added)
+        write_json_atomic(self.path, {"version": 1, "patch_ids": merged})
+        self.added.clear()
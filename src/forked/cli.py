@@ -2,8 +2,11 @@
 
 import json
 import shutil
+import sqlite3
+import subprocess
 from collections import defaultdict
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 from fnmatch import fnmatch
@@ -14,15 +17,38 @@ import typer
 from rich import print as rprint
 
 from . import gitutil as g
-from .build import build_overlay
+from .build import (
+    BUILD_ENGINES,
+    build_all_overlays,
+    build_overlay,
+    plan_overlay,
+    predict_overlay,
+)
 from .config import Config, Feature, load_config, write_config, write_skeleton
-from .guards import both_touched, sentinels, size_caps
-from .resolver import ResolutionError, resolve_selection
+from .conflict_index import GROUP_COLUMNS, ConflictIndex
+from .conflicts import (
+    BLOB_STORE_DIR,
+    BUNDLE_FORMATS,
+    DEFAULT_CONFLICT_JOBS,
+    DIFF_KINDS,
+    bundle_diffs,
+    bundle_suffix,
+    iter_bundle_files,
+    reindex_conflict_bundles,
+    unreferenced_blobs,
+)
+from .guards import GuardPluginError, both_touched_many, run_checks
+from .journal import StepJournal, build_journal_path, pending_build_journals
+from .matrix import compute_matrix
+from .plan import BuildPlan
+from .resolver import ResolutionError, ResolvedSelection, resolve_selection
 from .sync import run_sync
 
 app = typer.Typer(add_completion=False)
 feature_app = typer.Typer(help="Feature slice management")
 app.add_typer(feature_app, name="feature")
+conflicts_app = typer.Typer(help="Conflict bundle inspection")
+app.add_typer(conflicts_app, name="conflicts")
 
 
 def _parse_csv_option(raw: str | None) -> list[str]:
@@ -36,33 +62,14 @@ def _parse_csv_option(raw: str | None) -> list[str]:
     return items
 
 
-def _ahead_behind(trunk: str, branch: str) -> tuple[int, int] | None:
-    cp = g.run(["rev-list", "--left-right", "--count", f"{trunk}...{branch}"], check=False)
-    if cp.returncode != 0:
-        return None
-    parts = cp.stdout.strip().split()
-    if len(parts) != 2:
-        return None
-    try:
-        behind = int(parts[0])
-        ahead = int(parts[1])
-    except ValueError:
-        return None
-    return behind, ahead
-
-
-def _overlays_by_date(prefix: str) -> list[tuple[str, int]]:
-    fmt = "%(refname:short)|%(committerdate:unix)"
-    cp = g.run(["for-each-ref", f"--format={fmt}", f"refs/heads/{prefix}"])
-    items: list[tuple[str, int]] = []
-    for line in cp.stdout.splitlines():
-        if "|" not in line:
-            continue
-        name, ts_value = line.split("|", 1)
-        try:
-            items.append((name, int(ts_value)))
-        except ValueError:
-            continue
+def _overlays_by_date(prefix: str, refs: dict[str, tuple[str, int]]) -> list[tuple[str, int]]:
+    """Overlay branch names from a ``refs/heads/`` snapshot, newest commit first."""
+    pattern = f"refs/heads/{prefix}"
+    items = [
+        (refname.removeprefix("refs/heads/"), commit_ts)
+        for refname, (_, commit_ts) in refs.items()
+        if refname.startswith(pattern)
+    ]
     return sorted(items, key=lambda item: item[1], reverse=True)
 
 
@@ -709,9 +716,12 @@ def _plan_conflict_actions(
 
     entries: dict[str, list[tuple[Path, datetime]]] = {}
     for child in conflicts_dir.iterdir():
+        if child.name == BLOB_STORE_DIR:
+            continue
         base = None
-        if child.is_file() and child.suffix == ".json":
-            base = child.stem
+        suffix = bundle_suffix(child.name) if child.is_file() else None
+        if suffix:
+            base = child.name[: -len(suffix)]
         elif child.is_dir():
             base = child.name
         if base is None:
@@ -765,6 +775,18 @@ def _plan_conflict_actions(
                     )
                 )
 
+    # Exported blobs live once in the shared store; drop the ones whose last
+    # wave export is going away (or is already gone).
+    removed = [action.path for action in actions if action.path is not None]
+    for stored in unreferenced_blobs(repo, removed):
+        actions.append(
+            _CleanAction(
+                category="conflicts",
+                description=f"remove {stored.relative_to(repo)} (unreferenced blob)",
+                path=stored,
+            )
+        )
+
     return actions, skipped
 
 
@@ -837,6 +859,20 @@ def _execute_clean_actions(actions: Sequence[_CleanAction]) -> None:
                 action.path.unlink(missing_ok=True)
             rel = action.path.relative_to(repo)
             log_entries.append(f"{action.category}: remove {rel}")
+    removed_bundles = [
+        action.path
+        for action in actions
+        if action.category == "conflicts" and action.path and bundle_suffix(action.path.name)
+    ]
+    if removed_bundles:
+        try:
+            with ConflictIndex(repo) as index:
+                index.forget(removed_bundles)
+        except sqlite3.Error as exc:
+            # Files are already gone; ``forked conflicts --reindex`` drops stale rows later.
+            typer.secho(
+                f"[clean] Unable to update conflict index: {exc}", fg=typer.colors.YELLOW, err=True
+            )
     if log_entries:
         _append_clean_log(log_entries)
 
@@ -874,28 +910,63 @@ def _print_clean_summary(
             typer.echo(f"    - {skip_item.description}")
 
 
+def _resolve_names(
+    lookups: dict[str, str], refs: dict[str, tuple[str, int]]
+) -> dict[str, tuple[str, str]]:
+    """Resolve ``{name: expected refname}`` to ``{name: (key, sha)}``.
+
+    Names found in the ``refs`` snapshot are keyed by their refname; the rest
+    (remote or tag names, say) fall back to one batched commit lookup and are
+    keyed by the name itself. Unresolvable names are left out.
+    """
+    found = {name: (ref, refs[ref][0]) for name, ref in lookups.items() if ref in refs}
+    missing = [name for name in lookups if name not in found]
+    for name, sha in g.resolve_commits(missing).items():
+        if sha is not None:
+            found[name] = (name, sha)
+    return found
+
+
+def _patch_counts(
+    trunk_sha: str | None, patches: dict[str, tuple[str, str]]
+) -> dict[str, tuple[int, int]]:
+    """``(ahead, behind)`` per resolved patch key, or ``{}`` when they cannot be computed."""
+    if trunk_sha is None or not patches:
+        return {}
+    try:
+        return g.ahead_behind(trunk_sha, dict(patches.values()))
+    except subprocess.CalledProcessError:
+        return {}
+
+
 def _collect_status_summary(cfg: Config, latest: int) -> dict[str, Any]:
-    upstream_ref = g.run(["rev-parse", f"{cfg.upstream.remote}/{cfg.upstream.branch}"], check=False)
-    if upstream_ref.returncode != 0:
+    upstream_name = f"{cfg.upstream.remote}/{cfg.upstream.branch}"
+    # Every branch sha and commit date comes from one for-each-ref pass.
+    refs = g.ref_snapshot(["refs/heads/", f"refs/remotes/{upstream_name}"])
+    resolved = _resolve_names(
+        {
+            upstream_name: f"refs/remotes/{upstream_name}",
+            cfg.branches.trunk: f"refs/heads/{cfg.branches.trunk}",
+            **{branch: f"refs/heads/{branch}" for branch in cfg.patches.order},
+        },
+        refs,
+    )
+
+    upstream_sha = resolved[upstream_name][1] if upstream_name in resolved else None
+    if upstream_sha is None:
         typer.secho(
-            f"[status] Warning: unable to resolve upstream {cfg.upstream.remote}/{cfg.upstream.branch}",
+            f"[status] Warning: unable to resolve upstream {upstream_name}",
             fg=typer.colors.YELLOW,
             err=True,
         )
-        upstream_sha = None
-    else:
-        upstream_sha = upstream_ref.stdout.strip()
 
-    trunk_ref = g.run(["rev-parse", cfg.branches.trunk], check=False)
-    if trunk_ref.returncode != 0:
+    trunk_sha = resolved[cfg.branches.trunk][1] if cfg.branches.trunk in resolved else None
+    if trunk_sha is None:
         typer.secho(
             f"[status] Warning: unable to resolve trunk branch '{cfg.branches.trunk}'",
             fg=typer.colors.YELLOW,
             err=True,
         )
-        trunk_sha = None
-    else:
-        trunk_sha = trunk_ref.stdout.strip()
 
     summary: dict[str, Any] = {
         "status_version": 1,
@@ -909,30 +980,27 @@ def _collect_status_summary(cfg: Config, latest: int) -> dict[str, Any]:
         "overlays": [],
     }
 
+    patches = {branch: resolved[branch] for branch in cfg.patches.order if branch in resolved}
+    counts = _patch_counts(trunk_sha, patches)
+
     for branch in cfg.patches.order:
-        rev = g.run(["rev-parse", branch], check=False)
-        if rev.returncode != 0:
+        key, branch_sha = patches.get(branch, (branch, None))
+        ahead: int | None = None
+        behind: int | None = None
+        if branch_sha is None:
             typer.secho(
                 f"[status] Warning: patch branch '{branch}' not found.",
                 fg=typer.colors.YELLOW,
                 err=True,
             )
-            branch_sha = None
-            ahead = None
-            behind = None
+        elif key not in counts:
+            typer.secho(
+                f"[status] Unable to compute ahead/behind for '{branch}'.",
+                fg=typer.colors.YELLOW,
+                err=True,
+            )
         else:
-            branch_sha = rev.stdout.strip()
-            ahead_behind = _ahead_behind(cfg.branches.trunk, branch)
-            if ahead_behind is None:
-                typer.secho(
-                    f"[status] Unable to compute ahead/behind for '{branch}'.",
-                    fg=typer.colors.YELLOW,
-                    err=True,
-                )
-                behind = None
-                ahead = None
-            else:
-                behind, ahead = ahead_behind
+            ahead, behind = counts[key]
         summary["patches"].append(
             {"name": branch, "sha": branch_sha, "ahead": ahead, "behind": behind}
         )
@@ -946,21 +1014,12 @@ def _collect_status_summary(cfg: Config, latest: int) -> dict[str, Any]:
             guard_counts[overlay_name] = len(both)
 
     build_entries = _load_latest_build_entries()
-    overlays = _overlays_by_date(cfg.branches.overlay_prefix)
+    overlays = _overlays_by_date(cfg.branches.overlay_prefix, refs)
     if not overlays:
         typer.secho("[status] No overlay branches found.", fg=typer.colors.BLUE, err=True)
 
     for name, commit_ts in overlays[:latest]:
-        rev = g.run(["rev-parse", name], check=False)
-        if rev.returncode != 0:
-            typer.secho(
-                f"[status] Warning: overlay branch '{name}' not found.",
-                fg=typer.colors.YELLOW,
-                err=True,
-            )
-            overlay_sha: str | None = None
-        else:
-            overlay_sha = rev.stdout.strip()
+        overlay_sha = refs[f"refs/heads/{name}"][0]
 
         log_entry = build_entries.get(name)
         selection = _selection_for_overlay(cfg, name, build_entries)
@@ -989,6 +1048,136 @@ def _collect_status_summary(cfg: Config, latest: int) -> dict[str, Any]:
     return summary
 
 
+def _print_build_plans(
+    cfg: Config,
+    selections: dict[str, ResolvedSelection],
+    skip_upstream_equivalents: bool,
+    json_output: bool,
+) -> None:
+    # Plans are computed against the fetched upstream ref so trunk and every worktree stay untouched.
+    g.run(["fetch", cfg.upstream.remote])
+    upstream_ref = f"{cfg.upstream.remote}/{cfg.upstream.branch}"
+    plans: dict[str, BuildPlan] = {}
+    for overlay_id, selection in selections.items():
+        try:
+            plans[overlay_id] = plan_overlay(upstream_ref, selection, skip_upstream_equivalents)
+        except (RuntimeError, subprocess.CalledProcessError) as exc:
+            typer.secho(f"[build] Unable to plan {overlay_id}: {exc}", fg=typer.colors.RED)
+            raise typer.Exit(code=4) from exc
+
+    if json_output:
+        payload = {
+            "plan_version": 1,
+            "overlays": {
+                overlay_id: {
+                    "overlay": f"{cfg.branches.overlay_prefix}{overlay_id}",
+                    **plan.to_dict(),
+                }
+                for overlay_id, plan in plans.items()
+            },
+        }
+        typer.echo(json.dumps(payload, indent=2))
+        return
+
+    for overlay_id, plan in plans.items():
+        rprint(
+            f"[bold]{cfg.branches.overlay_prefix}{overlay_id}[/bold] on {plan.trunk} @ "
+            f"{plan.trunk_sha[:12]}: {plan.commit_count} commit(s), "
+            f"{plan.skipped_count} skipped, estimated cost {plan.estimated_cost} pick(s)"
+        )
+        for patch in plan.patches:
+            applied = len(patch.to_apply)
+            descriptor = f"{applied} to apply"
+            if patch.skipped:
+                descriptor += f", {len(patch.skipped)} skipped"
+            if not patch.commits:
+                descriptor = "already in trunk"
+            typer.echo(f"  • {patch.branch} @ {patch.tip[:7]} ({descriptor})")
+            for commit in patch.commits:
+                marker = "-" if commit.sha in patch.skipped else "+"
+                typer.echo(f"      {marker} {commit.sha[:7]} {commit.summary}")
+
+
+def _print_predictions(
+    cfg: Config,
+    selections: dict[str, ResolvedSelection],
+    skip_upstream_equivalents: bool,
+    use_cache: bool,
+    json_output: bool,
+) -> None:
+    g.require_merge_tree("--predict")
+    # Like --plan, predictions run against the fetched upstream ref and never touch a worktree.
+    g.run(["fetch", cfg.upstream.remote])
+    upstream_ref = f"{cfg.upstream.remote}/{cfg.upstream.branch}"
+    predictions: dict[str, dict[str, Any]] = {}
+    for overlay_id, selection in selections.items():
+        try:
+            predictions[overlay_id] = predict_overlay(
+                cfg,
+                upstream_ref,
+                selection,
+                skip_upstream_equivalents=skip_upstream_equivalents,
+                use_cache=use_cache,
+            )
+        except (RuntimeError, subprocess.CalledProcessError) as exc:
+            typer.secho(f"[build] Unable to predict {overlay_id}: {exc}", fg=typer.colors.RED)
+            raise typer.Exit(code=4) from exc
+
+    exit_code = 10 if any(p["status"] != "clean" for p in predictions.values()) else 0
+    if json_output:
+        payload = {
+            "predict_version": 1,
+            "overlays": {
+                overlay_id: {"overlay": f"{cfg.branches.overlay_prefix}{overlay_id}", **prediction}
+                for overlay_id, prediction in predictions.items()
+            },
+        }
+        typer.echo(json.dumps(payload, indent=2))
+        raise typer.Exit(code=exit_code)
+
+    for overlay_id, prediction in predictions.items():
+        overlay_name = f"{cfg.branches.overlay_prefix}{overlay_id}"
+        progress = f"{prediction['applied']}/{prediction['estimated_cost']} pick(s)"
+        stop = prediction["first_conflict"]
+        if stop is None:
+            typer.secho(f"[build] {overlay_name}: clean ({progress})", fg=typer.colors.GREEN)
+            continue
+        typer.secho(
+            f"[build] {overlay_name}: stops at {stop['patch_branch']} "
+            f"{stop['patch_commit'][:7]} {stop['summary']} ({stop['reason']}, after {progress})",
+            fg=typer.colors.YELLOW,
+        )
+        for entry in stop["files"]:
+            recommended = entry["precedence"]["recommended"]
+            typer.echo(f"  • {entry['path']} (recommended: {recommended})")
+        if stop["auto_resolvable"]:
+            typer.echo("  All conflicted paths have a precedence recommendation.")
+    raise typer.Exit(code=exit_code)
+
+
+def _resume_journal(overlay_id: str | None) -> StepJournal:
+    repo = g.repo_root()
+    if overlay_id is not None:
+        journal = StepJournal.load(build_journal_path(repo, overlay_id))
+        if journal is None:
+            typer.secho(
+                f"[build] No interrupted build of {overlay_id} to resume.", fg=typer.colors.RED
+            )
+            raise typer.Exit(code=2)
+        return journal
+    journals = pending_build_journals(repo)
+    if len(journals) != 1:
+        detail = (
+            "none found"
+            if not journals
+            else "pass --id to choose one of: "
+            + ", ".join(journal.options["overlay_id"] for journal in journals)
+        )
+        typer.secho(f"[build] Cannot pick a build to resume ({detail}).", fg=typer.colors.RED)
+        raise typer.Exit(code=2)
+    return journals[0]
+
+
 def _ensure_gitignore(entry: str):
     repo = g.repo_root()
     gitignore_path = repo / ".gitignore"
@@ -1070,16 +1259,16 @@ def status(
     overlays = summary["overlays"]
     if overlays:
         rprint("[bold]Overlays (newest first):[/bold]")
+        touched = both_touched_many(
+            cfg.branches.trunk, [entry["name"] for entry in overlays if entry.get("sha")]
+        )
         for entry in overlays:
             name = entry["name"]
-            sha = entry.get("sha")
             built_at = entry.get("built_at") or "unknown"
-            if sha is None:
+            if name not in touched:
                 rprint(f"  {name}  [{built_at}]  missing")
                 continue
-            base = g.merge_base(cfg.branches.trunk, name)
-            bt = both_touched(cfg, base, cfg.branches.trunk, name)
-            rprint(f"  {name}  [{built_at}]  both-touched={len(bt)}")
+            rprint(f"  {name}  [{built_at}]  both-touched={len(touched[name])}")
 
 
 @app.command()
@@ -1221,7 +1410,31 @@ def sync(
         "--auto-continue",
         help="Alias for --on-conflict bias",
     ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue an interrupted sync with the first branch that was not rebased",
+    ),
+    conflict_jobs: int = typer.Option(
+        DEFAULT_CONFLICT_JOBS,
+        "--conflict-jobs",
+        min=1,
+        help="Threads used to collect conflicted files into a bundle",
+    ),
+    conflict_format: str = typer.Option(
+        "json",
+        "--conflict-format",
+        help="Conflict bundle format: json (default), ndjson or ndjson.gz (streamed)",
+    ),
+    lazy_diffs: bool | None = typer.Option(
+        None,
+        "--lazy-diffs/--inline-diffs",
+        help="Write bundles with object ids only (diffs on demand via `forked conflicts show`); "
+        "defaults to lazy for --on-conflict bias",
+    ),
 ):
+    if conflict_format not in BUNDLE_FORMATS:
+        raise typer.BadParameter("--conflict-format must be one of: " + ", ".join(BUNDLE_FORMATS))
     cfg = load_config()
     emit_conflicts_value: str | None
     if emit_conflicts_path:
@@ -1262,6 +1475,10 @@ def sync(
         on_conflict=conflict_mode,
         on_conflict_exec=on_conflict_exec,
         auto_continue=auto_continue,
+        resume=resume,
+        conflict_jobs=conflict_jobs,
+        conflict_format=conflict_format,
+        lazy_diffs=lazy_diffs,
     )
 
     branches = telemetry.get("branches", [])
@@ -1391,22 +1608,165 @@ def build(
             metavar="COMMAND",
         ),
     ] = None,
+    engine: Annotated[
+        str,
+        typer.Option(
+            "--engine",
+            help="Replay engine: worktree (cherry-pick) or tree (in-memory merge-tree, "
+            "falling back to a worktree on conflicts)",
+            metavar="ENGINE",
+            show_default=True,
+        ),
+    ] = "worktree",
+    cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help="Reuse memoised cherry-picks from .forked/cache for unchanged stack prefixes",
+        ),
+    ] = True,
+    all_profiles: Annotated[
+        bool,
+        typer.Option(
+            "--all-profiles",
+            help="Build every overlay profile in forked.yml concurrently (one worktree each)",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum concurrent overlay builds with --all-profiles",
+        ),
+    ] = 4,
+    plan_only: Annotated[
+        bool,
+        typer.Option(
+            "--plan",
+            help="Print the build plan (commit ranges, counts, estimated cost) without building",
+        ),
+    ] = False,
+    predict: Annotated[
+        bool,
+        typer.Option(
+            "--predict",
+            help="Simulate the whole stack in the object database and report the first "
+            "conflicting pick without building (exit 10 when a conflict is predicted)",
+        ),
+    ] = False,
+    json_output: Annotated[
+        bool,
+        typer.Option("--json", help="Emit the --plan/--predict output as JSON"),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Continue an interrupted build from its checkpoint journal after the "
+            "conflict has been resolved and committed",
+        ),
+    ] = False,
+    conflict_jobs: Annotated[
+        int,
+        typer.Option(
+            "--conflict-jobs",
+            min=1,
+            help="Threads used to collect conflicted files into a bundle",
+        ),
+    ] = DEFAULT_CONFLICT_JOBS,
+    conflict_format: Annotated[
+        str,
+        typer.Option(
+            "--conflict-format",
+            help="Conflict bundle format: json (default), ndjson or ndjson.gz (streamed)",
+        ),
+    ] = "json",
+    lazy_diffs: Annotated[
+        bool | None,
+        typer.Option(
+            "--lazy-diffs/--inline-diffs",
+            help="Write bundles with object ids only (diffs on demand via `forked conflicts "
+            "show`); defaults to lazy for --on-conflict bias",
+        ),
+    ] = None,
 ):
     cfg = load_config()
+    engine = engine.lower()
+    if engine not in BUILD_ENGINES:
+        raise typer.BadParameter("--engine must be one of: " + ", ".join(BUILD_ENGINES))
+    if conflict_format not in BUNDLE_FORMATS:
+        raise typer.BadParameter("--conflict-format must be one of: " + ", ".join(BUNDLE_FORMATS))
+    if resume and (all_profiles or plan_only or predict):
+        typer.secho(
+            "[build] --resume cannot be combined with --all-profiles, --plan or --predict.",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=2)
+    if all_profiles:
+        conflicting = [
+            flag
+            for flag, value in (
+                ("--overlay", overlay),
+                ("--features", features_arg),
+                ("--id", id),
+                ("--emit-conflicts-path", emit_conflicts_path),
+                ("--conflict-blobs-dir", conflict_blobs_dir),
+                ("--no-worktree", no_worktree),
+            )
+            if value
+        ]
+        if conflicting:
+            typer.secho(
+                "[build] --all-profiles cannot be combined with " + ", ".join(conflicting) + ".",
+                fg=typer.colors.RED,
+                err=True,
+            )
+            raise typer.Exit(code=2)
+        if not cfg.overlays:
+            typer.secho("[build] No overlay profiles defined in forked.yml.", fg=typer.colors.RED)
+            raise typer.Exit(code=2)
+
     feature_list = _parse_csv_option(features_arg)
+    selections: dict[str, ResolvedSelection] = {}
     try:
-        selection = resolve_selection(
-            cfg,
-            overlay=overlay,
-            features=feature_list or None,
-            include=include or [],
-            exclude=exclude or [],
-        )
+        if resume:
+            # The journal pins the selection and replay options of the interrupted build.
+            journal = _resume_journal(id or overlay)
+            options = journal.options
+            selections[options["overlay_id"]] = journal.selection()
+            skip_upstream_equivalents = options["skip_upstream_equivalents"]
+            engine = options["engine"]
+            cache = options["use_cache"]
+            no_worktree = not options["use_worktree"]
+        elif all_profiles:
+            for profile_name in cfg.overlays:
+                selections[profile_name] = resolve_selection(
+                    cfg, overlay=profile_name, include=include or [], exclude=exclude or []
+                )
+        else:
+            overlay_id = id or (overlay or date.today().isoformat())
+            selections[overlay_id] = resolve_selection(
+                cfg,
+                overlay=overlay,
+                features=feature_list or None,
+                include=include or [],
+                exclude=exclude or [],
+            )
     except ResolutionError as exc:
         typer.secho(f"[build] {exc}", fg=typer.colors.RED)
         raise typer.Exit(code=2) from exc
 
-    overlay_id = id or (overlay or date.today().isoformat())
+    if plan_only and predict:
+        typer.secho("[build] --plan and --predict are mutually exclusive.", fg=typer.colors.RED)
+        raise typer.Exit(code=2)
+    if predict:
+        _print_predictions(cfg, selections, skip_upstream_equivalents, cache, json_output)
+    if plan_only:
+        _print_build_plans(cfg, selections, skip_upstream_equivalents, json_output)
+        return
 
     emit_conflicts_value: str | None
     if emit_conflicts_path:
@@ -1440,6 +1800,42 @@ def build(
     if on_conflict_exec and conflict_mode != "exec":
         conflict_mode = "exec"
 
+    if all_profiles:
+        typer.echo(f"[build] Building {len(selections)} overlay profile(s) with {jobs} job(s)")
+        exit_code, results = build_all_overlays(
+            cfg,
+            selections,
+            jobs=jobs,
+            write_git_note=git_note,
+            auto_continue=auto_continue,
+            skip_upstream_equivalents=skip_upstream_equivalents,
+            emit_conflicts=emit_conflicts_value,
+            conflict_blobs_dir=conflict_blobs_dir_value,
+            on_conflict=conflict_mode,
+            on_conflict_exec=on_conflict_exec,
+            engine=engine,
+            use_cache=cache,
+            conflict_jobs=conflict_jobs,
+            conflict_format=conflict_format,
+            lazy_diffs=lazy_diffs,
+        )
+        for result in results:
+            if result.exit_code == 0:
+                rprint(
+                    f"[green]Built overlay[/green] [bold]{result.overlay}[/bold]  "
+                    f"Worktree: {result.worktree}"
+                )
+            else:
+                detail = f": {result.error}" if result.error else ""
+                typer.secho(
+                    f"[build] {result.overlay_id} failed (exit {result.exit_code}){detail}",
+                    fg=typer.colors.RED,
+                )
+        if exit_code:
+            raise typer.Exit(code=exit_code)
+        return
+
+    overlay_id, selection = next(iter(selections.items()))
     if selection.unmatched_include:
         typer.secho(
             "[build] Warning: include patterns matched no patches: "
@@ -1471,6 +1867,12 @@ def build(
         conflict_blobs_dir=conflict_blobs_dir_value,
         on_conflict=conflict_mode,
         on_conflict_exec=on_conflict_exec,
+        engine=engine,
+        use_cache=cache,
+        resume=resume,
+        conflict_jobs=conflict_jobs,
+        conflict_format=conflict_format,
+        lazy_diffs=lazy_diffs,
     )
 
     if selection.overlay_profile:
@@ -1497,43 +1899,30 @@ def build(
         typer.echo(f"[build] Skipped {skipped_total} upstream-equivalent commit(s)")
 
 
-@app.command()
-def guard(
-    overlay: Annotated[str, typer.Option("--overlay", help="Overlay branch/ref to inspect")],
-    output: Annotated[
-        Path,
-        typer.Option(
-            "--output",
-            help="Path to write the guard report",
-        ),
-    ] = Path(".forked/report.json"),
-    mode: Annotated[
-        str | None,
-        typer.Option("--mode"),
-    ] = None,
-    verbose: Annotated[
-        bool,
-        typer.Option(
-            "--verbose",
-            "-v",
-            help="Display sentinel matches and write additional debug details",
-        ),
-    ] = False,
-):
-    cfg = load_config()
-    if mode:
-        cfg.guards.mode = mode
+@dataclass
+class _GuardOutcome:
+    overlay: str
+    sha: str
+    report: dict[str, Any]
+    debug_info: dict[str, Any]
+    log_entry: dict[str, Any]
+    exit_code: int
+    cache: str
+    override_error: str | None = None
+
+
+def _evaluate_guard(
+    cfg: Config,
+    overlay: str,
+    overlay_sha: str,
+    *,
+    verbose: bool,
+    use_cache: bool,
+    build_entries: dict[str, tuple[datetime | None, dict[str, Any]]],
+) -> _GuardOutcome:
+    """Build the v2 guard report, log entry and exit code for one overlay."""
     trunk = cfg.branches.trunk
-    overlay_rev = g.run(["rev-parse", overlay], check=False)
-    if overlay_rev.returncode != 0 or not overlay_rev.stdout.strip():
-        typer.secho(
-            f"[guard] Overlay '{overlay}' not found.",
-            fg=typer.colors.RED,
-            err=True,
-        )
-        raise typer.Exit(code=4)
-    overlay_sha = overlay_rev.stdout.strip()
-    base = g.merge_base(trunk, overlay)
+    base = g.merge_base(trunk, overlay_sha)
 
     report: dict[str, Any] = {
         "report_version": 2,
@@ -1544,7 +1933,6 @@ def guard(
     }
     debug_info: dict[str, Any] = {}
 
-    build_entries = _load_latest_build_entries()
     selection = _selection_for_overlay(cfg, overlay, build_entries)
     features_block: dict[str, Any] = {
         "source": selection.get("source"),
@@ -1558,33 +1946,16 @@ def guard(
         features_block["patches"] = selection.get("patches")
     report["features"] = features_block
 
-    if cfg.guards.both_touched:
-        bt = both_touched(cfg, base, trunk, overlay)
-        report["both_touched"] = bt
-        if bt:
-            report["violations"]["both_touched"] = bt
+    guard_run = run_checks(cfg, trunk, overlay, base, verbose=verbose, use_cache=use_cache)
+    for name, result in guard_run.builtin.items():
+        report[name] = result.report
+    if guard_run.plugins:
+        report["checks"] = {name: result.report for name, result in guard_run.plugins.items()}
+    for name, result in {**guard_run.builtin, **guard_run.plugins}.items():
+        if result.violation:
+            report["violations"][name] = result.violation
         if verbose:
-            debug_info["both_touched"] = bt
-
-    sentinel_report, sentinel_debug = sentinels(cfg, trunk, overlay, return_debug=verbose)
-    report["sentinels"] = sentinel_report
-    if sentinel_report["must_match_upstream"] or sentinel_report["must_diverge_from_upstream"]:
-        report["violations"]["sentinels"] = sentinel_report
-    if verbose:
-        debug_info["sentinels"] = sentinel_debug
-
-    size_report = size_caps(cfg, overlay, trunk)
-    report["size_caps"] = size_report
-    if size_report.get("violations"):
-        report["violations"]["size_caps"] = {
-            "files": size_report["files_changed"],
-            "loc": size_report["loc"],
-        }
-    if verbose:
-        debug_info["size_caps"] = {
-            "files_changed": size_report["files_changed"],
-            "loc": size_report["loc"],
-        }
+            debug_info[name] = result.debug
 
     override_details = _resolve_override(cfg, overlay, overlay_sha)
     allowed_values_cfg = [value.lower() for value in cfg.policy_overrides.allowed_values or []]
@@ -1641,11 +2012,276 @@ def guard(
     )
     if override_applied and override_required:
         override_block["applied"] = True
-    if override_error:
-        typer.secho(f"[guard] {override_error}", fg=typer.colors.RED, err=True)
 
     if verbose:
         report["debug"] = debug_info
+
+    guard_log_entry_override = {k: v for k, v in override_block.items() if k != "allowed_values"}
+    guard_log_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "overlay": overlay,
+        "mode": cfg.guards.mode,
+        "violations": report["violations"],
+        "verbose": verbose,
+        "cache": guard_run.cache,
+        "override": guard_log_entry_override,
+        "features": report["features"],
+    }
+    if verbose:
+        guard_log_entry["debug"] = debug_info
+
+    exit_code = 0
+    if cfg.guards.mode == "block" and has_violations:
+        exit_code = 2
+    if cfg.guards.mode == "require-override" and has_violations:
+        exit_code = 0 if override_block.get("applied") else 2
+    return _GuardOutcome(
+        overlay=overlay,
+        sha=overlay_sha,
+        report=report,
+        debug_info=debug_info,
+        log_entry=guard_log_entry,
+        exit_code=exit_code,
+        cache=guard_run.cache,
+        override_error=override_error,
+    )
+
+
+def _append_guard_log(entries: Iterable[dict[str, Any]]):
+    logs_dir = g.repo_root() / ".forked" / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    with (logs_dir / "forked-guard.log").open("a", encoding="utf-8") as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry) + "\n")
+
+
+def _discover_overlays(prefix: str, pattern: str | None) -> list[tuple[str, str]]:
+    """Return ``(branch, sha)`` for every overlay branch via one ``for-each-ref``.
+
+    Without ``pattern`` every branch under the ``prefix`` namespace is taken;
+    ``pattern`` is a ``for-each-ref`` glob relative to ``refs/heads/``.
+    """
+    if pattern:
+        ref_pattern, namespace = f"refs/heads/{pattern}", "refs/heads/"
+    else:
+        # for-each-ref only prefix-matches whole path components, so a prefix
+        # such as "ovl-" is filtered here rather than passed through.
+        namespace = f"refs/heads/{prefix}"
+        ref_pattern = namespace if prefix.endswith("/") else "refs/heads/"
+    out = g.run(["for-each-ref", "--format=%(objectname) %(refname)", ref_pattern]).stdout
+    overlays: list[tuple[str, str]] = []
+    for line in out.splitlines():
+        sha, _, ref = line.partition(" ")
+        if ref.startswith(namespace):
+            overlays.append((ref.removeprefix("refs/heads/"), sha))
+    return overlays
+
+
+def _guard_all(
+    cfg: Config,
+    *,
+    pattern: str | None,
+    jobs: int,
+    output_dir: Path,
+    verbose: bool,
+    use_cache: bool,
+) -> int:
+    """Guard every matching overlay on a thread pool and write a roll-up report.
+
+    The config, build log and guard caches are shared by every worker. Returns
+    the aggregate exit code: the highest per-overlay code, or 0.
+    """
+    overlays = _discover_overlays(cfg.branches.overlay_prefix, pattern)
+    build_entries = _load_latest_build_entries()
+    typer.echo(f"[guard] Evaluating {len(overlays)} overlay(s) with {jobs} job(s)")
+
+    def _job(overlay: str, sha: str) -> tuple[_GuardOutcome | None, str | None]:
+        try:
+            outcome = _evaluate_guard(
+                cfg,
+                overlay,
+                sha,
+                verbose=verbose,
+                use_cache=use_cache,
+                build_entries=build_entries,
+            )
+        except GuardPluginError as exc:
+            return None, str(exc)
+        except subprocess.CalledProcessError as exc:
+            return None, (exc.stderr or "").strip() or str(exc)
+        return outcome, None
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(lambda item: _job(*item), overlays))
+
+    rollup_entries: list[dict[str, Any]] = []
+    for (overlay, sha), (outcome, error) in zip(overlays, results, strict=True):
+        entry: dict[str, Any] = {"overlay": overlay, "sha": sha}
+        if outcome is None:
+            entry.update({"exit_code": 3, "error": error})
+            typer.secho(f"[guard] {overlay}: {error}", fg=typer.colors.RED, err=True)
+        else:
+            report_path = output_dir / f"{overlay.replace('/', '_')}.json"
+            report_path.write_text(json.dumps(outcome.report, indent=2))
+            entry.update(
+                {
+                    "exit_code": outcome.exit_code,
+                    "report": str(report_path),
+                    "violations": sorted(outcome.report["violations"]),
+                    "override_applied": outcome.report["override"]["applied"],
+                    "cache": outcome.cache,
+                }
+            )
+            if outcome.override_error:
+                entry["override_error"] = outcome.override_error
+            state = "ok" if outcome.exit_code == 0 else f"exit {outcome.exit_code}"
+            typer.echo(f"[guard] {overlay}: {state}")
+        rollup_entries.append(entry)
+
+    exit_code = max((entry["exit_code"] for entry in rollup_entries), default=0)
+    rollup = {
+        "rollup_version": 1,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": cfg.guards.mode,
+        "pattern": pattern or cfg.branches.overlay_prefix,
+        "jobs": jobs,
+        "exit_code": exit_code,
+        "overlays": rollup_entries,
+    }
+    rollup_path = output_dir / "guard-rollup.json"
+    rollup_path.write_text(json.dumps(rollup, indent=2))
+    rprint(f"[bold]Roll-up written:[/bold] {rollup_path}")
+
+    _append_guard_log(
+        [
+            *(outcome.log_entry for outcome, _ in results if outcome is not None),
+            {
+                "event": "forked.guard-all",
+                "timestamp": rollup["timestamp"],
+                "mode": cfg.guards.mode,
+                "exit_code": exit_code,
+                "overlays": [
+                    {"overlay": entry["overlay"], "exit_code": entry["exit_code"]}
+                    for entry in rollup_entries
+                ],
+            },
+        ]
+    )
+    return exit_code
+
+
+@app.command()
+def guard(
+    overlay: Annotated[
+        str | None, typer.Option("--overlay", help="Overlay branch/ref to inspect")
+    ] = None,
+    output: Annotated[
+        Path,
+        typer.Option(
+            "--output",
+            help="Path to write the guard report",
+        ),
+    ] = Path(".forked/report.json"),
+    mode: Annotated[
+        str | None,
+        typer.Option("--mode"),
+    ] = None,
+    verbose: Annotated[
+        bool,
+        typer.Option(
+            "--verbose",
+            "-v",
+            help="Display sentinel matches and write additional debug details",
+        ),
+    ] = False,
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache",
+            help="Reuse cached guard results and diffs from .forked/cache/guard",
+        ),
+    ] = True,
+    all_overlays: Annotated[
+        bool,
+        typer.Option(
+            "--all",
+            help="Guard every overlay branch (under branches.overlay_prefix) concurrently",
+        ),
+    ] = False,
+    match: Annotated[
+        str | None,
+        typer.Option(
+            "--match",
+            help="With --all, only branches matching this glob (e.g. 'overlay/release-*')",
+        ),
+    ] = None,
+    jobs: Annotated[
+        int,
+        typer.Option(
+            "--jobs",
+            "-j",
+            min=1,
+            help="Maximum concurrent overlay evaluations with --all",
+        ),
+    ] = 4,
+    output_dir: Annotated[
+        Path,
+        typer.Option(
+            "--output-dir",
+            help="With --all, directory for per-overlay reports and guard-rollup.json",
+        ),
+    ] = Path(".forked/reports"),
+):
+    if all_overlays == bool(overlay):
+        typer.secho("[guard] Pass either --overlay or --all.", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=2)
+    if match and not all_overlays:
+        typer.secho("[guard] --match requires --all.", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=2)
+    cfg = load_config()
+    if mode:
+        cfg.guards.mode = mode
+    if overlay is None:
+        exit_code = _guard_all(
+            cfg,
+            pattern=match,
+            jobs=jobs,
+            output_dir=output_dir,
+            verbose=verbose,
+            use_cache=use_cache,
+        )
+        if exit_code:
+            raise typer.Exit(code=exit_code)
+        return
+
+    overlay_rev = g.run(["rev-parse", overlay], check=False)
+    if overlay_rev.returncode != 0 or not overlay_rev.stdout.strip():
+        typer.secho(
+            f"[guard] Overlay '{overlay}' not found.",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=4)
+    overlay_sha = overlay_rev.stdout.strip()
+
+    try:
+        outcome = _evaluate_guard(
+            cfg,
+            overlay,
+            overlay_sha,
+            verbose=verbose,
+            use_cache=use_cache,
+            build_entries=_load_latest_build_entries(),
+        )
+    except GuardPluginError as exc:
+        typer.secho(f"[guard] {exc}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=3) from exc
+    if outcome.override_error:
+        typer.secho(f"[guard] {outcome.override_error}", fg=typer.colors.RED, err=True)
+
+    debug_info = outcome.debug_info
+    if verbose:
         if debug_info.get("both_touched"):
             typer.echo("[guard] Both-touched files:")
             for path in debug_info["both_touched"]:
@@ -1667,33 +2303,12 @@ def guard(
                 typer.echo(f"    … +{len(md) - 10}")
 
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_text(json.dumps(report, indent=2))
+    output.write_text(json.dumps(outcome.report, indent=2))
     rprint(f"[bold]Report written:[/bold] {output}")
+    _append_guard_log([outcome.log_entry])
 
-    repo = g.repo_root()
-    logs_dir = repo / ".forked" / "logs"
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    guard_log_entry_override = {k: v for k, v in override_block.items() if k != "allowed_values"}
-    guard_log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "overlay": overlay,
-        "mode": cfg.guards.mode,
-        "violations": report["violations"],
-        "verbose": verbose,
-        "override": guard_log_entry_override,
-        "features": report["features"],
-    }
-    if verbose:
-        guard_log_entry["debug"] = debug_info
-    with (logs_dir / "forked-guard.log").open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(guard_log_entry) + "\n")
-
-    if cfg.guards.mode == "block" and has_violations:
-        raise typer.Exit(code=2)
-    if cfg.guards.mode == "require-override" and has_violations:
-        if override_block.get("applied"):
-            return
-        raise typer.Exit(code=2)
+    if outcome.exit_code:
+        raise typer.Exit(code=outcome.exit_code)
 
 
 @app.command()
@@ -1790,6 +2405,12 @@ def feature_status():
 
     trunk = cfg.branches.trunk
     typer.echo(f"[feature] Trunk reference: {trunk}")
+    names = [branch for feature_cfg in cfg.features.values() for branch in feature_cfg.patches]
+    resolved = _resolve_names(
+        {name: f"refs/heads/{name}" for name in [trunk, *names]}, g.ref_snapshot(["refs/heads/"])
+    )
+    trunk_sha = resolved[trunk][1] if trunk in resolved else None
+    counts = _patch_counts(trunk_sha, {name: resolved[name] for name in names if name in resolved})
 
     first = True
     for feature_name, feature_cfg in cfg.features.items():
@@ -1802,18 +2423,230 @@ def feature_status():
             typer.echo("  (no slices defined)")
             continue
         for patch_branch in patches:
-            cp = g.run(["rev-parse", patch_branch], check=False)
-            if cp.returncode != 0:
+            if patch_branch not in resolved:
                 typer.secho(f"  - {patch_branch}: branch missing", fg=typer.colors.RED)
                 continue
-            sha = cp.stdout.strip()
-            ahead_behind = _ahead_behind(trunk, patch_branch)
-            if ahead_behind is None:
+            key, sha = resolved[patch_branch]
+            if key not in counts:
                 typer.echo(f"  - {patch_branch}: {sha[:12]} (unable to compute ahead/behind)")
                 continue
-            behind, ahead = ahead_behind
+            ahead, behind = counts[key]
             if ahead == 0 and behind == 0:
                 status = "merged"
             else:
                 status = f"{ahead} ahead / {behind} behind"
             typer.echo(f"  - {patch_branch}: {sha[:12]} ({status})")
+
+
+_MATRIX_MARKS = {"clean": "ok", "conflict": "X", "empty": "~", "unsupported": "?", "error": "!"}
+
+
+@feature_app.command("matrix")
+def feature_matrix(
+    profiles: bool = typer.Option(
+        False, "--profiles", help="Also test every overlay profile from forked.yml"
+    ),
+    jobs: int = typer.Option(4, "--jobs", "-j", min=1, help="Concurrent simulations"),
+    cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse cached cells from .forked/cache/feature-matrix.json"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Emit the matrix as JSON"),
+):
+    cfg = load_config()
+    if not cfg.features:
+        typer.echo("[feature] No features defined in forked.yml.")
+        return
+    g.require_merge_tree("feature matrix")
+
+    try:
+        matrix = compute_matrix(
+            cfg, cfg.branches.trunk, jobs=jobs, include_profiles=profiles, use_cache=cache
+        )
+    except subprocess.CalledProcessError as exc:
+        typer.secho(
+            f"[feature] Unable to resolve trunk '{cfg.branches.trunk}'. Run `forked sync` first.",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=2) from exc
+
+    if json_output:
+        typer.echo(json.dumps(matrix, indent=2))
+        return
+
+    typer.echo(f"[feature] Trunk reference: {matrix['trunk']} @ {matrix['trunk_sha'][:12]}")
+    features = matrix["features"]
+    cells = {tuple(cell["features"]): cell for cell in matrix["cells"] if cell["kind"] != "profile"}
+    width = max(len(name) for name in features)
+    typer.echo(" " * (width + 2) + "  ".join(f"{i + 1:>3}" for i in range(len(features))))
+    for row, row_name in enumerate(features):
+        marks = []
+        for col, col_name in enumerate(features):
+            if col < row:
+                marks.append("   ")
+                continue
+            combo = (row_name,) if col == row else (row_name, col_name)
+            marks.append(f"{_MATRIX_MARKS.get(cells[combo]['status'], '?'):>3}")
+        typer.echo(f"{row + 1:>2}. {row_name:<{width}}" + "  ".join(marks))
+    typer.echo("Legend: ok clean, X conflict, ~ empty pick, ? merge/root commit, ! error")
+
+    problems = [cell for cell in matrix["cells"] if cell["status"] != "clean"]
+    for cell in problems:
+        if cell["status"] == "error":
+            typer.secho(f"  ! {cell['name']}: {cell['error']}", fg=typer.colors.RED)
+            continue
+        stop = cell["stop"]
+        paths = ", ".join(stop["paths"]) or "-"
+        typer.secho(
+            f"  {_MATRIX_MARKS[cell['status']]} {cell['name']}: {stop['patch_branch']} "
+            f"{stop['patch_commit'][:7]} {stop['summary']} ({paths})",
+            fg=typer.colors.YELLOW,
+        )
+    for cell in matrix["cells"]:
+        if cell["kind"] == "profile" and cell["status"] == "clean":
+            typer.secho(f"  ok profile {cell['name']}", fg=typer.colors.GREEN)
+    cached = sum(1 for cell in matrix["cells"] if cell.get("cached"))
+    typer.echo(f"[feature] {len(matrix['cells'])} cell(s), {cached} from cache")
+
+
+@conflicts_app.command("show")
+def conflicts_show(
+    bundle: Annotated[Path, typer.Argument(help="Conflict bundle (.json, .ndjson or .ndjson.gz)")],
+    path: Annotated[
+        str | None, typer.Option("--path", help="Only show this conflicted path")
+    ] = None,
+    diff: Annotated[
+        str | None,
+        typer.Option("--diff", help="Print a diff: base-ours, base-theirs or ours-theirs"),
+    ] = None,
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Emit the file entries as JSON")
+    ] = False,
+):
+    if diff is not None and diff not in DIFF_KINDS:
+        raise typer.BadParameter("--diff must be one of: " + ", ".join(DIFF_KINDS))
+    if not bundle.exists():
+        typer.secho(f"[conflicts] Bundle not found: {bundle}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=2)
+    try:
+        files = [entry for entry in iter_bundle_files(bundle) if path in (None, entry["path"])]
+    except (RuntimeError, ValueError) as exc:
+        typer.secho(f"[conflicts] {exc}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=2) from exc
+    if path is not None and not files:
+        typer.secho(f"[conflicts] {path} is not in {bundle}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=2)
+
+    diffs: list[str | None] = []
+    if diff is not None:
+        try:
+            diffs = bundle_diffs(files, diff, g.repo_root())
+        except subprocess.CalledProcessError as exc:
+            typer.secho(
+                "[conflicts] Unable to diff recorded blobs (were they pruned?): "
+                + (exc.stderr or "").strip(),
+                fg=typer.colors.RED,
+                err=True,
+            )
+            raise typer.Exit(code=2) from exc
+
+    if json_output:
+        if diff is not None:
+            files = [{**entry, "diff": text} for entry, text in zip(files, diffs, strict=True)]
+        typer.echo(json.dumps(files, indent=2))
+        return
+    if diff is not None:
+        for entry, text in zip(files, diffs, strict=True):
+            if text is None:
+                typer.echo(f"[conflicts] {entry['path']}: binary, no diff", err=True)
+            else:
+                typer.echo(text, nl=False)
+        return
+    for entry in files:
+        precedence = entry.get("precedence", {})
+        kind = " (binary)" if entry.get("binary") else ""
+        typer.echo(
+            f"{entry['path']}{kind}: recommended={precedence.get('recommended', '-')} "
+            f"({precedence.get('rationale', 'no precedence recorded')})"
+        )
+
+
+@conflicts_app.command("query")
+def conflicts_query(
+    since: Annotated[
+        str | None, typer.Option("--since", help="Only bundles newer than an age (30d, 12h)")
+    ] = None,
+    path: Annotated[
+        str | None, typer.Option("--path", help="Path glob (SQLite GLOB; * also matches /)")
+    ] = None,
+    branch: Annotated[str | None, typer.Option("--branch", help="Patch branch")] = None,
+    mode: Annotated[str | None, typer.Option("--mode", help="build or sync")] = None,
+    recommended: Annotated[
+        str | None, typer.Option("--recommended", help="ours, theirs or none")
+    ] = None,
+    outcome: Annotated[
+        str | None,
+        typer.Option("--outcome", help="auto-ours, auto-theirs, stopped, exec, unresolved, ..."),
+    ] = None,
+    group_by: Annotated[
+        str,
+        typer.Option(
+            "--group-by",
+            help="Aggregate by path, patch_branch, recommended, outcome or mode; "
+            "'none' lists individual conflicts",
+        ),
+    ] = "path",
+    limit: Annotated[int, typer.Option("--limit", min=1, help="Maximum rows")] = 20,
+    reindex: Annotated[
+        bool,
+        typer.Option("--reindex", help="Index bundles missing from the index before querying"),
+    ] = False,
+    json_output: Annotated[bool, typer.Option("--json", help="Emit rows as JSON")] = False,
+):
+    if group_by != "none" and group_by not in GROUP_COLUMNS:
+        raise typer.BadParameter(
+            "--group-by must be one of: " + ", ".join([*GROUP_COLUMNS, "none"])
+        )
+    since_time = None
+    if since is not None:
+        age = _parse_age_spec(since)
+        if age is None:
+            raise typer.BadParameter("--since expects an age such as 30d or 12h")
+        since_time = datetime.now(timezone.utc) - age
+
+    repo = g.repo_root()
+    if reindex:
+        added = reindex_conflict_bundles(repo)
+        typer.echo(f"[conflicts] Indexed {added} bundle(s)", err=True)
+    with ConflictIndex(repo) as index:
+        rows = index.query(
+            since=since_time,
+            path_glob=path,
+            patch_branch=branch,
+            mode=mode,
+            recommended=recommended,
+            outcome=outcome,
+            group_by=None if group_by == "none" else group_by,
+            limit=limit,
+        )
+
+    if json_output:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        typer.echo("[conflicts] No indexed conflicts match.")
+        return
+    if group_by == "none":
+        for row in rows:
+            typer.echo(
+                f"{row['created_at'][:19]}  {row['mode']:<5} {row['patch_branch'] or '-'} "
+                f"wave {row['wave']}  {row['path']}  "
+                f"recommended={row['recommended']} outcome={row['outcome']}"
+            )
+        return
+    width = max(len(str(row[group_by])) for row in rows)
+    typer.echo(f"{group_by:<{width}}  conflicts  bundles  last seen")
+    for row in rows:
+        typer.echo(
+            f"{row[group_by]!s:<{width}}  {row['conflicts']:>9}  {row['bundles']:>7}  "
+            f"{row['last_seen'][:19]}"
+        )
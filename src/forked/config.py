@@ -1,6 +1,7 @@
 """Configuration loading for Forked CLI."""
 
-from dataclasses import asdict, dataclass, field
+import re
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
 
 import typer
@@ -44,12 +45,31 @@ class Guards:
     both_touched: bool = True
     sentinels: Sentinels = field(default_factory=Sentinels)
     size_caps: SizeCaps = field(default_factory=SizeCaps)
+    # Extra checks: name -> "module:function" (see forked.guards.CheckResult).
+    plugins: dict[str, str] = field(default_factory=dict)
+
+
+HUNK_STRATEGIES = ("ours", "theirs", "union")
+
+
+@dataclass
+class HunkRule:
+    """Resolve each conflicting hunk of matching files like ``git merge-file --<strategy>``.
+
+    With ``keep_theirs_matching`` set, a hunk whose theirs (patch) side has a
+    line matching the regex keeps theirs instead of following ``strategy``.
+    """
+
+    paths: list[str] = field(default_factory=list)
+    strategy: str = "union"
+    keep_theirs_matching: str | None = None
 
 
 @dataclass
 class PathBias:
     ours: list[str] = field(default_factory=list)
     theirs: list[str] = field(default_factory=list)
+    hunks: list[HunkRule] = field(default_factory=list)
 
 
 @dataclass
@@ -65,6 +85,13 @@ class PolicyOverrides:
     allowed_values: list[str] = field(default_factory=list)
 
 
+@dataclass
+class ConflictsCfg:
+    # Conflicted files with a stage larger than this are bundled without diffs
+    # or a merge result (and are exported as blobs instead).
+    diff_size_limit: int = 8 * 1024 * 1024
+
+
 @dataclass
 class Config:
     version: int = 1
@@ -75,6 +102,7 @@ class Config:
     path_bias: PathBias = field(default_factory=PathBias)
     worktree: WorktreeCfg = field(default_factory=WorktreeCfg)
     policy_overrides: PolicyOverrides = field(default_factory=PolicyOverrides)
+    conflicts: ConflictsCfg = field(default_factory=ConflictsCfg)
     features: dict[str, "Feature"] = field(default_factory=dict)
     overlays: dict[str, "OverlayProfile"] = field(default_factory=dict)
 
@@ -90,6 +118,27 @@ class OverlayProfile:
     features: list[str] = field(default_factory=list)
 
 
+def _hunk_rule_problem(payload: object) -> str | None:
+    """Describe what is wrong with a ``path_bias.hunks`` entry, or return None."""
+    if not isinstance(payload, dict):
+        return "must be a mapping with paths and a strategy"
+    unknown = sorted(set(payload) - {item.name for item in fields(HunkRule)})
+    if unknown:
+        return "has unknown key(s): " + ", ".join(map(str, unknown))
+    paths = payload.get("paths")
+    if not isinstance(paths, list) or not paths or not all(isinstance(p, str) for p in paths):
+        return "needs a non-empty list of paths"
+    if payload.get("strategy", "union") not in HUNK_STRATEGIES:
+        return "needs a strategy of " + ", ".join(HUNK_STRATEGIES)
+    pattern = payload.get("keep_theirs_matching")
+    if pattern is not None:
+        try:
+            re.compile(pattern)
+        except (re.error, TypeError) as exc:
+            return f"has an invalid keep_theirs_matching regex: {exc}"
+    return None
+
+
 def load_config(path: Path = DEFAULT_CFG_PATH) -> Config:
     """Load configuration from ``forked.yml``."""
     if not path.exists():
@@ -112,11 +161,21 @@ def load_config(path: Path = DEFAULT_CFG_PATH) -> Config:
         both_touched=guards_raw.get("both_touched", True),
         sentinels=sent,
         size_caps=size_caps,
+        plugins=dict(guards_raw.get("plugins", {}) or {}),
     )
 
-    path_bias = PathBias(**data.get("path_bias", {}))
+    path_bias_raw = dict(data.get("path_bias", {}) or {})
+    hunk_rules: list[HunkRule] = []
+    for index, payload in enumerate(path_bias_raw.pop("hunks", []) or []):
+        problem = _hunk_rule_problem(payload)
+        if problem is not None:
+            typer.secho(f"fatal: path_bias.hunks[{index}] {problem}", fg=typer.colors.RED)
+            raise typer.Exit(code=3)
+        hunk_rules.append(HunkRule(**payload))
+    path_bias = PathBias(**path_bias_raw, hunks=hunk_rules)
     worktree = WorktreeCfg(**data.get("worktree", {}))
     policy_overrides = PolicyOverrides(**data.get("policy_overrides", {}))
+    conflicts = ConflictsCfg(**(data.get("conflicts", {}) or {}))
 
     features_raw = data.get("features", {}) or {}
     features: dict[str, Feature] = {}
@@ -144,6 +203,7 @@ def load_config(path: Path = DEFAULT_CFG_PATH) -> Config:
         path_bias=path_bias,
         worktree=worktree,
         policy_overrides=policy_overrides,
+        conflicts=conflicts,
         features=features,
         overlays=overlays,
     )
@@ -0,0 +1,206 @@
+"""SQLite index of conflict bundles for history queries without opening every bundle."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+INDEX_FILE = "index.sqlite"
+GROUP_COLUMNS = ("path", "patch_branch", "recommended", "outcome", "mode")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (
+    id INTEGER PRIMARY KEY,
+    bundle TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    mode TEXT,
+    overlay_id TEXT,
+    patch_branch TEXT,
+    patch_commit TEXT,
+    wave INTEGER,
+    result TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    bundle_id INTEGER NOT NULL REFERENCES bundles(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    recommended TEXT,
+    sentinel TEXT,
+    path_bias TEXT,
+    binary INTEGER NOT NULL DEFAULT 0,
+    outcome TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE INDEX IF NOT EXISTS files_path ON files(path);
+CREATE INDEX IF NOT EXISTS files_bundle ON files(bundle_id);
+CREATE INDEX IF NOT EXISTS bundles_created ON bundles(created_at);
+"""
+
+
+def index_path(repo_root: Path) -> Path:
+    return repo_root / ".forked" / "conflicts" / INDEX_FILE
+
+
+class ConflictIndex:
+    """Bundles and their conflicted files, one row per (bundle, path).
+
+    ``ConflictWriter`` adds each bundle as it is written; build and sync
+    record how every file was handled once the run settles; ``forked clean``
+    drops the rows of bundles it removes. Bundle paths are stored relative to
+    the repository when they live inside it.
+    """
+
+    def __init__(self, repo_root: Path):
+        self.repo_root = repo_root
+        path = index_path(repo_root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent --all-profiles builds share the file; wait for the writer lock.
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> ConflictIndex:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
+
+    def _key(self, bundle: Path | str) -> str:
+        path = Path(bundle)
+        if not path.is_absolute():
+            return path.as_posix()
+        try:
+            return path.resolve().relative_to(self.repo_root.resolve()).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def add_bundle(
+        self,
+        bundle: Path | str,
+        header: dict[str, Any],
+        files: Iterable[dict[str, Any]],
+        created_at: datetime | None = None,
+    ):
+        """(Re)index one bundle from its header/context and file entries."""
+        key = self._key(bundle)
+        context = header.get("context", {})
+        self.conn.execute("DELETE FROM bundles WHERE bundle = ?", (key,))
+        cursor = self.conn.execute(
+            "INSERT INTO bundles (bundle, created_at, mode, overlay_id, patch_branch, "
+            "patch_commit, wave) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                (created_at or datetime.now(timezone.utc)).isoformat(),
+                context.get("mode"),
+                context.get("overlay_id"),
+                context.get("patch_branch"),
+                context.get("patch_commit"),
+                header.get("wave"),
+            ),
+        )
+        bundle_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO files (bundle_id, path, recommended, sentinel, path_bias, binary) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    bundle_id,
+                    entry["path"],
+                    entry.get("precedence", {}).get("recommended"),
+                    entry.get("precedence", {}).get("sentinel"),
+                    entry.get("precedence", {}).get("path_bias"),
+                    int(bool(entry.get("binary"))),
+                )
+                for entry in files
+            ],
+        )
+
+    def record_outcomes(self, records: Sequence[dict[str, Any]]):
+        """Store the handling of each bundle from build/sync ``conflicts`` telemetry records.
+
+        Files auto-resolved in bias mode get ``auto-<side>``; the rest inherit
+        the bundle's result (``stopped``, ``exec``, ``unresolved``, ...).
+        """
+        for record in records:
+            key = self._key(record["bundle"])
+            result = record.get("result", "unresolved")
+            self.conn.execute("UPDATE bundles SET result = ? WHERE bundle = ?", (result, key))
+            self.conn.execute(
+                "UPDATE files SET outcome = ? WHERE bundle_id = "
+                "(SELECT id FROM bundles WHERE bundle = ?)",
+                (result, key),
+            )
+            for action in record.get("auto_actions", []):
+                self.conn.execute(
+                    "UPDATE files SET outcome = ? WHERE path = ? AND bundle_id = "
+                    "(SELECT id FROM bundles WHERE bundle = ?)",
+                    (f"auto-{action['resolution']}", action["path"], key),
+                )
+
+    def forget(self, bundles: Iterable[Path | str]):
+        """Drop the rows of removed bundles."""
+        self.conn.executemany(
+            "DELETE FROM bundles WHERE bundle = ?", [(self._key(path),) for path in bundles]
+        )
+
+    def bundles(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT bundle FROM bundles")]
+
+    def query(
+        self,
+        *,
+        since: datetime | None = None,
+        path_glob: str | None = None,
+        patch_branch: str | None = None,
+        mode: str | None = None,
+        recommended: str | None = None,
+        outcome: str | None = None,
+        group_by: str | None = "path",
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Filter indexed conflicts and either aggregate them by ``group_by`` or list them.
+
+        Aggregates report ``conflicts`` (file rows), ``bundles`` (distinct
+        waves) and ``last_seen``, most frequent first. ``path_glob`` uses
+        SQLite ``GLOB`` (``*`` also matches ``/``).
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (
+            ("b.patch_branch", patch_branch),
+            ("b.mode", mode),
+            ("f.recommended", recommended),
+            ("f.outcome", outcome),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("b.created_at >= ?")
+            params.append(since.isoformat())
+        if path_glob is not None:
+            clauses.append("f.path GLOB ?")
+            params.append(path_glob)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        source = f"FROM files f JOIN bundles b ON b.id = f.bundle_id {where}"
+        if group_by is None:
+            sql = (
+                "SELECT b.created_at, b.bundle, b.mode, b.patch_branch, b.wave, f.path, "
+                f"f.recommended, f.outcome {source} ORDER BY b.created_at DESC, f.path LIMIT ?"
+            )
+        else:
+            if group_by not in GROUP_COLUMNS:
+                raise ValueError(f"Unsupported group column: {group_by}")
+            table = "b" if group_by in {"patch_branch", "mode"} else "f"
+            sql = (
+                f"SELECT {table}.{group_by} AS {group_by}, COUNT(*) AS conflicts, "
+                "COUNT(DISTINCT b.id) AS bundles, MAX(b.created_at) AS last_seen "
+                f"{source} GROUP BY {table}.{group_by} "
+                f"ORDER BY conflicts DESC, {group_by} LIMIT ?"
+            )
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
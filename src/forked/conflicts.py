@@ -2,18 +2,42 @@
 
 from __future__ import annotations
 
+import codecs
+import fnmatch
+import gzip
+import hashlib
 import json
-import subprocess
+import os
+import re
+import shutil
+import sqlite3
 import tempfile
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
+
+import typer
 
 from . import gitutil as g
+from .cache import cache_dir
 from .config import Config, Feature, Sentinels
+from .conflict_index import ConflictIndex
 
 BINARY_DIFF_THRESHOLD = 256 * 1024  # 256 KiB
+BINARY_PROBE_BYTES = 8000  # same window git's own binary detection inspects
+DEFAULT_CONFLICT_JOBS = 4
+COLLECT_BATCH_SIZE = 256
+# Bundle format -> file suffix. ``json`` is the pretty-printed v2 document; the
+# ndjson formats stream a header record, one record per file, then a trailer.
+BUNDLE_FORMATS = {"json": ".json", "ndjson": ".ndjson", "ndjson.gz": ".ndjson.gz"}
+_STREAMED_ONLY_FIELDS = ("diffs", "merge_result")
+BLOB_STORE_DIR = "objects"
+# Export directories outside .forked/conflicts, one per line, kept inside the store.
+EXPORT_ROOTS_FILE = "export-roots"
 POSIX_SHELL_NOTE = "Commands assume a POSIX-compatible shell (e.g. bash, git bash, WSL)."
 
 
@@ -24,36 +48,29 @@ def _quote_posix(arg: str) -> str:
     return "'" + arg.replace("'", "'\"'\"'") + "'"
 
 
-def _is_probably_binary(data: bytes) -> bool:
-    """Detect binary content using a null-byte probe."""
-    if b"\x00" in data:
+def _is_probably_binary(data: bytes, *, truncated: bool = False) -> bool:
+    """Detect binary content from at most ``BINARY_PROBE_BYTES`` leading bytes.
+
+    ``truncated`` marks ``data`` as a prefix of a longer blob, so a multi-byte
+    character cut at the end is not mistaken for invalid UTF-8.
+    """
+    probe = data[:BINARY_PROBE_BYTES]
+    if b"\x00" in probe:
         return True
     # Heuristic: consider text if it decodes cleanly as UTF-8
     try:
-        data.decode("utf-8")
+        final = not truncated and len(data) <= BINARY_PROBE_BYTES
+        codecs.getincrementaldecoder("utf-8")().decode(probe, final=final)
     except UnicodeDecodeError:
         return True
     return False
 
 
-def _git_show_blob(oid: str) -> bytes:
-    """Return raw blob bytes for the provided object id."""
-    cp = subprocess.run(
-        ["git", "cat-file", "-p", oid],
-        check=True,
-        capture_output=True,
-    )
-    return cp.stdout
-
-
-def _git_blob_size(oid: str) -> int:
-    cp = subprocess.run(
-        ["git", "cat-file", "-s", oid],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
-    return int(cp.stdout.strip())
+def _git_blob_size(oid: str, cwd: str | None = None) -> int:
+    size = g.object_size(oid, cwd=cwd)
+    if size is None:
+        raise RuntimeError(f"Unable to read blob {oid}")
+    return size
 
 
 def _git_unmerged_entries(cwd: str | None = None) -> dict[str, dict[int, str]]:
@@ -83,18 +100,145 @@ def _make_parent(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def _write_blob(path: Path, data: bytes):
-    _make_parent(path)
-    path.write_bytes(data)
+def blob_store_dir(repo_root: Path) -> Path:
+    """Content-addressed store shared by every exported conflict blob."""
+    return repo_root / ".forked" / "conflicts" / BLOB_STORE_DIR
 
 
-def _diff_paths(first: Path, second: Path) -> str:
-    cp = subprocess.run(
-        ["git", "diff", "--no-index", "-U3", str(first), str(second)],
-        capture_output=True,
-        text=True,
-    )
-    return cp.stdout
+def _store_blob(store: Path, oid: str, cwd: str | None = None) -> Path:
+    """Stream blob ``oid`` into the store once and return the stored file."""
+    stored = store / oid[:2] / oid[2:]
+    if not stored.exists():
+        _make_parent(stored)
+        # A unique temp file per writer: forked build workers share thread ids.
+        fd, tmp_name = tempfile.mkstemp(prefix=f"{stored.name}.", suffix=".tmp", dir=stored.parent)
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                if g.stream_blob(oid, fh.write, cwd=cwd) is None:
+                    raise RuntimeError(f"Unable to read blob {oid}")
+            # Exports are hardlinks; read-only objects keep an edit to one export
+            # from silently changing every other wave that shares the blob.
+            tmp.chmod(0o444)
+            os.replace(tmp, stored)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    return stored
+
+
+def register_export_root(repo_root: Path, root: Path):
+    """Remember an export directory outside ``.forked/conflicts`` for blob reclamation."""
+    store = blob_store_dir(repo_root)
+    resolved = root.resolve()
+    if resolved.is_relative_to(store.parent.resolve()) or resolved in _export_roots(store):
+        return
+    store.mkdir(parents=True, exist_ok=True)
+    # Appends of one short line do not interleave, so concurrent builds need no lock.
+    with (store / EXPORT_ROOTS_FILE).open("a", encoding="utf-8") as fh:
+        fh.write(f"{resolved}\n")
+
+
+def _export_roots(store: Path) -> list[Path]:
+    try:
+        lines = (store / EXPORT_ROOTS_FILE).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    return [Path(line) for line in dict.fromkeys(lines) if line]
+
+
+def _link_blob(stored: Path, target: Path):
+    """Materialise ``target`` from the store: hardlink, else symlink, else copy."""
+    _make_parent(target)
+    target.unlink(missing_ok=True)
+    try:
+        os.link(stored, target)
+        return
+    except OSError:
+        pass
+    try:
+        target.symlink_to(stored)
+        return
+    except OSError:
+        pass
+    shutil.copyfile(stored, target)
+
+
+def unreferenced_blobs(repo_root: Path, removed: Iterable[Path] = ()) -> list[Path]:
+    """Stored blobs that nothing will reference once ``removed`` paths are deleted.
+
+    Hardlinked exports are counted through the object's link count, minus the
+    links that live under ``removed``; symlinked exports are counted by
+    scanning the surviving conflict directories and every registered export
+    directory outside them (see :func:`register_export_root`).
+    """
+    store = blob_store_dir(repo_root)
+    if not store.is_dir():
+        return []
+    conflicts_root = store.parent
+    removed_roots = [path.resolve() for path in removed]
+    dropped_links: dict[tuple[int, int], int] = {}
+    symlink_targets: set[Path] = set()
+    walked = [conflicts_root, *(root for root in _export_roots(store) if root.is_dir())]
+    for dirpath, dirnames, filenames in (entry for root in walked for entry in os.walk(root)):
+        current = Path(dirpath)
+        if current == store:
+            dirnames.clear()
+            continue
+        doomed = any(current.resolve().is_relative_to(root) for root in removed_roots)
+        for name in filenames:
+            candidate = current / name
+            if candidate.is_symlink():
+                if not doomed:
+                    symlink_targets.add(candidate.resolve())
+                continue
+            if doomed or candidate.resolve() in removed_roots:
+                info = candidate.stat()
+                if info.st_nlink > 1:
+                    key = (info.st_dev, info.st_ino)
+                    dropped_links[key] = dropped_links.get(key, 0) + 1
+
+    orphans: list[Path] = []
+    for stored in sorted(store.glob("*/*")):
+        if stored.name.endswith(".tmp") or stored.resolve() in symlink_targets:
+            continue
+        info = stored.stat()
+        if info.st_nlink - dropped_links.get((info.st_dev, info.st_ino), 0) <= 1:
+            orphans.append(stored)
+    return orphans
+
+
+def _blob_diffs(pairs: list[tuple[str, str, str]], cwd: str | None = None) -> list[str]:
+    """Unified diffs for ``(path, old blob, new blob)`` computed in the object database.
+
+    Every blob is wrapped in a one-entry tree (one ``mktree --batch``) and all
+    pairs are diffed by a single ``diff-tree --stdin``; headers then name the
+    conflicted path.
+    """
+    oids = list(dict.fromkeys(oid for _, old, new in pairs for oid in (old, new)))
+    trees = dict(zip(oids, g.mktrees([[("f", oid)] for oid in oids], cwd=cwd), strict=True))
+    patches = g.diff_tree_patches([(trees[old], trees[new]) for _, old, new in pairs], cwd=cwd)
+    out: list[str] = []
+    for (path, _, _), patch in zip(pairs, patches, strict=True):
+        patch = patch.replace("diff --git a/f b/f\n", f"diff --git a/{path} b/{path}\n", 1)
+        patch = patch.replace("\n--- a/f\n", f"\n--- a/{path}\n", 1)
+        out.append(patch.replace("\n+++ b/f\n", f"\n+++ b/{path}\n", 1))
+    return out
+
+
+_MARKER_LABELS = {b"<": b"ours", b"|": b"base", b">": b"theirs"}
+_MARKER_LINE = re.compile(rb"^(<{7}|\|{7}|>{7}) [0-9a-f]{4,}(?::\S+)?$", re.MULTILINE)
+
+
+def _zdiff3_merges(triples: list[tuple[str, str, str]], cwd: str | None = None) -> list[str]:
+    """Merge ``(base, ours, theirs)`` blobs with zdiff3 markers labelled base/ours/theirs."""
+    merged = g.merge_blobs(triples, cwd=cwd, conflict_style="zdiff3")
+    return [
+        _MARKER_LINE.sub(
+            lambda m: m.group(1) + b" " + _MARKER_LABELS[m.group(1)[:1]], content
+        ).decode("utf-8", "replace")
+        for content in merged
+    ]
 
 
 def _feature_sentinels(feature: Feature | None) -> Sentinels:
@@ -103,12 +247,6 @@ def _feature_sentinels(feature: Feature | None) -> Sentinels:
     return Sentinels()
 
 
-def _match_globs(path: str, patterns: Iterable[str]) -> bool:
-    from fnmatch import fnmatch
-
-    return any(fnmatch(path, pattern) for pattern in patterns or [])
-
-
 @dataclass
 class PrecedenceResult:
     sentinel: str
@@ -117,54 +255,214 @@ class PrecedenceResult:
     rationale: str
 
 
-def _compute_precedence(
-    cfg: Config,
-    path: str,
-    feature_names: list[str],
-) -> PrecedenceResult:
-    sentinel = "none"
-    path_bias = "none"
-    recommended = "none"
-    rationale = "no rule matched"
-
-    feature_sentinels: list[Sentinels] = []
+# Rule groups in precedence order: sentinels beat path bias, ours-bias beats theirs-bias.
+_PRECEDENCE_RULES = (
+    PrecedenceResult("must_match_upstream", "none", "ours", "matched sentinel must_match_upstream"),
+    PrecedenceResult(
+        "must_diverge_from_upstream",
+        "none",
+        "theirs",
+        "matched sentinel must_diverge_from_upstream",
+    ),
+    PrecedenceResult("none", "ours", "ours", "matched path_bias.ours"),
+    PrecedenceResult("none", "theirs", "theirs", "matched path_bias.theirs"),
+)
+_NO_MATCH = PrecedenceResult("none", "none", "none", "no sentinel or path bias matched")
+
+
+# A hunk rule as the matcher keys it: (globs, strategy, keep_theirs_matching).
+_HunkKey = tuple[tuple[str, ...], str, "str | None"]
+
+
+class PrecedenceMatcher:
+    """Sentinel and path-bias globs compiled into one regex.
+
+    Each rule group becomes a named alternative, in precedence order, so one
+    ``match`` call classifies a path. Globs keep ``fnmatch`` semantics.
+    ``path_bias.hunks`` rules rank after the whole-file groups, in order.
+    """
+
+    def __init__(self, groups: Sequence[Sequence[str]], hunk_rules: Sequence[_HunkKey] = ()):
+        self._results = list(_PRECEDENCE_RULES)
+        self._hunk_rules: dict[int, _HunkKey] = {}
+        all_groups = list(groups)
+        for position, rule in enumerate(hunk_rules):
+            self._hunk_rules[len(all_groups)] = rule
+            self._results.append(
+                PrecedenceResult(
+                    "none", "hunks", "hunks", f"matched path_bias.hunks[{position}] ({rule[1]})"
+                )
+            )
+            all_groups.append(rule[0])
+        alternatives = []
+        for index, patterns in enumerate(all_groups):
+            if patterns:
+                body = "|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+                alternatives.append(f"(?P<r{index}>{body})")
+        self._names = [f"r{index}" for index, patterns in enumerate(all_groups) if patterns]
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def _match(self, path: str) -> int | None:
+        if self._regex is None:
+            return None
+        match = self._regex.match(os.path.normcase(path))
+        if match is None:
+            return None
+        for name in self._names:
+            if match.group(name) is not None:
+                return int(name[1:])
+        return None
+
+    def classify(self, path: str) -> PrecedenceResult:
+        index = self._match(path)
+        return _NO_MATCH if index is None else self._results[index]
+
+    def path_bias(self, path: str) -> str:
+        """Return ``ours``/``theirs`` when a path-bias glob (not a sentinel) claims ``path``."""
+        return self.classify(path).path_bias
+
+    def hunk_rule(self, path: str) -> tuple[str, str | None] | None:
+        """Return ``(strategy, keep_theirs_matching)`` when a hunk rule decides ``path``."""
+        index = self._match(path)
+        if index is None or index not in self._hunk_rules:
+            return None
+        _, strategy, keep_theirs = self._hunk_rules[index]
+        return strategy, keep_theirs
+
+
+@lru_cache(maxsize=64)
+def _compiled_matcher(
+    groups: tuple[tuple[str, ...], ...], hunk_rules: tuple[_HunkKey, ...]
+) -> PrecedenceMatcher:
+    return PrecedenceMatcher(groups, hunk_rules)
+
+
+def precedence_matcher(cfg: Config, feature_names: Sequence[str] = ()) -> PrecedenceMatcher:
+    """Return the (cached) matcher for ``cfg``'s global rules plus the given features' sentinels."""
+    must_match = list(cfg.guards.sentinels.must_match_upstream)
+    must_diverge = list(cfg.guards.sentinels.must_diverge_from_upstream)
     for feature_name in feature_names:
         feature_cfg = cfg.features.get(feature_name)
         if feature_cfg:
-            feature_sentinels.append(feature_cfg.sentinels)
-
-    # Sentinel precedence
-    all_must_match = list(cfg.guards.sentinels.must_match_upstream)
-    all_must_diverge = list(cfg.guards.sentinels.must_diverge_from_upstream)
-    for sent_cfg in feature_sentinels:
-        all_must_match.extend(sent_cfg.must_match_upstream)
-        all_must_diverge.extend(sent_cfg.must_diverge_from_upstream)
-
-    if _match_globs(path, all_must_match):
-        sentinel = "must_match_upstream"
-        recommended = "ours"
-        rationale = "matched sentinel must_match_upstream"
-        return PrecedenceResult(sentinel, path_bias, recommended, rationale)
-
-    if _match_globs(path, all_must_diverge):
-        sentinel = "must_diverge_from_upstream"
-        recommended = "theirs"
-        rationale = "matched sentinel must_diverge_from_upstream"
-        return PrecedenceResult(sentinel, path_bias, recommended, rationale)
-
-    # Path bias precedence
-    if _match_globs(path, cfg.path_bias.ours):
-        path_bias = "ours"
-        recommended = "ours"
-        rationale = "matched path_bias.ours"
-    elif _match_globs(path, cfg.path_bias.theirs):
-        path_bias = "theirs"
-        recommended = "theirs"
-        rationale = "matched path_bias.theirs"
-    else:
-        rationale = "no sentinel or path bias matched"
-
-    return PrecedenceResult(sentinel, path_bias, recommended, rationale)
+            must_match.extend(feature_cfg.sentinels.must_match_upstream)
+            must_diverge.extend(feature_cfg.sentinels.must_diverge_from_upstream)
+    groups = (must_match, must_diverge, cfg.path_bias.ours or [], cfg.path_bias.theirs or [])
+    hunk_rules = tuple(
+        (tuple(rule.paths), rule.strategy, rule.keep_theirs_matching)
+        for rule in cfg.path_bias.hunks
+    )
+    return _compiled_matcher(tuple(tuple(dict.fromkeys(group)) for group in groups), hunk_rules)
+
+
+_CONFLICT_OPEN = re.compile(rb"^<{7}(?: |\r?\n|$)")
+_CONFLICT_SPLIT = re.compile(rb"^={7}\r?\n?$")
+_CONFLICT_CLOSE = re.compile(rb"^>{7}(?: |\r?\n|$)")
+
+
+def _resolve_conflict_hunks(
+    merged: bytes, strategy: str, keep_theirs_matching: str | None
+) -> tuple[bytes, list[dict[str, Any]]] | None:
+    """Resolve every conflict block of a marker-annotated merge.
+
+    ``ours``/``theirs``/``union`` match ``git merge-file --ours/--theirs/--union``;
+    ``keep_theirs_matching`` overrides the strategy for hunks whose theirs side
+    has a matching line. Returns the content plus one record per hunk, or None
+    when the markers are unbalanced or ambiguous.
+
+    A ``=======`` line outside a conflict is ordinary content (an RST heading
+    underline, say). Inside one, exactly one separator must sit between the
+    opening and closing markers: a second separator, or a closing marker
+    before it, means a side contains marker-like lines and the hunk boundary
+    cannot be trusted, so the whole file is left for a human.
+    """
+    keep_theirs = re.compile(keep_theirs_matching) if keep_theirs_matching else None
+    out: list[bytes] = []
+    hunks: list[dict[str, Any]] = []
+    ours: list[bytes] = []
+    theirs: list[bytes] = []
+    state = "outside"
+    line_no = 0  # lines emitted so far, for 1-based hunk positions in the result
+    for line in merged.splitlines(keepends=True):
+        if state == "outside":
+            if _CONFLICT_OPEN.match(line):
+                state, ours, theirs = "ours", [], []
+            elif _CONFLICT_CLOSE.match(line):
+                return None
+            else:
+                out.append(line)
+                line_no += 1
+            continue
+        if _CONFLICT_OPEN.match(line):
+            return None
+        if _CONFLICT_SPLIT.match(line):
+            if state != "ours":
+                return None
+            state = "theirs"
+        elif _CONFLICT_CLOSE.match(line):
+            if state != "theirs":
+                return None
+            resolution = strategy
+            text = b"".join(theirs).decode("utf-8", "replace")
+            if keep_theirs is not None and any(keep_theirs.search(t) for t in text.splitlines()):
+                resolution = "theirs"
+            taken = {"ours": ours, "theirs": theirs, "union": ours + theirs}[resolution]
+            hunks.append(
+                {
+                    "index": len(hunks),
+                    "line": line_no + 1,
+                    "ours_lines": len(ours),
+                    "theirs_lines": len(theirs),
+                    "resolution": resolution,
+                }
+            )
+            out.extend(taken)
+            line_no += len(taken)
+            state = "outside"
+        elif state == "ours":
+            ours.append(line)
+        else:
+            theirs.append(line)
+    if state != "outside":
+        return None
+    return b"".join(out), hunks
+
+
+def resolve_hunks(
+    items: Sequence[tuple[tuple[str, str, str], str, str | None]], cwd: str | None = None
+) -> list[tuple[bytes, list[dict[str, Any]]] | None]:
+    """Hunk-resolve ``((base, ours, theirs), strategy, keep_theirs_matching)`` blob merges.
+
+    All merges run in one batched ``merge-tree`` call. Git older than 2.38
+    cannot run it, so every item is left unresolved (``None``) there.
+    """
+    if not items:
+        return []
+    if not g.supports_merge_tree():
+        typer.secho(
+            "[conflicts] path_bias.hunks needs Git 2.38 or newer; "
+            f"leaving {len(items)} path(s) to whole-file resolution.",
+            fg=typer.colors.YELLOW,
+            err=True,
+        )
+        return [None] * len(items)
+    merged = g.merge_blobs([triple for triple, _, _ in items], cwd=cwd, conflict_style="merge")
+    return [
+        _resolve_conflict_hunks(content, strategy, keep_theirs)
+        for content, (_, strategy, keep_theirs) in zip(merged, items, strict=True)
+    ]
+
+
+def precedence_payload(
+    cfg: Config, path: str, feature_names: Sequence[str], matcher: PrecedenceMatcher | None = None
+) -> dict[str, str]:
+    """Return the bundle ``precedence`` block (sentinel, path bias, recommendation) for ``path``."""
+    precedence = (matcher or precedence_matcher(cfg, feature_names)).classify(path)
+    return {
+        "sentinel": precedence.sentinel,
+        "path_bias": precedence.path_bias,
+        "recommended": precedence.recommended,
+        "rationale": precedence.rationale,
+    }
 
 
 @dataclass
@@ -183,6 +481,60 @@ class ConflictContext:
     note: str = POSIX_SHELL_NOTE
 
 
+@dataclass
+class _StagedPath:
+    """Blobs of one conflicted path, plus the diffs and merge filled in per wave."""
+
+    path: str
+    oids: tuple[str | None, str | None, str | None]
+    sizes: tuple[int, int, int]
+    binary: bool
+    oversized: bool = False
+    stored: tuple[Path, Path, Path] | None = None
+    diffs: dict[str, str | None] = field(
+        default_factory=lambda: {
+            "base_vs_ours_unified": None,
+            "base_vs_theirs_unified": None,
+            "ours_vs_theirs_unified": None,
+        }
+    )
+    merge_result: dict[str, Any] | None = None
+    hunks: list[dict[str, Any]] | None = None
+
+    def diff_pairs(self, empty: str) -> list[tuple[str, str, str]]:
+        base, ours, theirs = (oid or empty for oid in self.oids)
+        return [(self.path, base, ours), (self.path, base, theirs), (self.path, ours, theirs)]
+
+    def merge_triple(self, empty: str) -> tuple[str, str, str] | None:
+        base, ours, theirs = self.oids
+        if ours is None or theirs is None:
+            return None
+        return (base or empty, ours, theirs)
+
+    def attach(self, patches: Iterator[str], merges: Iterator[str] | None):
+        for key in self.diffs:
+            diff = next(patches)
+            if len(diff.encode("utf-8")) <= BINARY_DIFF_THRESHOLD:
+                self.diffs[key] = diff
+        if merges is not None and self.merge_triple(g.EMPTY_BLOB) is not None:
+            merged = next(merges)
+            if len(merged.encode("utf-8")) <= BINARY_DIFF_THRESHOLD:
+                self.merge_result = {"style": "zdiff3", "content": merged}
+
+
+def _chunks(items: list[_StagedPath], count: int) -> list[list[_StagedPath]]:
+    """Split ``items`` into at most ``count`` contiguous, near-equal slices."""
+    count = max(1, min(count, len(items)))
+    size, extra = divmod(len(items), count)
+    chunks: list[list[_StagedPath]] = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
+
+
 @dataclass
 class ConflictWriter:
     cfg: Config
@@ -193,6 +545,9 @@ class ConflictWriter:
     cwd: str | None = None
     wave: int = 0
     recorded_paths: list[Path] = field(default_factory=list)
+    jobs: int = DEFAULT_CONFLICT_JOBS
+    bundle_format: str = "json"
+    lazy_diffs: bool = False
 
     def _ensure_emit_prefix(self) -> Path:
         if self.emit_base is not None:
@@ -203,9 +558,10 @@ class ConflictWriter:
 
     def _make_wave_path(self) -> Path:
         prefix = self._ensure_emit_prefix()
-        if prefix.suffix == ".json":
-            prefix = prefix.with_suffix("")
-        filename = f"{prefix.name}-{self.wave}.json"
+        suffix = bundle_suffix(prefix.name)
+        if suffix:
+            prefix = prefix.with_name(prefix.name[: -len(suffix)])
+        filename = f"{prefix.name}-{self.wave}{BUNDLE_FORMATS[self.bundle_format]}"
         return prefix.with_name(filename)
 
     def _resolve_blob_root(self) -> Path | None:
@@ -220,112 +576,214 @@ class ConflictWriter:
         target.mkdir(parents=True, exist_ok=True)
         return target
 
+    def _probe(self, oid: str | None, stored: Path | None) -> bytes:
+        """Leading bytes of a stage, enough to classify it as text or binary."""
+        if oid is None:
+            return b""
+        if stored is not None:
+            with stored.open("rb") as fh:
+                return fh.read(BINARY_PROBE_BYTES)
+        prefix = g.read_blob_prefix(oid, BINARY_PROBE_BYTES, cwd=self.cwd)
+        if prefix is None:
+            raise RuntimeError(f"Unable to read blob {oid}")
+        return prefix
+
+    def _stage(self, path: str, stages: dict[int, str], empty: str | None) -> _StagedPath:
+        """Size, classify and (when ``empty`` is given) export the stages of ``path``.
+
+        Blob contents are never held whole: sizes come from ``cat-file
+        --batch-check``, exports stream to the store, and binary detection
+        reads a bounded prefix.
+        """
+        oids = (stages.get(1), stages.get(2), stages.get(3))
+        base_size, ours_size, theirs_size = (
+            _git_blob_size(oid, self.cwd) if oid else 0 for oid in oids
+        )
+        stored: tuple[Path, Path, Path] | None = None
+        if empty is not None:
+            store = blob_store_dir(self.repo_root)
+            base, ours, theirs = (_store_blob(store, oid or empty, self.cwd) for oid in oids)
+            stored = (base, ours, theirs)
+        binary = any(
+            _is_probably_binary(
+                self._probe(oid, stored[index] if stored else None),
+                truncated=size > BINARY_PROBE_BYTES,
+            )
+            for index, oid, size in ((1, oids[1], ours_size), (2, oids[2], theirs_size))
+        )
+        return _StagedPath(
+            path=path,
+            oids=oids,
+            sizes=(base_size, ours_size, theirs_size),
+            binary=binary,
+            oversized=max(base_size, ours_size, theirs_size) > self.cfg.conflicts.diff_size_limit,
+            stored=stored,
+        )
+
+    def _file_entry(
+        self,
+        entry: _StagedPath,
+        context: ConflictContext,
+        matcher: PrecedenceMatcher,
+        blob_root: Path | None,
+    ) -> dict[str, Any]:
+        path = entry.path
+        base_oid, ours_oid, theirs_oid = entry.oids
+        binary = entry.binary or entry.oversized
+        diffs: dict[str, str | None] | None = entry.diffs
+        if self.lazy_diffs:
+            diffs = None
+        elif any(value is None for value in entry.diffs.values()):
+            binary = True
+
+        commands = {
+            "accept_ours": f"git checkout --ours -- {_quote_posix(path)} && git add {_quote_posix(path)}",
+            "accept_theirs": f"git checkout --theirs -- {_quote_posix(path)} && git add {_quote_posix(path)}",
+            "open_mergetool": f"git mergetool -- {_quote_posix(path)}",
+        }
+
+        precedence = precedence_payload(self.cfg, path, (), matcher)
+        hunk_rule = matcher.hunk_rule(path)
+        if hunk_rule is not None and entry.hunks is None:
+            # Nothing to merge hunk by hunk (binary, oversized, deleted on one side).
+            precedence["recommended"] = "none"
+            precedence["rationale"] += "; no hunk-level merge available"
+
+        file_entry = {
+            "path": path,
+            "status": "conflicted",
+            "slice": context.patch_branch,
+            "precedence": precedence,
+            "oids": {
+                "base": base_oid,
+                "ours": ours_oid,
+                "theirs": theirs_oid,
+            },
+            "commands": commands,
+            "diffs": diffs
+            if not binary or diffs is None
+            else {
+                "base_vs_ours_unified": None,
+                "base_vs_theirs_unified": None,
+                "ours_vs_theirs_unified": None,
+            },
+            "merge_result": entry.merge_result if not binary else None,
+            "shell": context.shell,
+            "binary": binary,
+            "size_bytes": max(entry.sizes),
+        }
+        if hunk_rule is not None:
+            file_entry["hunks"] = {
+                "strategy": hunk_rule[0],
+                "keep_theirs_matching": hunk_rule[1],
+                "resolved": entry.hunks,
+            }
+
+        if blob_root is not None and entry.stored is not None:
+            safe_target = (blob_root / path).resolve()
+            base_root_resolved = blob_root.resolve()
+            if not str(safe_target).startswith(str(base_root_resolved)):
+                raise RuntimeError(f"Unsafe blob path escape detected for {path}")
+            for name, stored in zip(
+                ("base.txt", "ours.txt", "theirs.txt"), entry.stored, strict=True
+            ):
+                _link_blob(stored, safe_target / name)
+            file_entry["blobs_dir"] = str((safe_target).as_posix())
+        elif binary:
+            file_entry["blobs_dir"] = None
+        return file_entry
+
+    def _collect(
+        self,
+        ordered: list[tuple[str, dict[int, str]]],
+        context: ConflictContext,
+        feature_names: list[str],
+        blob_root: Path | None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield file entries in path order, holding at most one batch of entries in memory."""
+        export_empty = g.ensure_empty_blob(self.cwd) if blob_root is not None else None
+        matcher = precedence_matcher(self.cfg, feature_names)
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+            for offset in range(0, len(ordered), COLLECT_BATCH_SIZE):
+                batch = ordered[offset : offset + COLLECT_BATCH_SIZE]
+                staged = list(
+                    pool.map(lambda item: self._stage(item[0], item[1], export_empty), batch)
+                )
+
+                # Diffs and merges for the batch come from a few batched git calls,
+                # split into contiguous chunks so the chunks run concurrently.
+                text_entries = [
+                    entry
+                    for entry in staged
+                    if not entry.binary and not entry.oversized and not self.lazy_diffs
+                ]
+                empty = g.ensure_empty_blob(self.cwd) if text_entries else g.EMPTY_BLOB
+                diff_chunks = [
+                    [pair for entry in chunk for pair in entry.diff_pairs(empty)]
+                    for chunk in _chunks(text_entries, self.jobs)
+                ]
+                diff_results = pool.map(lambda pairs: _blob_diffs(pairs, self.cwd), diff_chunks)
+                patches = iter([patch for chunk in diff_results for patch in chunk])
+                # Precomputed merges need ``merge-tree --write-tree``; older git leaves them null.
+                merges: Iterator[str] | None = None
+                if text_entries and g.supports_merge_tree():
+                    merge_chunks = [
+                        [triple for entry in chunk if (triple := entry.merge_triple(empty))]
+                        for chunk in _chunks(text_entries, self.jobs)
+                    ]
+                    merge_results = pool.map(
+                        lambda triples: _zdiff3_merges(triples, self.cwd), merge_chunks
+                    )
+                    merges = iter([merged for chunk in merge_results for merged in chunk])
+                for entry in text_entries:
+                    entry.attach(patches, merges)
+                self._resolve_hunks(staged, matcher)
+
+                yield from pool.map(
+                    lambda entry: self._file_entry(entry, context, matcher, blob_root),
+                    staged,
+                )
+
+    def _resolve_hunks(self, staged: list[_StagedPath], matcher: PrecedenceMatcher):
+        """Record the per-hunk resolution of every text path a hunk rule claims."""
+        items: list[tuple[_StagedPath, tuple[str, str, str], str, str | None]] = []
+        empty = g.EMPTY_BLOB
+        for entry in staged:
+            rule = matcher.hunk_rule(entry.path)
+            if rule is None or entry.binary or entry.oversized:
+                continue
+            if empty == g.EMPTY_BLOB:
+                empty = g.ensure_empty_blob(self.cwd)
+            triple = entry.merge_triple(empty)
+            if triple is not None:
+                items.append((entry, triple, *rule))
+        if not items:
+            return
+        results = resolve_hunks([item[1:] for item in items], self.cwd)
+        for (entry, *_), result in zip(items, results, strict=True):
+            entry.hunks = result[1] if result is not None else None
+
     def next_bundle(
         self,
         context: ConflictContext,
         feature_names: list[str],
     ) -> tuple[Path, dict[str, Any]]:
+        """Collect the current conflicts into the next wave's bundle.
+
+        Streaming formats write each file record as soon as it is collected;
+        the returned bundle then omits ``diffs``/``merge_result`` (read them
+        back with :func:`iter_bundle_files`).
+        """
         self.wave += 1
         entries = _git_unmerged_entries(self.cwd)
         if not entries:
             raise RuntimeError("Conflict collector invoked with no merge conflicts present.")
 
         blob_root = self._resolve_blob_root()
-        files = []
-        for path, stages in sorted(entries.items()):
-            base_oid = stages.get(1)
-            ours_oid = stages.get(2)
-            theirs_oid = stages.get(3)
-
-            base_bytes = _git_show_blob(base_oid) if base_oid else b""
-            ours_bytes = _git_show_blob(ours_oid) if ours_oid else b""
-            theirs_bytes = _git_show_blob(theirs_oid) if theirs_oid else b""
-
-            binary = _is_probably_binary(ours_bytes) or _is_probably_binary(theirs_bytes)
-            size_bytes = max(len(base_bytes), len(ours_bytes), len(theirs_bytes))
-
-            diffs: dict[str, str | None] = {
-                "base_vs_ours_unified": None,
-                "base_vs_theirs_unified": None,
-                "ours_vs_theirs_unified": None,
-            }
-            if not binary:
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    tmp_path = Path(tmpdir)
-                    base_path = tmp_path / "base"
-                    ours_path = tmp_path / "ours"
-                    theirs_path = tmp_path / "theirs"
-                    base_path.write_bytes(base_bytes)
-                    ours_path.write_bytes(ours_bytes)
-                    theirs_path.write_bytes(theirs_bytes)
-
-                    diff_bo = _diff_paths(base_path, ours_path)
-                    diff_bt = _diff_paths(base_path, theirs_path)
-                    diff_ot = _diff_paths(ours_path, theirs_path)
-
-                    if len(diff_bo.encode("utf-8")) <= BINARY_DIFF_THRESHOLD:
-                        diffs["base_vs_ours_unified"] = diff_bo
-                    if len(diff_bt.encode("utf-8")) <= BINARY_DIFF_THRESHOLD:
-                        diffs["base_vs_theirs_unified"] = diff_bt
-                    if len(diff_ot.encode("utf-8")) <= BINARY_DIFF_THRESHOLD:
-                        diffs["ours_vs_theirs_unified"] = diff_ot
-
-                    if any(value is None for value in diffs.values()):
-                        binary = True
-
-            precedence = _compute_precedence(self.cfg, path, feature_names)
-
-            commands = {
-                "accept_ours": f"git checkout --ours -- {_quote_posix(path)} && git add {_quote_posix(path)}",
-                "accept_theirs": f"git checkout --theirs -- {_quote_posix(path)} && git add {_quote_posix(path)}",
-                "open_mergetool": f"git mergetool -- {_quote_posix(path)}",
-            }
-
-            file_entry = {
-                "path": path,
-                "status": "conflicted",
-                "slice": context.patch_branch,
-                "precedence": {
-                    "sentinel": precedence.sentinel,
-                    "path_bias": precedence.path_bias,
-                    "recommended": precedence.recommended,
-                    "rationale": precedence.rationale,
-                },
-                "oids": {
-                    "base": base_oid,
-                    "ours": ours_oid,
-                    "theirs": theirs_oid,
-                },
-                "commands": commands,
-                "diffs": diffs
-                if not binary
-                else {
-                    "base_vs_ours_unified": None,
-                    "base_vs_theirs_unified": None,
-                    "ours_vs_theirs_unified": None,
-                },
-                "shell": context.shell,
-                "binary": binary,
-                "size_bytes": size_bytes,
-            }
-
-            if blob_root is not None:
-                safe_target = (blob_root / path).resolve()
-                base_root_resolved = blob_root.resolve()
-                if not str(safe_target).startswith(str(base_root_resolved)):
-                    raise RuntimeError(f"Unsafe blob path escape detected for {path}")
-                _write_blob(safe_target / "base.txt", base_bytes)
-                _write_blob(safe_target / "ours.txt", ours_bytes)
-                _write_blob(safe_target / "theirs.txt", theirs_bytes)
-                file_entry["blobs_dir"] = str((safe_target).as_posix())
-            elif binary:
-                file_entry["blobs_dir"] = None
-
-            files.append(file_entry)
-
-        bundle = {
+        header = {
             "schema_version": 2,
             "wave": self.wave,
+            "lazy_diffs": self.lazy_diffs,
             "context": {
                 "mode": context.mode,
                 "overlay": context.overlay,
@@ -337,19 +795,196 @@ class ConflictWriter:
                 "merge_base": context.merge_base,
                 "feature": context.feature,
             },
-            "files": files,
-            "resume": context.resume,
-            "note": context.note,
         }
+        file_entries = self._collect(sorted(entries.items()), context, feature_names, blob_root)
 
         bundle_path = self._make_wave_path()
         _make_parent(bundle_path)
-        bundle_str = json.dumps(bundle, indent=2)
-        bundle_path.write_text(bundle_str)
+        bundle: dict[str, Any]
+        if self.bundle_format == "json":
+            bundle = {
+                **header,
+                "files": list(file_entries),
+                "resume": context.resume,
+                "note": context.note,
+            }
+            bundle_str = json.dumps(bundle, indent=2)
+            bundle_path.write_text(bundle_str)
+        else:
+            summaries: list[dict[str, Any]] = []
+            with _open_stream(bundle_path, "wt") as fh:
+                header_record = {**header, "resume": context.resume, "note": context.note}
+                fh.write(json.dumps({"record": "header", **header_record}) + "\n")
+                for file_entry in file_entries:
+                    fh.write(json.dumps({"record": "file", **file_entry}) + "\n")
+                    summaries.append(
+                        {k: v for k, v in file_entry.items() if k not in _STREAMED_ONLY_FIELDS}
+                    )
+                fh.write(json.dumps({"record": "trailer", "file_count": len(summaries)}) + "\n")
+            bundle = {**header_record, "files": summaries}
         self.recorded_paths.append(bundle_path)
+        try:
+            with ConflictIndex(self.repo_root) as index:
+                index.add_bundle(bundle_path, bundle, bundle["files"])
+        except sqlite3.Error as exc:
+            # The index is a convenience for history queries; never fail a build over it.
+            typer.secho(f"[conflicts] Unable to index {bundle_path}: {exc}", fg=typer.colors.YELLOW)
         return bundle_path, bundle
 
 
+def _open_stream(path: Path, mode: str) -> IO[str]:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")  # type: ignore[return-value]
+    return path.open(mode[0], encoding="utf-8")
+
+
+def bundle_suffix(name: str) -> str | None:
+    """Return the bundle format suffix of ``name`` (``.json``, ``.ndjson``, ``.ndjson.gz``)."""
+    for suffix in sorted(BUNDLE_FORMATS.values(), key=len, reverse=True):
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def iter_bundle_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield a bundle's ``header``, ``file`` and ``trailer`` records in any bundle format.
+
+    A v2 JSON document is presented as the same record sequence a streaming
+    bundle contains, so consumers can handle both with one loop.
+    """
+    if bundle_suffix(path.name) == ".json":
+        bundle = json.loads(path.read_text(encoding="utf-8"))
+        files = bundle.pop("files", [])
+        yield {"record": "header", **bundle}
+        for file_entry in files:
+            yield {"record": "file", **file_entry}
+        yield {"record": "trailer", "file_count": len(files)}
+        return
+    seen_trailer = False
+    with _open_stream(path, "rt") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            seen_trailer = record.get("record") == "trailer"
+            yield record
+    if not seen_trailer:
+        raise RuntimeError(f"Conflict bundle {path} is truncated (no trailer record).")
+
+
+def iter_bundle_files(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the file entries of a bundle one at a time."""
+    for record in iter_bundle_records(path):
+        if record.get("record") == "file":
+            yield {k: v for k, v in record.items() if k != "record"}
+
+
+def read_bundle(path: Path) -> dict[str, Any]:
+    """Load a bundle of any format into the v2 JSON shape."""
+    bundle: dict[str, Any] = {}
+    files: list[dict[str, Any]] = []
+    for record in iter_bundle_records(path):
+        kind = record.pop("record", None)
+        if kind == "header":
+            bundle.update(record)
+        elif kind == "file":
+            files.append(record)
+    bundle["files"] = files
+    return bundle
+
+
+# ``forked conflicts show --diff`` names -> (old side, new side, bundle diff key).
+DIFF_KINDS = {
+    "base-ours": ("base", "ours", "base_vs_ours_unified"),
+    "base-theirs": ("base", "theirs", "base_vs_theirs_unified"),
+    "ours-theirs": ("ours", "theirs", "ours_vs_theirs_unified"),
+}
+DIFF_CACHE_DIR = "conflict-diffs"
+
+
+def bundle_diffs(
+    files: Sequence[dict[str, Any]],
+    kind: str,
+    repo_root: Path,
+    cwd: str | None = None,
+) -> list[str | None]:
+    """Return the ``kind`` diff of each bundle file entry, computing missing ones on demand.
+
+    Diffs already in the bundle are used as-is; the rest are computed from the
+    recorded object ids in one batch and cached under
+    ``.forked/cache/conflict-diffs/``. Binary entries yield None.
+    """
+    old_side, new_side, key = DIFF_KINDS[kind]
+    cache_root = cache_dir(repo_root) / DIFF_CACHE_DIR
+    results: list[str | None] = [None] * len(files)
+    pending: dict[int, tuple[str, str, str, Path]] = {}
+    empty: str | None = None
+    for index, entry in enumerate(files):
+        inline = (entry.get("diffs") or {}).get(key)
+        if inline is not None or entry.get("binary"):
+            results[index] = inline
+            continue
+        oids = entry.get("oids", {})
+        old, new = oids.get(old_side), oids.get(new_side)
+        if old is None or new is None:
+            empty = empty or g.ensure_empty_blob(cwd)
+        old, new = old or empty, new or empty
+        digest = hashlib.sha256(f"{entry['path']}\0{old}\0{new}".encode()).hexdigest()
+        cached = cache_root / digest[:2] / f"{digest[2:]}.diff"
+        if cached.exists():
+            results[index] = cached.read_text(encoding="utf-8")
+        else:
+            pending[index] = (entry["path"], str(old), str(new), cached)
+    if pending:
+        patches = _blob_diffs([(path, old, new) for path, old, new, _ in pending.values()], cwd)
+        for (index, (_, _, _, cached)), patch in zip(pending.items(), patches, strict=True):
+            _make_parent(cached)
+            cached.write_text(patch, encoding="utf-8")
+            results[index] = patch
+    return results
+
+
+def record_conflict_outcomes(repo_root: Path, records: Sequence[dict[str, Any]]):
+    """Store how each bundle in build/sync telemetry was handled in the conflict index."""
+    if not records:
+        return
+    try:
+        with ConflictIndex(repo_root) as index:
+            index.record_outcomes(records)
+    except sqlite3.Error as exc:
+        typer.secho(f"[conflicts] Unable to update conflict index: {exc}", fg=typer.colors.YELLOW)
+
+
+def reindex_conflict_bundles(repo_root: Path) -> int:
+    """Bring the conflict index in line with the bundles under ``.forked/conflicts``.
+
+    Rows of deleted bundles are dropped and bundles written before the index
+    existed are added (dated by file mtime, outcome ``pending``). Returns the
+    number of bundles added.
+    """
+    conflicts_root = repo_root / ".forked" / "conflicts"
+    on_disk = {
+        child.relative_to(repo_root).as_posix(): child
+        for child in (conflicts_root.iterdir() if conflicts_root.is_dir() else [])
+        if child.is_file() and bundle_suffix(child.name)
+    }
+    added = 0
+    with ConflictIndex(repo_root) as index:
+        known = set(index.bundles())
+        index.forget(key for key in known if key not in on_disk and not (repo_root / key).exists())
+        for key, child in sorted(on_disk.items()):
+            if key in known:
+                continue
+            try:
+                bundle = read_bundle(child)
+            except (RuntimeError, ValueError, OSError):
+                continue
+            mtime = datetime.fromtimestamp(child.stat().st_mtime, tz=timezone.utc)
+            index.add_bundle(child, bundle, bundle["files"], created_at=mtime)
+            added += 1
+    return added
+
+
 def create_conflict_writer(
     cfg: Config,
     repo_root: Path,
@@ -358,7 +993,13 @@ def create_conflict_writer(
     conflict_blobs_dir: str | None,
     overlay_id: str | None,
     cwd: str | None = None,
+    jobs: int = DEFAULT_CONFLICT_JOBS,
+    bundle_format: str = "json",
+    lazy_diffs: bool = False,
 ) -> ConflictWriter:
+    if bundle_format not in BUNDLE_FORMATS:
+        raise typer.BadParameter("--conflict-format must be one of: " + ", ".join(BUNDLE_FORMATS))
+
     def _normalize_path(raw: str | None) -> Path | None:
         if raw is None:
             return None
@@ -376,6 +1017,8 @@ def create_conflict_writer(
         base_dir = repo_root / ".forked" / "conflicts" / (overlay_id or "sync")
         base_dir.mkdir(parents=True, exist_ok=True)
         blobs_base = base_dir
+    elif blobs_base is not None:
+        register_export_root(repo_root, blobs_base)
 
     if emit_conflicts == "__AUTO__":
         emit_path = None
@@ -388,6 +1031,9 @@ def create_conflict_writer(
         blobs_base=blobs_base,
         default_prefix=default_prefix,
         cwd=cwd,
+        jobs=jobs,
+        bundle_format=bundle_format,
+        lazy_diffs=lazy_diffs,
     )
 
 
@@ -396,18 +1042,61 @@ def recommended_actions(bundle: dict[str, Any]) -> list[tuple[str, str]]:
     actions: list[tuple[str, str]] = []
     for entry in bundle.get("files", []):
         rec = entry.get("precedence", {}).get("recommended")
-        if rec in ("ours", "theirs"):
+        if rec in ("ours", "theirs", "hunks"):
             actions.append((entry["path"], rec))
     return actions
 
 
+def _write_hunk_resolutions(entries: Sequence[dict[str, Any]], cwd: str | None) -> set[str]:
+    """Write the hunk-resolved content of bundle ``entries`` into the worktree.
+
+    Returns the paths written; a path whose merge no longer parses is left
+    conflicted.
+    """
+    if not entries:
+        return set()
+    empty = g.ensure_empty_blob(cwd)
+    items = [
+        (
+            (entry["oids"]["base"] or empty, entry["oids"]["ours"], entry["oids"]["theirs"]),
+            entry["hunks"]["strategy"],
+            entry["hunks"]["keep_theirs_matching"],
+        )
+        for entry in entries
+    ]
+    root = Path(cwd) if cwd else Path.cwd()
+    written: set[str] = set()
+    for entry, result in zip(entries, resolve_hunks(items, cwd), strict=True):
+        if result is not None:
+            (root / entry["path"]).write_bytes(result[0])
+            written.add(entry["path"])
+    return written
+
+
+def apply_resolutions(actions: Sequence[tuple[str, str]], cwd: str | None):
+    """Check out each path's chosen side and stage the results.
+
+    Paths are grouped by side, so a wave costs at most one ``checkout`` per
+    side plus one ``add`` however many files it resolves. ``hunks`` paths
+    must already hold their resolved content and are only staged.
+    """
+    for side in ("ours", "theirs"):
+        paths = [path for path, choice in actions if choice == side]
+        if paths:
+            g.run_pathspecs(["checkout", f"--{side}"], paths, cwd=cwd)
+    if actions:
+        g.run_pathspecs(["add"], [path for path, _ in actions], cwd=cwd)
+
+
 def apply_recommendations(bundle: dict[str, Any], cwd: str | None) -> list[tuple[str, str]]:
-    """Apply recommended ours/theirs actions and return the list applied."""
+    """Apply recommended ours/theirs/hunks actions and return the list applied."""
     actions = recommended_actions(bundle)
-    for path, choice in actions:
-        if choice == "ours":
-            g.run(["checkout", "--ours", "--", path], cwd=cwd)
-        elif choice == "theirs":
-            g.run(["checkout", "--theirs", "--", path], cwd=cwd)
-        g.run(["add", path], cwd=cwd)
+    hunk_paths = {path for path, choice in actions if choice == "hunks"}
+    if hunk_paths:
+        entries = [entry for entry in bundle.get("files", []) if entry["path"] in hunk_paths]
+        written = _write_hunk_resolutions(entries, cwd)
+        actions = [
+            (path, choice) for path, choice in actions if choice != "hunks" or path in written
+        ]
+    apply_resolutions(actions, cwd)
     return actions
@@ -1,12 +1,26 @@
 """Lightweight Git helpers for Forked CLI."""
 
+import atexit
+import os
 import subprocess as sp
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
+from typing import IO
 
 import typer
 
 
-def run(args: list[str], cwd: str | None = None, check: bool = True) -> sp.CompletedProcess:
+def run(
+    args: list[str],
+    cwd: str | None = None,
+    check: bool = True,
+    env: dict[str, str] | None = None,
+    input: str | None = None,
+) -> sp.CompletedProcess:
     """Run a git command and return the completed process."""
     return sp.run(
         ["git", *args],
@@ -14,12 +28,64 @@ def run(args: list[str], cwd: str | None = None, check: bool = True) -> sp.Compl
         text=True,
         capture_output=True,
         check=check,
+        env={**os.environ, **env} if env else None,
+        input=input,
     )
 
 
+def run_pathspecs(
+    args: list[str], paths: Iterable[str], cwd: str | None = None
+) -> sp.CompletedProcess:
+    """Run ``git <args>`` on many paths in one call via a NUL-separated ``--pathspec-from-file``."""
+    return run(
+        [*args, "--pathspec-from-file=-", "--pathspec-file-nul"],
+        cwd=cwd,
+        input="\0".join(paths),
+    )
+
+
+@lru_cache(maxsize=1)
+def git_version() -> tuple[int, int, int]:
+    """Return the installed git version as ``(major, minor, patch)``."""
+    raw = run(["--version"]).stdout.strip().split()
+    version = raw[-1] if raw else ""
+    parts: list[int] = []
+    for chunk in version.split(".")[:3]:
+        digits = "".join(ch for ch in chunk if ch.isdigit())
+        parts.append(int(digits) if digits else 0)
+    while len(parts) < 3:
+        parts.append(0)
+    return parts[0], parts[1], parts[2]
+
+
+MERGE_TREE_MIN_VERSION = (2, 38, 0)
+
+
+def supports_merge_tree() -> bool:
+    """Return True when git can run ``merge-tree --write-tree`` (Git 2.38+)."""
+    return git_version() >= MERGE_TREE_MIN_VERSION
+
+
+def require_merge_tree(feature: str):
+    """Exit with a clear message when ``feature`` needs a newer git than is installed."""
+    if supports_merge_tree():
+        return
+    found = ".".join(str(part) for part in git_version())
+    typer.secho(
+        f"[forked] {feature} needs Git 2.38 or newer (merge-tree --write-tree); found {found}.",
+        fg=typer.colors.RED,
+        err=True,
+    )
+    raise typer.Exit(code=2)
+
+
 def ensure_clean():
-    """Ensure the current repository has no staged or unstaged changes."""
-    out = run(["status", "--porcelain"], check=True).stdout.strip()
+    """Ensure the current repository has no staged or unstaged changes.
+
+    ``.forked/`` is left out: it holds forked's own caches, journals and
+    reports, which planning may write before the build checks the tree.
+    """
+    out = run(["status", "--porcelain", "--", ":(top,exclude).forked"], check=True).stdout.strip()
     if out:
         typer.echo("[forked] Current forked working tree is not clean. Commit or stash first.")
         staged: list[str] = []
@@ -62,19 +128,451 @@ def merge_base(a: str, b: str) -> str:
     return run(["merge-base", a, b]).stdout.strip()
 
 
+def ref_snapshot(patterns: Iterable[str], cwd: str | None = None) -> dict[str, tuple[str, int]]:
+    """Map full refnames under ``patterns`` to ``(oid, committer unix time)`` in one call."""
+    cp = run(
+        ["for-each-ref", "--format=%(objectname) %(committerdate:unix) %(refname)", *patterns],
+        cwd=cwd,
+    )
+    snapshot: dict[str, tuple[str, int]] = {}
+    for line in cp.stdout.splitlines():
+        oid, ts_value, refname = line.split(" ", 2)
+        snapshot[refname] = (oid, int(ts_value) if ts_value.isdigit() else 0)
+    return snapshot
+
+
+def ahead_behind(
+    base: str, tips: dict[str, str], cwd: str | None = None
+) -> dict[str, tuple[int, int]]:
+    """Return ``(ahead, behind)`` of each tip relative to the ``base`` commit id.
+
+    ``tips`` maps names to their commit ids. On Git 2.41+ the tips named by a
+    full refname are answered by one ``for-each-ref %(ahead-behind:<base>)``;
+    any others (and every tip on older versions) share a single ``rev-list``
+    walk above the tips' common merge base (served by the commit-graph when
+    one is written) that counts reachability per tip.
+    """
+    counts: dict[str, tuple[int, int]] = {}
+    refnames = [name for name in tips if name.startswith("refs/")]
+    if refnames and git_version() >= (2, 41, 0):
+        cp = run(
+            ["for-each-ref", f"--format=%(refname) %(ahead-behind:{base})", *refnames], cwd=cwd
+        )
+        for line in cp.stdout.splitlines():
+            refname, ahead, behind = line.rsplit(" ", 2)
+            if refname in tips:
+                counts[refname] = (int(ahead), int(behind))
+    remaining = {name: oid for name, oid in tips.items() if name not in counts}
+    if remaining:
+        counts.update(_ahead_behind_walk(base, remaining, cwd))
+    return counts
+
+
+def _ahead_behind_walk(
+    base: str, tips: dict[str, str], cwd: str | None = None
+) -> dict[str, tuple[int, int]]:
+    # Bit 0 marks commits reachable from base, bit i+1 those reachable from tip i.
+    heads = [base, *tips.values()]
+    bases = run(["merge-base", "--octopus", *heads], cwd=cwd, check=False).stdout.split()
+    walk = run(
+        ["rev-list", "--topo-order", "--parents", *heads, *(f"^{oid}" for oid in bases)], cwd=cwd
+    )
+    reach: dict[str, int] = {}
+    for bit, oid in enumerate(heads):
+        reach[oid] = reach.get(oid, 0) | (1 << bit)
+    tally: dict[int, int] = {}
+    # Topological order lists every child before its parents, so masks are final when read.
+    for line in walk.stdout.splitlines():
+        commit, *parents = line.split()
+        mask = reach.pop(commit, 0)
+        tally[mask] = tally.get(mask, 0) + 1
+        for parent in parents:
+            reach[parent] = reach.get(parent, 0) | mask
+    result: dict[str, tuple[int, int]] = {}
+    for bit, refname in enumerate(tips, start=1):
+        ahead = sum(n for mask, n in tally.items() if mask >> bit & 1 and not mask & 1)
+        behind = sum(n for mask, n in tally.items() if mask & 1 and not mask >> bit & 1)
+        result[refname] = (ahead, behind)
+    return result
+
+
+def resolve_commits(names: Iterable[str], cwd: str | None = None) -> dict[str, str | None]:
+    """Resolve revision ``names`` to commit ids with one ``cat-file --batch-check``.
+
+    Like ``rev-parse --verify <name>^{commit}`` per name, without a process
+    each; names that do not resolve to a commit map to None.
+    """
+    unique = list(dict.fromkeys(names))
+    if not unique:
+        return {}
+    cp = run(
+        ["cat-file", "--batch-check=%(objectname)"],
+        cwd=cwd,
+        input="".join(f"{name}^{{commit}}\n" for name in unique),
+    )
+    resolved: dict[str, str | None] = {}
+    for name, line in zip(unique, cp.stdout.splitlines(), strict=True):
+        resolved[name] = None if line.endswith((" missing", " ambiguous")) else line.strip()
+    return resolved
+
+
 def changed_paths(a: str, b: str) -> list[str]:
     """List paths changed between two refs."""
     out = run(["diff", "--name-only", "--find-renames", f"{a}...{b}"]).stdout
     return sorted(p for p in out.splitlines() if p)
 
 
-def blob_hash(ref: str, path: str) -> str | None:
+def blob_hash(ref: str, path: str, cwd: str | None = None) -> str | None:
     """Return the blob hash for ``path`` at ``ref`` (or None if absent)."""
-    cp = run(["ls-tree", ref, "--", path], check=False)
-    if cp.returncode != 0 or not cp.stdout.strip():
-        return None
-    parts = cp.stdout.split()
-    return parts[2] if len(parts) >= 3 else None
+    info = object_info(f"{ref}:{path}", cwd=cwd)
+    return info[0] if info else None
+
+
+def iter_tree(ref: str, cwd: str | None = None) -> Iterator[tuple[str, str]]:
+    """Stream ``(path, oid)`` for every entry under ``ref``.
+
+    Entries arrive in git's recursive tree order, which is byte order of the
+    full path, so two listings can be merge-joined without materialising them.
+    """
+    proc = sp.Popen(
+        ["git", "ls-tree", "-r", "-z", ref],
+        cwd=cwd,
+        stdout=sp.PIPE,
+        stderr=sp.PIPE,
+    )
+    stdout: IO[bytes] = proc.stdout  # type: ignore[assignment]
+    pending = b""
+    try:
+        while True:
+            chunk = stdout.read(65536)
+            if not chunk:
+                break
+            records = (pending + chunk).split(b"\0")
+            pending = records.pop()
+            for record in records:
+                # format: <mode> SP <type> SP <oid> TAB <path>
+                meta, _, raw_path = record.partition(b"\t")
+                oid = meta.rsplit(b" ", 1)[-1].decode("ascii")
+                yield raw_path.decode("utf-8", "surrogateescape"), oid
+    finally:
+        stdout.close()
+        stderr = proc.stderr.read() if proc.stderr else b""
+        if proc.stderr:
+            proc.stderr.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise sp.CalledProcessError(
+            returncode,
+            ["git", "ls-tree", "-r", "-z", ref],
+            stderr=stderr.decode("utf-8", "replace"),
+        )
+
+
+_SYNTHETIC_IDENT = {
+    "GIT_AUTHOR_NAME": "forked",
+    "GIT_AUTHOR_EMAIL": "forked@localhost",
+    "GIT_COMMITTER_NAME": "forked",
+    "GIT_COMMITTER_EMAIL": "forked@localhost",
+}
+
+
+def commit_tree(
+    tree: str,
+    parents: list[str],
+    message: str,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+) -> str:
+    """Create a commit object for ``tree`` without touching any ref or worktree."""
+    args = ["commit-tree", tree]
+    for parent in parents:
+        args.extend(["-p", parent])
+    args.extend(["-m", message])
+    return run(args, cwd=cwd, env=env).stdout.strip()
+
+
+def merge_tree(
+    merge_base: str,
+    ours: str,
+    theirs: str,
+    cwd: str | None = None,
+    conflict_style: str | None = None,
+) -> tuple[str, list[str]]:
+    """Three-way merge commits in the object database.
+
+    Returns ``(tree oid, conflicted paths)``; the tree still holds conflict
+    markers (in ``conflict_style``, e.g. ``zdiff3``, when given) when the path
+    list is non-empty. Git older than 2.40 cannot take an explicit merge base,
+    so the base is imposed through throwaway commits.
+    """
+    if git_version() >= (2, 40, 0):
+        args = ["merge-tree", "--write-tree", "-z", "--no-messages", "--name-only"]
+        args.extend([f"--merge-base={merge_base}", ours, theirs])
+    else:
+        base_commit = commit_tree(
+            f"{merge_base}^{{tree}}", [], "forked merge base", cwd=cwd, env=_SYNTHETIC_IDENT
+        )
+        ours = commit_tree(
+            f"{ours}^{{tree}}", [base_commit], "forked ours", cwd=cwd, env=_SYNTHETIC_IDENT
+        )
+        theirs = commit_tree(
+            f"{theirs}^{{tree}}", [base_commit], "forked theirs", cwd=cwd, env=_SYNTHETIC_IDENT
+        )
+        args = ["merge-tree", "--write-tree", "-z", "--no-messages", "--name-only", ours, theirs]
+    if conflict_style:
+        args = ["-c", f"merge.conflictStyle={conflict_style}", *args]
+    cp = run(args, cwd=cwd, check=False)
+    if cp.returncode not in (0, 1):
+        raise sp.CalledProcessError(cp.returncode, ["git", *args], cp.stdout, cp.stderr)
+    fields = cp.stdout.split("\0")
+    tree = fields[0].strip()
+    conflicts = [path for path in fields[1:] if path] if cp.returncode == 1 else []
+    return tree, conflicts
+
+
+def patch_ids(commits: Iterable[str], cwd: str | None = None) -> dict[str, str]:
+    """Return ``{commit: stable patch-id}`` via one ``diff-tree | patch-id`` pipe.
+
+    Merge commits and commits without a diff have no patch-id and are omitted.
+    """
+    diff_tree = sp.Popen(
+        ["git", "diff-tree", "--stdin", "-p", "--root"],
+        cwd=cwd,
+        stdin=sp.PIPE,
+        stdout=sp.PIPE,
+        stderr=sp.DEVNULL,
+    )
+    patch_id = sp.Popen(
+        ["git", "patch-id", "--stable"],
+        cwd=cwd,
+        stdin=diff_tree.stdout,
+        stdout=sp.PIPE,
+        stderr=sp.DEVNULL,
+    )
+    diff_tree.stdout.close()  # type: ignore[union-attr]
+    stdin: IO[bytes] = diff_tree.stdin  # type: ignore[assignment]
+
+    def feed():
+        # Written from a thread: both pipes fill up long before a big range is listed.
+        try:
+            for commit in commits:
+                stdin.write(f"{commit}\n".encode("ascii"))
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                stdin.close()
+            except BrokenPipeError:
+                pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    out = patch_id.communicate()[0].decode("ascii")
+    writer.join()
+    if diff_tree.wait() != 0 or patch_id.returncode != 0:
+        raise sp.CalledProcessError(diff_tree.returncode or patch_id.returncode, "git patch-id")
+    result: dict[str, str] = {}
+    for line in out.splitlines():
+        pid, _, commit = line.partition(" ")
+        if commit:
+            result[commit] = pid
+    return result
+
+
+BLOB_CHUNK_SIZE = 1024 * 1024
+EMPTY_BLOB = "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def ensure_empty_blob(cwd: str | None = None) -> str:
+    """Write the empty blob (git does not always have it on disk) and return its id."""
+    return run(["hash-object", "-w", "--stdin"], cwd=cwd, input="").stdout.strip()
+
+
+def mktrees(listings: list[list[tuple[str, str]]], cwd: str | None = None) -> list[str]:
+    """Write flat trees of ``(name, blob oid)`` entries with a single ``mktree --batch``."""
+    if not listings:
+        return []
+    chunks = [
+        "".join(f"100644 blob {oid}\t{name}\n" for name, oid in entries) for entries in listings
+    ]
+    trees = run(["mktree", "--batch"], cwd=cwd, input="\n".join(chunks)).stdout.split()
+    if len(trees) != len(listings):
+        raise RuntimeError(f"git mktree wrote {len(trees)} tree(s), expected {len(listings)}")
+    return trees
+
+
+def merge_blobs(
+    triples: list[tuple[str, str, str]],
+    cwd: str | None = None,
+    conflict_style: str = "zdiff3",
+) -> list[bytes]:
+    """Three-way merge ``(base, ours, theirs)`` blob triples with one ``merge-tree`` run.
+
+    Each triple becomes an entry of three flat throwaway trees; the merged
+    content (with conflict markers in ``conflict_style``) is returned per triple.
+    """
+    if not triples:
+        return []
+    listings = [[(str(i), triple[side]) for i, triple in enumerate(triples)] for side in range(3)]
+    base_tree, ours_tree, theirs_tree = mktrees(listings, cwd=cwd)
+    base = commit_tree(base_tree, [], "forked merge base", cwd=cwd, env=_SYNTHETIC_IDENT)
+    ours = commit_tree(ours_tree, [base], "forked ours", cwd=cwd, env=_SYNTHETIC_IDENT)
+    theirs = commit_tree(theirs_tree, [base], "forked theirs", cwd=cwd, env=_SYNTHETIC_IDENT)
+    merged, _ = merge_tree(base, ours, theirs, cwd=cwd, conflict_style=conflict_style)
+    return [read_blob(f"{merged}:{i}", cwd=cwd) or b"" for i in range(len(triples))]
+
+
+def diff_tree_patches(pairs: list[tuple[str, str]], cwd: str | None = None) -> list[str]:
+    """Return the unified patch for each ``(old tree, new tree)`` pair from one ``diff-tree``.
+
+    ``diff-tree --stdin`` echoes every input line before its patch, which is
+    what splits the combined output back into per-pair sections.
+    """
+    if not pairs:
+        return []
+    cp = sp.run(
+        ["git", "diff-tree", "--stdin", "-p", "-U3"],
+        cwd=cwd,
+        input="".join(f"{old} {new}\n" for old, new in pairs).encode("ascii"),
+        capture_output=True,
+        check=True,
+    )
+    text = cp.stdout.decode("utf-8", "replace")
+    patches: list[str] = []
+    pending = iter(pairs)
+    marker = "{} {}\n".format(*next(pending))
+    position = text.find(marker)
+    for pair in pending:
+        start = position + len(marker)
+        # Patch lines never start with a tree id, so a line-anchored echo is unambiguous.
+        marker = "\n{} {}\n".format(*pair)
+        position = text.find(marker, start - 1)
+        patches.append(text[start : position + 1])
+        position += 1
+        marker = marker[1:]
+    patches.append(text[position + len(marker) :])
+    return patches
+
+
+@dataclass(frozen=True)
+class TreeChange:
+    """One ``diff-tree --raw`` record with its ``--numstat`` line counts.
+
+    Absent sides have ``None`` oids; ``added``/``deleted`` are None for binary
+    files. Renames carry the source path in ``old_path``.
+    """
+
+    status: str
+    path: str
+    old_path: str | None
+    old_mode: str
+    new_mode: str
+    old_oid: str | None
+    new_oid: str | None
+    added: int | None = None
+    deleted: int | None = None
+
+
+def _decode_path(raw: bytes) -> str:
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def diff_tree_changes(
+    pairs: list[tuple[str, str]],
+    cwd: str | None = None,
+    find_renames: bool = True,
+    numstat: bool = True,
+    paths: Iterable[str] = (),
+) -> list[list[TreeChange]]:
+    """Return the raw changes (modes, oids, numstat) of each ``(old, new)`` tree pair.
+
+    All pairs are diffed by one ``diff-tree --stdin -z --raw --numstat`` run;
+    the echoed input line before each section splits the output per pair.
+    ``paths`` limits the diff to those literal paths.
+    """
+    if not pairs:
+        return []
+    args = ["git", "diff-tree", "--stdin", "-r", "-z", "--raw"]
+    if numstat:
+        args.append("--numstat")
+    if find_renames:
+        args.append("--find-renames")
+    literal = [f":(literal){path}" for path in paths]
+    if literal:
+        args.extend(["--", *literal])
+    cp = sp.run(
+        args,
+        cwd=cwd,
+        input="".join(f"{old} {new}\n" for old, new in pairs).encode("ascii"),
+        capture_output=True,
+        check=True,
+    )
+    headers = [f"{old} {new}\n".encode("ascii") for old, new in pairs]
+    raw: list[list[TreeChange]] = [[] for _ in pairs]
+    counts: list[dict[str, tuple[int | None, int | None]]] = [{} for _ in pairs]
+    tokens = iter(cp.stdout.split(b"\0"))
+    current = -1
+    for token in tokens:
+        while current + 1 < len(headers) and token.startswith(headers[current + 1]):
+            current += 1
+            token = token[len(headers[current]) :]
+        if not token:
+            continue
+        if token.startswith(b":"):
+            old_mode, new_mode, old_oid, new_oid, status = token[1:].decode("ascii").split(" ")
+            old_path = None
+            if status[0] in "RC":
+                old_path = _decode_path(next(tokens))
+            path = _decode_path(next(tokens))
+            raw[current].append(
+                TreeChange(
+                    status=status,
+                    path=path,
+                    old_path=old_path,
+                    old_mode=old_mode,
+                    new_mode=new_mode,
+                    old_oid=None if set(old_oid) == {"0"} else old_oid,
+                    new_oid=None if set(new_oid) == {"0"} else new_oid,
+                )
+            )
+            continue
+        added, deleted, rest = token.split(b"\t", 2)
+        if not rest:
+            next(tokens)  # rename source
+            rest = next(tokens)
+        counts[current][_decode_path(rest)] = (
+            int(added) if added.isdigit() else None,
+            int(deleted) if deleted.isdigit() else None,
+        )
+    return [
+        [
+            replace(change, added=stats[0], deleted=stats[1])
+            if (stats := pair_counts.get(change.path))
+            else change
+            for change in changes
+        ]
+        for changes, pair_counts in zip(raw, counts, strict=True)
+    ]
+
+
+def tree_paths(tree: str, pathspecs: Iterable[str] = (), cwd: str | None = None) -> list[str]:
+    """List the files under ``tree``, limited to ``pathspecs`` when given.
+
+    ``ls-tree`` rejects ``:(glob)`` magic, so filtered listings diff the tree
+    against the empty tree instead; git then skips subtrees no pathspec can
+    match, so only candidate paths are read.
+    """
+    specs = list(pathspecs)
+    if not specs:
+        return [path for path, _ in iter_tree(tree, cwd=cwd)]
+    cp = sp.run(
+        ["git", "diff-tree", "-r", "-z", "--name-only", EMPTY_TREE, tree, "--", *specs],
+        cwd=cwd,
+        capture_output=True,
+        check=True,
+    )
+    return [_decode_path(raw) for raw in cp.stdout.split(b"\0") if raw]
 
 
 def current_ref() -> str:
@@ -99,3 +597,246 @@ def worktree_for_branch(branch: str) -> Path | None:
             if ref == f"refs/heads/{branch}" and cur_path is not None:
                 return Path(cur_path)
     return None
+
+
+class CatFile:
+    """Long-lived ``git cat-file --batch``/``--batch-check`` reader.
+
+    Each instance owns up to two git processes (one per mode, spawned lazily)
+    and must only be used by one thread at a time; use :class:`CatFilePool`
+    to share readers between concurrent callers.
+    """
+
+    def __init__(self, cwd: str | None = None):
+        self.cwd = cwd
+        self._batch: sp.Popen | None = None
+        self._check: sp.Popen | None = None
+
+    def _spawn(self, mode: str) -> sp.Popen:
+        return sp.Popen(
+            ["git", "cat-file", mode],
+            cwd=self.cwd,
+            stdin=sp.PIPE,
+            stdout=sp.PIPE,
+            stderr=sp.DEVNULL,
+        )
+
+    def _process(self, mode: str) -> sp.Popen:
+        proc = self._batch if mode == "--batch" else self._check
+        if proc is None or proc.poll() is not None:
+            proc = self._spawn(mode)
+            if mode == "--batch":
+                self._batch = proc
+            else:
+                self._check = proc
+        return proc
+
+    @staticmethod
+    def _request(proc: sp.Popen, spec: str) -> bytes:
+        if "\n" in spec:
+            raise ValueError(f"Object spec may not contain newlines: {spec!r}")
+        stdin: IO[bytes] = proc.stdin  # type: ignore[assignment]
+        stdout: IO[bytes] = proc.stdout  # type: ignore[assignment]
+        stdin.write(spec.encode("utf-8") + b"\n")
+        stdin.flush()
+        header = stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        return header.rstrip(b"\n")
+
+    @staticmethod
+    def _parse_header(header: bytes) -> tuple[str, str, int] | None:
+        # "<spec> missing" / "<spec> ambiguous" echo the spec back, which may contain spaces.
+        if header.endswith((b" missing", b" ambiguous")):
+            return None
+        parts = header.decode("utf-8", "replace").split()
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        return parts[0], parts[1], int(parts[2])
+
+    def info(self, spec: str) -> tuple[str, str, int] | None:
+        """Return ``(oid, type, size)`` for ``spec`` or None when it does not resolve."""
+        header = self._request(self._process("--batch-check"), spec)
+        parsed = self._parse_header(header)
+        if parsed is None:
+            return None
+        oid, obj_type, size = parsed
+        return oid, obj_type, size
+
+    def read(self, spec: str) -> tuple[str, str, bytes] | None:
+        """Return ``(oid, type, contents)`` for ``spec`` or None when it does not resolve."""
+        proc = self._process("--batch")
+        parsed = self._parse_header(self._request(proc, spec))
+        if parsed is None:
+            return None
+        oid, obj_type, size = parsed
+        stdout: IO[bytes] = proc.stdout  # type: ignore[assignment]
+        data = stdout.read(size)
+        stdout.read(1)  # trailing newline
+        return oid, obj_type, data
+
+    def stream(
+        self, spec: str, write: Callable[[bytes], object], chunk_size: int = BLOB_CHUNK_SIZE
+    ) -> tuple[str, str, int] | None:
+        """Hand the contents of ``spec`` to ``write`` at most ``chunk_size`` bytes at a time."""
+        proc = self._process("--batch")
+        parsed = self._parse_header(self._request(proc, spec))
+        if parsed is None:
+            return None
+        stdout: IO[bytes] = proc.stdout  # type: ignore[assignment]
+        remaining = parsed[2]
+        while remaining:
+            chunk = stdout.read(min(chunk_size, remaining))
+            if not chunk:
+                raise RuntimeError("git cat-file exited unexpectedly")
+            write(chunk)
+            remaining -= len(chunk)
+        stdout.read(1)  # trailing newline
+        return parsed
+
+    def read_prefix(self, spec: str, limit: int) -> tuple[str, str, bytes] | None:
+        """Return ``(oid, type, first limit bytes)`` for ``spec``, skipping the rest.
+
+        The remainder is drained in bounded chunks to keep the pipe in sync,
+        so a large blob is never held whole.
+        """
+        prefix: list[bytes] = []
+        taken = 0
+
+        def _keep(chunk: bytes):
+            nonlocal taken
+            if taken < limit:
+                prefix.append(chunk[: limit - taken])
+                taken += len(prefix[-1])
+
+        parsed = self.stream(spec, _keep)
+        if parsed is None:
+            return None
+        return parsed[0], parsed[1], b"".join(prefix)
+
+    def close(self):
+        for proc in (self._batch, self._check):
+            if proc is None:
+                continue
+            try:
+                if proc.stdin:
+                    proc.stdin.close()
+                proc.wait(timeout=5)
+            except (OSError, sp.TimeoutExpired):
+                proc.kill()
+            if proc.stdout:
+                proc.stdout.close()
+        self._batch = None
+        self._check = None
+
+
+class CatFilePool:
+    """Bounded pool of :class:`CatFile` readers for a single repository/worktree."""
+
+    def __init__(self, cwd: str | None = None, size: int | None = None):
+        self.cwd = cwd
+        self.size = max(1, size or min(4, os.cpu_count() or 1))
+        self._idle: list[CatFile] = []
+        self._created = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def acquire(self) -> Iterator[CatFile]:
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                reader = self._idle.pop()
+            else:
+                reader = CatFile(self.cwd)
+                self._created += 1
+        try:
+            yield reader
+        except BaseException:
+            # The pipe may be mid-response; never hand a desynchronised reader back out.
+            reader.close()
+            raise
+        finally:
+            with self._cond:
+                self._idle.append(reader)
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            for reader in self._idle:
+                reader.close()
+            self._idle.clear()
+            self._created = 0
+
+
+_POOLS: dict[str, CatFilePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def cat_file_pool(cwd: str | None = None) -> CatFilePool:
+    """Return the shared reader pool for ``cwd`` (defaults to the process working directory)."""
+    key = str(Path(cwd or os.getcwd()).resolve())
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = CatFilePool(key)
+            _POOLS[key] = pool
+        return pool
+
+
+def _forget_pools_in_child():
+    # A forked child must not share the parent's pipes; it spawns its own readers.
+    global _POOLS_LOCK
+    _POOLS.clear()
+    _POOLS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools_in_child)
+
+
+@atexit.register
+def close_cat_file_pools():
+    """Terminate every pooled ``git cat-file`` process."""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+def object_info(spec: str, cwd: str | None = None) -> tuple[str, str, int] | None:
+    """Return ``(oid, type, size)`` for an object name or ``ref:path`` spec."""
+    with cat_file_pool(cwd).acquire() as reader:
+        return reader.info(spec)
+
+
+def object_size(spec: str, cwd: str | None = None) -> int | None:
+    """Return the size in bytes of ``spec`` (or None if it does not resolve)."""
+    info = object_info(spec, cwd=cwd)
+    return info[2] if info else None
+
+
+def read_blob(spec: str, cwd: str | None = None) -> bytes | None:
+    """Return raw object contents for ``spec`` (or None if it does not resolve)."""
+    with cat_file_pool(cwd).acquire() as reader:
+        result = reader.read(spec)
+    return result[2] if result else None
+
+
+def stream_blob(
+    spec: str,
+    write: Callable[[bytes], object],
+    cwd: str | None = None,
+    chunk_size: int = BLOB_CHUNK_SIZE,
+) -> int | None:
+    """Copy the contents of ``spec`` to ``write`` in chunks; return its size (None if missing)."""
+    with cat_file_pool(cwd).acquire() as reader:
+        result = reader.stream(spec, write, chunk_size)
+    return result[2] if result else None
+
+
+def read_blob_prefix(spec: str, limit: int, cwd: str | None = None) -> bytes | None:
+    """Return at most ``limit`` leading bytes of ``spec`` (or None if it does not resolve)."""
+    with cat_file_pool(cwd).acquire() as reader:
+        result = reader.read_prefix(spec, limit)
+    return result[2] if result else None
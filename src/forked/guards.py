@@ -1,53 +1,452 @@
-"""Guard checks for Forked CLI overlays."""
+"""Guard checks for Forked CLI overlays.
 
+``forked guard`` diffs the trees once (:class:`GuardDiff`) and hands the
+result to every registered check. Built-in checks live in this module;
+``guards.plugins`` in ``forked.yml`` adds user checks by import path.
+"""
+
+import hashlib
+import importlib
+import json
+import sys
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 from typing import Any
 
 from pathspec import PathSpec
 
 from . import gitutil as g
+from .cache import cache_dir, load_json, write_json_atomic
 from .config import Config
 
+GUARD_CACHE_DIR = "guard"
+GUARD_CACHE_VERSION = 3
+# Past this many paths an incremental update is not worth its pathspec; diff from scratch.
+INCREMENTAL_PATH_LIMIT = 2000
+
 
 def _make_spec(globs: list[str]) -> PathSpec:
     return PathSpec.from_lines("gitwildmatch", globs or [])
 
 
-def both_touched(cfg: Config, base: str, trunk: str, overlay: str) -> list[str]:
-    """Return files changed by both upstream and overlay since merge base."""
-    upstream_changes = set(g.changed_paths(base, trunk))
-    overlay_changes = set(g.changed_paths(base, overlay))
-    return sorted(upstream_changes & overlay_changes)
+def glob_pathspecs(patterns: Iterable[str]) -> list[str] | None:
+    """Translate gitwildmatch ``patterns`` into ``:(glob)`` pathspecs that cover them.
 
+    The pathspecs select a superset of the matching paths (a pattern also
+    matches everything under a matching directory, and directory-only patterns
+    are widened to files of that name), so callers still confirm candidates
+    with ``PathSpec``. Negations only narrow a match and are skipped. Returns
+    None when a pattern has no safe translation (escapes, POSIX classes, ``**``
+    not bounded by slashes, surrounding whitespace).
+    """
+    specs: list[str] = []
+    for pattern in patterns:
+        if not pattern.strip() or pattern.startswith(("#", "!")):
+            continue
+        if "\\" in pattern or "[:" in pattern or pattern != pattern.strip():
+            return None
+        anchored = "/" in pattern.rstrip("/")
+        body = pattern.strip("/")
+        if not body:
+            return None
+        position = body.find("**")
+        while position != -1:
+            end = position + 2
+            if (position and body[position - 1] != "/") or (end < len(body) and body[end] != "/"):
+                return None
+            position = body.find("**", end)
+        prefix = "" if anchored else "**/"
+        specs.extend([f":(glob){prefix}{body}", f":(glob){prefix}{body}/**"])
+    return specs
 
-def sentinels(
+
+def _git_order(path: str) -> bytes:
+    """Sort key matching git's recursive tree order (byte order of the full path)."""
+    return path.encode("utf-8", "surrogateescape")
+
+
+def _divergence(changes: Iterable[g.TreeChange]) -> dict[str, tuple[str | None, str | None]]:
+    divergence: dict[str, tuple[str | None, str | None]] = {}
+    for change in changes:
+        if change.old_path is not None:
+            # A rename is the source leaving and the destination arriving.
+            if change.status.startswith("R"):
+                divergence[change.old_path] = (change.old_oid, None)
+            divergence[change.path] = (None, change.new_oid)
+        elif change.old_oid != change.new_oid:
+            divergence[change.path] = (change.old_oid, change.new_oid)
+    return divergence
+
+
+@dataclass
+class GuardDiff:
+    """Trunk, overlay and merge base trees compared by one ``diff-tree`` run.
+
+    ``upstream`` (base → trunk) and ``overlay_changes`` (base → overlay) follow
+    renames like ``git diff --find-renames``; ``divergence`` maps every path
+    whose blob differs between trunk and overlay to ``(trunk_oid, overlay_oid)``.
+    """
+
+    base_tree: str
+    trunk_tree: str
+    overlay_tree: str
+    upstream: list[g.TreeChange]
+    overlay_changes: list[g.TreeChange]
+    divergence: dict[str, tuple[str | None, str | None]]
+    # Overlay paths matching each sentinel glob group, keyed by the NUL-joined globs.
+    _matches: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def collect(cls, base: str, trunk: str, overlay: str) -> "GuardDiff":
+        trees = g.run(["rev-parse", *(f"{ref}^{{tree}}" for ref in (base, trunk, overlay))])
+        return cls.from_trees(*trees.stdout.split())
+
+    @classmethod
+    def from_trees(cls, base_tree: str, trunk_tree: str, overlay_tree: str) -> "GuardDiff":
+        upstream, overlay_changes, trunk_vs_overlay = g.diff_tree_changes(
+            [(base_tree, trunk_tree), (base_tree, overlay_tree), (trunk_tree, overlay_tree)]
+        )
+        return cls(
+            base_tree,
+            trunk_tree,
+            overlay_tree,
+            upstream,
+            overlay_changes,
+            _divergence(trunk_vs_overlay),
+        )
+
+    def advance(self, overlay_tree: str) -> "GuardDiff | None":
+        """Derive the diff for a new overlay tree from the changes since this one.
+
+        Only paths the overlay touched since, plus rename candidates (added,
+        deleted and renamed paths), are re-diffed against base and trunk.
+        Returns None when that set is too large to be worth it.
+        """
+        if overlay_tree == self.overlay_tree:
+            return self
+        (delta,) = g.diff_tree_changes(
+            [(self.overlay_tree, overlay_tree)], find_renames=False, numstat=False
+        )
+        scope = {change.path for change in delta}
+        for change in self.overlay_changes:
+            if change.status[0] in "ADRC":
+                scope.add(change.path)
+                if change.old_path is not None:
+                    scope.add(change.old_path)
+        if len(scope) > INCREMENTAL_PATH_LIMIT:
+            return None
+        overlay_part, trunk_part = g.diff_tree_changes(
+            [(self.base_tree, overlay_tree), (self.trunk_tree, overlay_tree)], paths=sorted(scope)
+        )
+        kept = [
+            change
+            for change in self.overlay_changes
+            if change.path not in scope and change.old_path not in scope
+        ]
+        divergence = {path: oids for path, oids in self.divergence.items() if path not in scope}
+        divergence.update(_divergence(trunk_part))
+        advanced = GuardDiff(
+            self.base_tree,
+            self.trunk_tree,
+            overlay_tree,
+            self.upstream,
+            sorted(kept + overlay_part, key=lambda change: _git_order(change.path)),
+            divergence,
+        )
+        added = {change.path for change in delta if change.status == "A"}
+        removed = {change.path for change in delta if change.status == "D"}
+        for key, matched in self._matches.items():
+            spec = _make_spec(key.split("\0"))
+            kept_paths = set(matched) - removed
+            kept_paths.update(path for path in added if spec.match_file(path))
+            advanced._matches[key] = sorted(kept_paths, key=_git_order)
+        return advanced
+
+    def overlay_matches(self, globs: list[str]) -> list[str]:
+        """Overlay tree paths matching ``globs`` (computed on first use).
+
+        Git lists only the candidates when the globs translate to pathspecs;
+        otherwise the tree is streamed and filtered, so the full listing is
+        never held or cached.
+        """
+        key = "\0".join(globs)
+        with self._lock:
+            if key not in self._matches:
+                spec = _make_spec(globs)
+                pathspecs = glob_pathspecs(globs)
+                candidates: Iterable[str]
+                if pathspecs is None:
+                    candidates = (path for path, _ in g.iter_tree(self.overlay_tree))
+                elif pathspecs:
+                    candidates = g.tree_paths(self.overlay_tree, pathspecs)
+                else:
+                    candidates = ()  # only comments and negations: nothing can match
+                self._matches[key] = [path for path in candidates if spec.match_file(path)]
+            return self._matches[key]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "base_tree": self.base_tree,
+            "trunk_tree": self.trunk_tree,
+            "overlay_tree": self.overlay_tree,
+            "upstream": [asdict(change) for change in self.upstream],
+            "overlay_changes": [asdict(change) for change in self.overlay_changes],
+            "divergence": self.divergence,
+            "overlay_matches": self._matches,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "GuardDiff":
+        return cls(
+            raw["base_tree"],
+            raw["trunk_tree"],
+            raw["overlay_tree"],
+            [g.TreeChange(**change) for change in raw["upstream"]],
+            [g.TreeChange(**change) for change in raw["overlay_changes"]],
+            {path: (oids[0], oids[1]) for path, oids in raw["divergence"].items()},
+            dict(raw.get("overlay_matches", {})),
+        )
+
+
+@dataclass(frozen=True)
+class GuardContext:
+    cfg: Config
+    trunk: str
+    overlay: str
+    base: str
+    diff: GuardDiff
+    verbose: bool = False
+
+
+@dataclass
+class CheckResult:
+    """What one check contributes to the guard report.
+
+    ``report`` is stored under the check's name (built-ins at the top level,
+    plugins under ``checks``); a truthy ``violation`` is recorded in
+    ``violations``; ``debug`` is kept for ``--verbose``.
+    """
+
+    report: Any
+    violation: Any = None
+    debug: Any = None
+
+
+GuardCheck = Callable[[GuardContext], CheckResult | None]
+
+BUILTIN_CHECKS: dict[str, GuardCheck] = {}
+
+
+class GuardPluginError(RuntimeError):
+    """Raised when a ``guards.plugins`` entry cannot be loaded or fails."""
+
+
+def guard_check(name: str) -> Callable[[GuardCheck], GuardCheck]:
+    """Register a built-in check; checks returning None are disabled for this run."""
+
+    def register(check: GuardCheck) -> GuardCheck:
+        BUILTIN_CHECKS[name] = check
+        return check
+
+    return register
+
+
+def _load_plugin(name: str, target: str) -> GuardCheck:
+    module_name, _, attr = target.partition(":")
+    if not module_name or not attr:
+        raise GuardPluginError(f"guards.plugins.{name} must look like 'module:function'")
+    root = str(g.repo_root())
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    try:
+        check = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as exc:
+        raise GuardPluginError(f"Unable to load guards.plugins.{name} ({target}): {exc}") from exc
+    if not callable(check):
+        raise GuardPluginError(f"guards.plugins.{name} ({target}) is not callable")
+    return check
+
+
+def load_checks(cfg: Config) -> tuple[dict[str, GuardCheck], dict[str, GuardCheck]]:
+    """Return the (built-in, plugin) checks to run, each in declaration order."""
+    plugins: dict[str, GuardCheck] = {}
+    for name, target in (cfg.guards.plugins or {}).items():
+        if name in BUILTIN_CHECKS:
+            raise GuardPluginError(f"guards.plugins.{name} shadows a built-in check")
+        plugins[name] = _load_plugin(name, target)
+    return dict(BUILTIN_CHECKS), plugins
+
+
+def _run_plugin(name: str, check: GuardCheck, context: GuardContext) -> CheckResult | None:
+    try:
+        result = check(context)
+    except Exception as exc:
+        raise GuardPluginError(f"guards.plugins.{name} failed: {exc}") from exc
+    if result is not None and not isinstance(result, CheckResult):
+        raise GuardPluginError(f"guards.plugins.{name} must return a CheckResult or None")
+    return result
+
+
+@dataclass
+class GuardRun:
+    """Results of one guard evaluation.
+
+    ``cache`` is ``hit`` (results reused), ``rechecked`` (cached diff reused,
+    checks rerun for a changed config), ``incremental`` (diff advanced from
+    the cached overlay), ``miss`` (diffed from scratch) or ``off``.
+    """
+
+    builtin: dict[str, CheckResult]
+    plugins: dict[str, CheckResult]
+    cache: str = "off"
+
+
+def guard_config_hash(cfg: Config, verbose: bool = False) -> str:
+    """Hash the settings built-in check results depend on (not ``mode``, which only sets the exit)."""
+    guards = asdict(cfg.guards)
+    guards.pop("mode", None)
+    guards.pop("plugins", None)
+    payload = json.dumps({"guards": guards, "verbose": verbose}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def guard_cache_path(repo_root: Path, overlay: str) -> Path:
+    return cache_dir(repo_root) / GUARD_CACHE_DIR / f"{overlay.replace('/', '_')}.json"
+
+
+def _run_all(
+    builtins: dict[str, GuardCheck], plugins: dict[str, GuardCheck], context: GuardContext
+) -> tuple[dict[str, CheckResult], dict[str, CheckResult]]:
+    with ThreadPoolExecutor(max_workers=max(1, len(builtins) + len(plugins))) as pool:
+        builtin_futures = {name: pool.submit(check, context) for name, check in builtins.items()}
+        plugin_futures = {
+            name: pool.submit(_run_plugin, name, check, context) for name, check in plugins.items()
+        }
+        return (
+            {
+                name: result
+                for name, future in builtin_futures.items()
+                if (result := future.result()) is not None
+            },
+            {
+                name: result
+                for name, future in plugin_futures.items()
+                if (result := future.result()) is not None
+            },
+        )
+
+
+def run_checks(
     cfg: Config,
     trunk: str,
     overlay: str,
-    return_debug: bool = False,
+    base: str,
+    verbose: bool = False,
+    use_cache: bool = False,
+) -> GuardRun:
+    """Diff once, then run every check concurrently on the shared :class:`GuardDiff`.
+
+    With ``use_cache`` the diff and the built-in results persist in
+    ``.forked/cache/guard/<overlay>.json``, keyed by trunk, overlay and merge
+    base commits plus :func:`guard_config_hash`. An exact hit reuses the
+    built-in results; when only the guard settings changed, the cached diff is
+    checked again; when only the overlay moved, the cached diff is advanced by
+    the overlay's own delta. Plugins always run.
+    """
+    builtins, plugins = load_checks(cfg)
+    if not use_cache:
+        fresh = GuardDiff.collect(base, trunk, overlay)
+        return GuardRun(
+            *_run_all(builtins, plugins, GuardContext(cfg, trunk, overlay, base, fresh, verbose))
+        )
+
+    trunk_sha, overlay_sha, *trees = g.run(
+        ["rev-parse", trunk, overlay, *(f"{ref}^{{tree}}" for ref in (base, trunk, overlay))]
+    ).stdout.split()
+    config_hash = guard_config_hash(cfg, verbose)
+    path = guard_cache_path(g.repo_root(), overlay)
+    raw = load_json(path)
+    cached = raw if isinstance(raw, dict) and raw.get("version") == GUARD_CACHE_VERSION else {}
+    same_upstream = cached.get("trunk") == trunk_sha and cached.get("base") == base
+
+    status = "miss"
+    diff: GuardDiff | None = None
+    results: dict[str, Any] = {}
+    if same_upstream:
+        previous = GuardDiff.from_dict(cached["diff"])
+        if cached.get("overlay") == overlay_sha:
+            # Same commits under a new config: the diff is reused, only the checks rerun.
+            diff, results, status = previous, dict(cached.get("results", {})), "rechecked"
+        else:
+            diff = previous.advance(trees[2])
+            status = "incremental" if diff is not None else "miss"
+    if diff is None:
+        diff = GuardDiff.from_trees(*trees)
+
+    context = GuardContext(cfg, trunk, overlay, base, diff, verbose)
+    if config_hash in results:
+        builtin_results = {
+            name: CheckResult(**payload) for name, payload in results[config_hash].items()
+        }
+        return GuardRun(builtin_results, _run_all({}, plugins, context)[1], "hit")
+
+    builtin_results, plugin_results = _run_all(builtins, plugins, context)
+    results[config_hash] = {name: asdict(result) for name, result in builtin_results.items()}
+    write_json_atomic(
+        path,
+        {
+            "version": GUARD_CACHE_VERSION,
+            "trunk": trunk_sha,
+            "overlay": overlay_sha,
+            "base": base,
+            "diff": diff.to_dict(),
+            "results": results,
+        },
+    )
+    return GuardRun(builtin_results, plugin_results, status)
+
+
+def _both_touched(diff: GuardDiff) -> list[str]:
+    upstream_changes = {change.path for change in diff.upstream}
+    overlay_changes = {change.path for change in diff.overlay_changes}
+    return sorted(upstream_changes & overlay_changes)
+
+
+def _sentinels(
+    cfg: Config, diff: GuardDiff, return_debug: bool
 ) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
-    """Evaluate sentinel rules across trunk and overlay."""
-    must_match_spec = _make_spec(cfg.guards.sentinels.must_match_upstream)
-    must_diverge_spec = _make_spec(cfg.guards.sentinels.must_diverge_from_upstream)
+    must_match_globs = cfg.guards.sentinels.must_match_upstream
+    must_diverge_globs = cfg.guards.sentinels.must_diverge_from_upstream
+    must_match_spec = _make_spec(must_match_globs)
+    must_diverge_spec = _make_spec(must_diverge_globs)
+    has_diverge_rules = bool(must_diverge_globs)
+
+    # Paths absent from the divergence map are identical on both sides (or
+    # absent from both), so the overlay listing is only needed to find
+    # unchanged must-diverge paths, or to report every match. Git narrows the
+    # listing to the sentinel globs whenever they translate to pathspecs.
+    paths = set(diff.divergence)
+    if has_diverge_rules:
+        paths.update(diff.overlay_matches(must_diverge_globs))
+    if return_debug and must_match_globs:
+        paths.update(diff.overlay_matches(must_match_globs))
+
     must_match: list[str] = []
     must_diverge: list[str] = []
     matched_must_match: list[str] = []
     matched_must_diverge: list[str] = []
-
-    overlay_ls = set(g.run(["ls-tree", "-r", "--name-only", overlay]).stdout.splitlines())
-    trunk_ls = set(g.run(["ls-tree", "-r", "--name-only", trunk]).stdout.splitlines())
-    candidates = sorted(overlay_ls | trunk_ls)
-
-    for path in candidates:
+    for path in sorted(paths, key=_git_order):
+        trunk_blob, overlay_blob = diff.divergence.get(path, ("same", "same"))
         if must_match_spec.match_file(path):
             matched_must_match.append(path)
-            trunk_blob = g.blob_hash(trunk, path)
-            overlay_blob = g.blob_hash(overlay, path)
-            if trunk_blob is None or overlay_blob is None or trunk_blob != overlay_blob:
+            if path in diff.divergence:
                 must_match.append(path)
-        if must_diverge_spec.match_file(path):
+        if has_diverge_rules and must_diverge_spec.match_file(path):
             matched_must_diverge.append(path)
-            trunk_blob = g.blob_hash(trunk, path)
-            overlay_blob = g.blob_hash(overlay, path)
             if overlay_blob is None or (trunk_blob is not None and trunk_blob == overlay_blob):
                 must_diverge.append(path)
 
@@ -63,27 +462,78 @@ def sentinels(
     return result, debug
 
 
-def size_caps(cfg: Config, overlay: str, trunk: str) -> dict[str, Any]:
-    """Compute diff size metrics and indicate violations."""
+def _size_caps(cfg: Config, diff: GuardDiff) -> dict[str, Any]:
     caps = cfg.guards.size_caps
     if not (caps.max_loc or caps.max_files):
         return {"files_changed": 0, "loc": 0, "violations": False}
 
-    files = 0
-    loc = 0
-    lines = g.run(["diff", "--numstat", f"{trunk}...{overlay}"]).stdout.splitlines()
-    for line in lines:
-        parts = line.split("\t")
-        if len(parts) < 3:
-            continue
-        add, dele = parts[0], parts[1]
-        files += 1
-        if add.isdigit():
-            loc += int(add)
-        if dele.isdigit():
-            loc += int(dele)
-
+    files = len(diff.overlay_changes)
+    loc = sum((change.added or 0) + (change.deleted or 0) for change in diff.overlay_changes)
     violated = bool(
         (caps.max_files and files > caps.max_files) or (caps.max_loc and loc > caps.max_loc)
     )
     return {"files_changed": files, "loc": loc, "violations": violated}
+
+
+@guard_check("both_touched")
+def _check_both_touched(context: GuardContext) -> CheckResult | None:
+    if not context.cfg.guards.both_touched:
+        return None
+    bt = _both_touched(context.diff)
+    return CheckResult(report=bt, violation=bt or None, debug=bt)
+
+
+@guard_check("sentinels")
+def _check_sentinels(context: GuardContext) -> CheckResult:
+    result, debug = _sentinels(context.cfg, context.diff, context.verbose)
+    violated = result["must_match_upstream"] or result["must_diverge_from_upstream"]
+    return CheckResult(report=result, violation=result if violated else None, debug=debug)
+
+
+@guard_check("size_caps")
+def _check_size_caps(context: GuardContext) -> CheckResult:
+    report = _size_caps(context.cfg, context.diff)
+    totals = {"files_changed": report["files_changed"], "loc": report["loc"]}
+    violation = (
+        {"files": report["files_changed"], "loc": report["loc"]} if report["violations"] else None
+    )
+    return CheckResult(report=report, violation=violation, debug=totals)
+
+
+def both_touched(cfg: Config, base: str, trunk: str, overlay: str) -> list[str]:
+    """Return files changed by both upstream and overlay since merge base."""
+    return _both_touched(GuardDiff.collect(base, trunk, overlay))
+
+
+def both_touched_many(trunk: str, overlays: Iterable[str]) -> dict[str, list[str]]:
+    """Return :func:`both_touched` for several overlays, diffing all of them in one run."""
+    names = list(overlays)
+    bases = [g.merge_base(trunk, overlay) for overlay in names]
+    revs = [trunk, *bases, *names]
+    trunk_tree, *trees = g.run(["rev-parse", *(f"{rev}^{{tree}}" for rev in revs)]).stdout.split()
+    pairs: list[tuple[str, str]] = []
+    for base_tree, overlay_tree in zip(trees[: len(names)], trees[len(names) :], strict=True):
+        pairs.extend([(base_tree, trunk_tree), (base_tree, overlay_tree)])
+    changes = g.diff_tree_changes(pairs, numstat=False)
+    return {
+        overlay: sorted(
+            {change.path for change in changes[2 * index]}
+            & {change.path for change in changes[2 * index + 1]}
+        )
+        for index, overlay in enumerate(names)
+    }
+
+
+def sentinels(
+    cfg: Config,
+    trunk: str,
+    overlay: str,
+    return_debug: bool = False,
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Evaluate sentinel rules across trunk and overlay."""
+    return _sentinels(cfg, GuardDiff.collect(trunk, trunk, overlay), return_debug)
+
+
+def size_caps(cfg: Config, overlay: str, trunk: str) -> dict[str, Any]:
+    """Compute diff size metrics and indicate violations."""
+    return _size_caps(cfg, GuardDiff.collect(g.merge_base(trunk, overlay), trunk, overlay))
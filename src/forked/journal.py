@@ -0,0 +1,87 @@
+"""Checkpoint journals that let an interrupted build or sync resume where it stopped."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .cache import load_json, write_json_atomic
+from .resolver import ResolvedSelection
+
+JOURNAL_VERSION = 1
+
+
+def journal_dir(repo_root: Path) -> Path:
+    return repo_root / ".forked" / "journal"
+
+
+@dataclass
+class StepJournal:
+    """Ordered steps a build (picked commits) or sync (rebased branches) has completed.
+
+    ``head`` is the commit the completed steps produced (builds only) and
+    ``stopped_at`` the step that halted on a conflict. The journal is removed
+    once the operation finishes.
+    """
+
+    path: Path
+    kind: str  # build | sync
+    trunk_sha: str
+    done: list[str] = field(default_factory=list)
+    head: str | None = None
+    stopped_at: str | None = None
+    options: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> StepJournal | None:
+        raw = load_json(path)
+        if not isinstance(raw, dict) or raw.get("version") != JOURNAL_VERSION:
+            return None
+        return cls(
+            path=path,
+            kind=raw["kind"],
+            trunk_sha=raw["trunk_sha"],
+            done=list(raw.get("done", [])),
+            head=raw.get("head"),
+            stopped_at=raw.get("stopped_at"),
+            options=dict(raw.get("options", {})),
+        )
+
+    def save(self):
+        write_json_atomic(
+            self.path,
+            {
+                "version": JOURNAL_VERSION,
+                "kind": self.kind,
+                "trunk_sha": self.trunk_sha,
+                "done": self.done,
+                "head": self.head,
+                "stopped_at": self.stopped_at,
+                "options": self.options,
+            },
+        )
+
+    def discard(self):
+        self.path.unlink(missing_ok=True)
+
+    def selection(self) -> ResolvedSelection:
+        """Return the build selection recorded when the journal was started."""
+        return ResolvedSelection(**self.options["selection"])
+
+
+def build_journal_path(repo_root: Path, overlay_id: str) -> Path:
+    return journal_dir(repo_root) / f"build-{overlay_id.replace('/', '_')}.json"
+
+
+def sync_journal_path(repo_root: Path) -> Path:
+    return journal_dir(repo_root) / "sync.json"
+
+
+def pending_build_journals(repo_root: Path) -> list[StepJournal]:
+    """Return every interrupted build journal, oldest first."""
+    directory = journal_dir(repo_root)
+    if not directory.exists():
+        return []
+    paths = sorted(directory.glob("build-*.json"), key=lambda path: path.stat().st_mtime)
+    return [journal for path in paths if (journal := StepJournal.load(path)) is not None]
@@ -0,0 +1,210 @@
+"""Feature compatibility matrix: which feature combinations apply cleanly on trunk."""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import subprocess
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+from . import gitutil as g
+from .build import simulate_stack
+from .cache import PickMemo, cache_dir, load_json, write_json_atomic
+from .config import Config
+from .plan import plan_build
+from .resolver import ResolutionError, resolve_selection
+
+MATRIX_CACHE_FILE = "feature-matrix.json"
+
+
+@dataclass(frozen=True)
+class MatrixCandidate:
+    """One feature combination (or overlay profile) to test."""
+
+    kind: str  # feature | pair | profile
+    name: str
+    features: tuple[str, ...]
+    patches: tuple[str, ...]
+    error: str | None = None
+
+
+def _candidates(cfg: Config, include_profiles: bool) -> list[MatrixCandidate]:
+    combos: list[tuple[str, ...]] = [(name,) for name in cfg.features]
+    combos.extend(itertools.combinations(cfg.features, 2))
+    candidates: list[MatrixCandidate] = []
+    for combo in combos:
+        kind = "feature" if len(combo) == 1 else "pair"
+        name = "+".join(combo)
+        try:
+            selection = resolve_selection(cfg, features=list(combo))
+        except ResolutionError as exc:
+            candidates.append(MatrixCandidate(kind, name, combo, (), error=str(exc)))
+            continue
+        candidates.append(MatrixCandidate(kind, name, combo, tuple(selection.patches)))
+    if include_profiles:
+        for profile in cfg.overlays:
+            try:
+                selection = resolve_selection(cfg, overlay=profile)
+            except ResolutionError as exc:
+                candidates.append(MatrixCandidate("profile", profile, (), (), error=str(exc)))
+                continue
+            candidates.append(
+                MatrixCandidate(
+                    "profile",
+                    profile,
+                    tuple(selection.active_features),
+                    tuple(selection.patches),
+                )
+            )
+    return candidates
+
+
+def _resolve_tips(refs: Sequence[str]) -> dict[str, str | None]:
+    """Resolve every ref in one ``rev-parse`` call; unresolvable refs map to None."""
+    unique = list(dict.fromkeys(refs))
+    if not unique:
+        return {}
+    cp = g.run(["rev-parse", "--verify", "--quiet", *unique], check=False)
+    if cp.returncode == 0:
+        return dict(zip(unique, cp.stdout.split(), strict=True))
+    tips: dict[str, str | None] = {}
+    for ref in unique:
+        single = g.run(["rev-parse", "--verify", "--quiet", ref], check=False)
+        tips[ref] = single.stdout.strip() if single.returncode == 0 else None
+    return tips
+
+
+def cell_fingerprint(trunk_sha: str, patches: Sequence[str], tips: dict[str, str | None]) -> str:
+    """Key a cell by trunk and the ordered patch tips it replays."""
+    digest = hashlib.sha256(trunk_sha.encode())
+    for branch in patches:
+        digest.update(f"\0{branch}\0{tips.get(branch)}".encode())
+    return digest.hexdigest()
+
+
+def _simulate_cell(trunk_sha: str, patches: tuple[str, ...], use_cache: bool) -> dict[str, Any]:
+    """Worker: replay ``patches`` on ``trunk_sha`` in the object database."""
+    memo = PickMemo.load(g.repo_root()) if use_cache else None
+    try:
+        plan = plan_build(trunk_sha, patches)
+        simulation = simulate_stack(plan, memo)
+    except (RuntimeError, subprocess.CalledProcessError) as exc:
+        detail = exc.stderr.strip() if isinstance(exc, subprocess.CalledProcessError) else ""
+        return {"status": "error", "error": detail or str(exc), "memo": {}}
+    stop: dict[str, Any] | None = None
+    status = "clean"
+    if simulation.stop is not None:
+        patch, commit, outcome = simulation.stop
+        status = outcome.status
+        stop = {
+            "patch_branch": patch.branch,
+            "patch_commit": commit.sha,
+            "summary": commit.summary,
+            "paths": outcome.conflicts,
+        }
+    return {
+        "status": status,
+        "applied": simulation.applied,
+        "estimated_cost": plan.estimated_cost,
+        "stop": stop,
+        # The parent owns the memo file; workers hand back what they learned.
+        "memo": dict(memo.added) if memo is not None else {},
+    }
+
+
+def compute_matrix(
+    cfg: Config,
+    trunk: str,
+    *,
+    jobs: int = 4,
+    include_profiles: bool = False,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """Test every feature, every feature pair and (optionally) every profile on ``trunk``.
+
+    Each cell is simulated with in-memory picks on a process pool. Results are
+    cached in ``.forked/cache/feature-matrix.json`` keyed by trunk SHA plus the
+    ordered patch tips of the cell, so only combinations whose inputs moved
+    are recomputed.
+    """
+    trunk_sha = g.run(["rev-parse", trunk]).stdout.strip()
+    candidates = _candidates(cfg, include_profiles)
+    tips = _resolve_tips([patch for c in candidates for patch in c.patches])
+
+    repo = g.repo_root()
+    cache_path = cache_dir(repo) / MATRIX_CACHE_FILE
+    raw = load_json(cache_path) if use_cache else None
+    cached: dict[str, Any] = raw.get("cells", {}) if isinstance(raw, dict) else {}
+
+    # Cells are keyed by (kind, name): a profile may share its name with a feature.
+    results: dict[tuple[str, str], dict[str, Any]] = {}
+    pending: dict[tuple[str, str], MatrixCandidate] = {}
+    fingerprints: dict[tuple[str, str], str] = {}
+    for candidate in candidates:
+        key = (candidate.kind, candidate.name)
+        missing = [patch for patch in candidate.patches if tips.get(patch) is None]
+        if candidate.error or missing:
+            error = candidate.error or "missing branch(es): " + ", ".join(missing)
+            results[key] = {"status": "error", "error": error}
+            continue
+        fingerprint = cell_fingerprint(trunk_sha, candidate.patches, tips)
+        fingerprints[key] = fingerprint
+        if fingerprint in cached:
+            results[key] = {**cached[fingerprint], "cached": True}
+        else:
+            pending[key] = candidate
+
+    learned: dict[str, str] = {}
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {
+                executor.submit(_simulate_cell, trunk_sha, candidate.patches, use_cache): key
+                for key, candidate in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                outcome = future.result()
+                learned.update(outcome.pop("memo"))
+                results[key] = {**outcome, "cached": False}
+
+    if use_cache:
+        memo = PickMemo.load(repo)
+        memo.added.update(learned)
+        memo.save()
+        fresh = {
+            fingerprints[key]: {k: v for k, v in results[key].items() if k != "cached"}
+            for key in pending
+            if results[key]["status"] != "error"
+        }
+        if fresh:
+            # Keep only cells for the current trunk so the cache does not grow unbounded.
+            cells = {
+                key: value for key, value in cached.items() if value.get("trunk_sha") == trunk_sha
+            }
+            cells.update({key: {**value, "trunk_sha": trunk_sha} for key, value in fresh.items()})
+            write_json_atomic(cache_path, {"version": 1, "cells": cells})
+
+    cells_payload = []
+    for candidate in candidates:
+        cell = {
+            k: v for k, v in results[(candidate.kind, candidate.name)].items() if k != "trunk_sha"
+        }
+        cells_payload.append(
+            {
+                "kind": candidate.kind,
+                "name": candidate.name,
+                "features": list(candidate.features),
+                "patches": {patch: tips.get(patch) for patch in candidate.patches},
+                **cell,
+            }
+        )
+    return {
+        "matrix_version": 1,
+        "trunk": trunk,
+        "trunk_sha": trunk_sha,
+        "features": list(cfg.features),
+        "cells": cells_payload,
+    }
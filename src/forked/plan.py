@@ -0,0 +1,164 @@
+"""Batched build planning: patch ranges, summaries and cost without a worktree."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+from . import gitutil as g
+
+LOG_FORMAT = "%H%x1f%P%x1f%s"
+
+
+@dataclass(frozen=True)
+class PlannedCommit:
+    sha: str
+    parents: tuple[str, ...]
+    summary: str
+
+
+@dataclass(frozen=True)
+class PatchPlan:
+    """Commits of one patch branch that are not yet in trunk, oldest first."""
+
+    branch: str
+    tip: str
+    merge_base: str
+    commits: tuple[PlannedCommit, ...]
+    skipped: frozenset[str] = frozenset()
+
+    @property
+    def to_apply(self) -> tuple[PlannedCommit, ...]:
+        return tuple(commit for commit in self.commits if commit.sha not in self.skipped)
+
+
+@dataclass(frozen=True)
+class BuildPlan:
+    """Immutable description of what a build would replay."""
+
+    trunk: str
+    trunk_sha: str
+    patches: tuple[PatchPlan, ...]
+    skip_upstream_equivalents: bool = False
+
+    @property
+    def commit_count(self) -> int:
+        return sum(len(patch.commits) for patch in self.patches)
+
+    @property
+    def skipped_count(self) -> int:
+        return sum(len(patch.skipped) for patch in self.patches)
+
+    @property
+    def estimated_cost(self) -> int:
+        """Number of picks the build will perform (the unit a build spends its time on)."""
+        return sum(len(patch.to_apply) for patch in self.patches)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trunk": self.trunk,
+            "trunk_sha": self.trunk_sha,
+            "skip_upstream_equivalents": self.skip_upstream_equivalents,
+            "commit_count": self.commit_count,
+            "skipped_count": self.skipped_count,
+            "estimated_cost": self.estimated_cost,
+            "patches": [
+                {
+                    "branch": patch.branch,
+                    "tip": patch.tip,
+                    "merge_base": patch.merge_base,
+                    "total_commits": len(patch.commits),
+                    "skipped_count": len(patch.skipped),
+                    "commits": [
+                        {
+                            "sha": commit.sha,
+                            "summary": commit.summary,
+                            "skipped": commit.sha in patch.skipped,
+                        }
+                        for commit in patch.commits
+                    ],
+                }
+                for patch in self.patches
+            ],
+        }
+
+
+def _resolve_tips(refs: Sequence[str]) -> list[str]:
+    out = g.run(["rev-parse", *refs]).stdout.split()
+    if len(out) != len(refs):
+        raise RuntimeError(f"Unable to resolve all of: {', '.join(refs)}")
+    return out
+
+
+def _log_outside(trunk_sha: str, tips: Sequence[str]) -> tuple[list[str], dict[str, PlannedCommit]]:
+    """Return (commit order, commits) reachable from any tip but not from trunk."""
+    stdin = "\n".join([f"^{trunk_sha}", *dict.fromkeys(tips)]) + "\n"
+    cp = g.run(["log", "-z", f"--format={LOG_FORMAT}", "--stdin"], input=stdin)
+    order: list[str] = []
+    commits: dict[str, PlannedCommit] = {}
+    for record in cp.stdout.split("\0"):
+        if not record:
+            continue
+        sha, parents, summary = record.lstrip("\n").split("\x1f", 2)
+        commits[sha] = PlannedCommit(sha=sha, parents=tuple(parents.split()), summary=summary)
+        order.append(sha)
+    return order, commits
+
+
+def _branch_range(
+    tip: str, order: list[str], commits: dict[str, PlannedCommit]
+) -> tuple[PlannedCommit, ...]:
+    """Commits reachable from ``tip`` inside the outside-trunk set, oldest first."""
+    reachable: set[str] = set()
+    stack = [tip] if tip in commits else []
+    while stack:
+        sha = stack.pop()
+        if sha in reachable:
+            continue
+        reachable.add(sha)
+        stack.extend(parent for parent in commits[sha].parents if parent in commits)
+    return tuple(commits[sha] for sha in reversed(order) if sha in reachable)
+
+
+def plan_build(
+    trunk: str,
+    patches: Sequence[str],
+    *,
+    skip_upstream_equivalents: bool = False,
+    upstream_equivalents: Callable[[str, Sequence[PatchPlan]], dict[str, set[str]]] | None = None,
+) -> BuildPlan:
+    """Compute every patch branch's commit range and summaries in one log walk.
+
+    A single ``git log --stdin`` lists all commits outside trunk for the whole
+    stack; each branch's range is then carved out in memory by walking parent
+    links from its tip. The merge base comes from the oldest commit's parent
+    when the range is linear, and from ``git merge-base`` otherwise.
+    ``upstream_equivalents`` receives every patch plan at once and returns the
+    commits to skip per branch.
+    """
+    if not patches:
+        trunk_sha = _resolve_tips([trunk])[0]
+        return BuildPlan(trunk, trunk_sha, (), skip_upstream_equivalents)
+    trunk_sha, *tips = _resolve_tips([trunk, *patches])
+    order, commits = _log_outside(trunk_sha, tips)
+
+    plans: list[PatchPlan] = []
+    for branch, tip in zip(patches, tips, strict=True):
+        branch_commits = _branch_range(tip, order, commits)
+        if not branch_commits:
+            base = tip
+        elif all(len(c.parents) == 1 for c in branch_commits) and (
+            branch_commits[0].parents[0] not in commits
+        ):
+            base = branch_commits[0].parents[0]
+        else:
+            base = g.merge_base(trunk_sha, tip)
+        plans.append(PatchPlan(branch=branch, tip=tip, merge_base=base, commits=branch_commits))
+    if skip_upstream_equivalents and upstream_equivalents is not None:
+        skip = upstream_equivalents(trunk_sha, plans)
+        plans = [
+            replace(plan, skipped=frozenset(skip.get(plan.branch, ()))) if plan.commits else plan
+            for plan in plans
+        ]
+    return BuildPlan(trunk, trunk_sha, tuple(plans), skip_upstream_equivalents)
@@ -5,13 +5,21 @@ from __future__ import annotations
 import json
 import subprocess
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 import typer
 
 from . import gitutil as g
 from .config import Config
-from .conflicts import ConflictContext, apply_recommendations, create_conflict_writer
+from .conflicts import (
+    DEFAULT_CONFLICT_JOBS,
+    ConflictContext,
+    apply_recommendations,
+    create_conflict_writer,
+    record_conflict_outcomes,
+)
+from .journal import StepJournal, sync_journal_path
 
 
 def _quote_cli(value: str) -> str:
@@ -38,6 +46,10 @@ def run_sync(
     on_conflict: str,
     on_conflict_exec: str | None,
     auto_continue: bool,
+    resume: bool = False,
+    conflict_jobs: int = DEFAULT_CONFLICT_JOBS,
+    conflict_format: str = "json",
+    lazy_diffs: bool | None = None,
 ) -> dict[str, Any]:
     conflict_mode = (on_conflict or "stop").lower()
     if auto_continue and conflict_mode == "stop":
@@ -58,11 +70,44 @@ def run_sync(
     logs_dir = repo / ".forked" / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
 
+    journal_path = sync_journal_path(repo)
+    done: set[str] = set()
+    if resume:
+        previous = StepJournal.load(journal_path)
+        if previous is None or previous.kind != "sync":
+            typer.secho("[sync] No interrupted sync to resume.", fg=typer.colors.RED)
+            raise typer.Exit(code=2)
+        rebase_dirs = [
+            g.run(["rev-parse", "--git-path", name]).stdout.strip()
+            for name in ("rebase-merge", "rebase-apply")
+        ]
+        if any(Path(path).exists() for path in rebase_dirs):
+            typer.secho(
+                "[sync] A rebase is still in progress; finish it (git rebase --continue) "
+                "or abort it before resuming.",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=2)
+        trunk_sha = g.run(["rev-parse", cfg.branches.trunk]).stdout.strip()
+        if trunk_sha != previous.trunk_sha:
+            typer.secho(
+                f"[sync] {cfg.branches.trunk} moved since the interrupted sync; run a full sync.",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=2)
+        done = set(previous.done)
+
     prev_ref = g.current_ref()
     g.ensure_clean()
-    g.run(["fetch", cfg.upstream.remote])
-    g.run(["checkout", cfg.branches.trunk])
-    g.run(["reset", "--hard", f"{cfg.upstream.remote}/{cfg.upstream.branch}"])
+    if not resume:
+        g.run(["fetch", cfg.upstream.remote])
+        g.run(["checkout", cfg.branches.trunk])
+        g.run(["reset", "--hard", f"{cfg.upstream.remote}/{cfg.upstream.branch}"])
+    journal = StepJournal(
+        path=journal_path,
+        kind="sync",
+        trunk_sha=g.run(["rev-parse", cfg.branches.trunk]).stdout.strip(),
+    )
 
     branch_results: list[dict[str, Any]] = []
     conflict_records: list[dict[str, Any]] = []
@@ -83,16 +128,25 @@ def run_sync(
         }
         if bias_logs:
             telemetry["bias_actions"] = bias_logs
+        if status != "success":
+            journal.save()
+        record_conflict_outcomes(repo, conflict_records)
         log_path = logs_dir / "forked-build.log"
         with log_path.open("a", encoding="utf-8") as fh:
             fh.write(json.dumps(telemetry) + "\n")
         return telemetry
 
     for branch in cfg.patches.order:
+        if branch in done:
+            journal.done.append(branch)
+            branch_results.append({"branch": branch, "status": "resumed"})
+            continue
+        journal.stopped_at = branch
         g.run(["checkout", branch])
         base = g.merge_base(cfg.branches.trunk, branch)
         cp = g.run(["rebase", cfg.branches.trunk], check=False)
         if cp.returncode == 0:
+            journal.done.append(branch)
             branch_results.append({"branch": branch, "status": "rebased"})
             continue
 
@@ -110,6 +164,9 @@ def run_sync(
                 emit_conflicts=emit_option,
                 conflict_blobs_dir=blob_option,
                 overlay_id=overlay_id,
+                jobs=conflict_jobs,
+                bundle_format=conflict_format,
+                lazy_diffs=conflict_mode == "bias" if lazy_diffs is None else lazy_diffs,
             )
 
         feature_names = membership.get(branch, [])
@@ -142,6 +199,7 @@ def run_sync(
                 "continue": "git rebase --continue",
                 "abort": "git rebase --abort",
                 "rebuild": resume_cmd,
+                "resume": f"{resume_cmd} --resume",
             },
         )
         bundle_path, bundle = conflict_writer.next_bundle(context, feature_names)
@@ -167,6 +225,7 @@ def run_sync(
             if cont.returncode == 0:
                 record["result"] = "auto-continued"
                 branch_results[-1]["status"] = "rebased"
+                journal.done.append(branch)
                 continue
 
             record["result"] = "auto-continue-failed"
@@ -219,4 +278,5 @@ def run_sync(
         g.run(["checkout", prev_ref])
 
     telemetry = log_sync("success")
+    journal.discard()
     return telemetry
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+from forked import build
+from forked.cli import app
+from forked.config import Config, Feature, OverlayProfile, load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _prepare_repo(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    cfg = load_config()
+    cfg.upstream.branch = "trunk"
+    cfg.patches.order = ["patch/a", "patch/b"]
+    cfg.features = {
+        "alpha": Feature(patches=["patch/a"]),
+        "beta": Feature(patches=["patch/b"]),
+    }
+    cfg.overlays = {
+        "alpha": OverlayProfile(features=["alpha"]),
+        "both": OverlayProfile(features=["alpha", "beta"]),
+    }
+    write_config(cfg)
+    Path(".gitignore").write_text(".forked/\n")
+    git_repo.git("add", "forked.yml", ".gitignore")
+    git_repo.git("commit", "-m", "configure forked")
+    git_repo.git("push", "upstream", "trunk")
+
+    for branch, filename in (("patch/a", "a.txt"), ("patch/b", "b.txt")):
+        git_repo.git("checkout", "-b", branch, "trunk")
+        git_repo.write(filename, f"{branch}\n")
+        git_repo.git("add", filename)
+        git_repo.git("commit", "-m", f"add {filename}")
+    git_repo.git("checkout", "trunk")
+
+
+def test_build_all_profiles_builds_each_overlay(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["build", "--all-profiles", "--jobs", "2"])
+    assert result.exit_code == 0, result.stdout
+
+    for overlay, expected in (("overlay/alpha", {"a.txt"}), ("overlay/both", {"a.txt", "b.txt"})):
+        files = git_repo.git(
+            "ls-tree", "--name-only", overlay, capture_output=True
+        ).stdout.splitlines()
+        assert expected <= set(files)
+        note = git_repo.git(
+            "notes", "--ref", "refs/notes/forked-meta", "show", overlay, capture_output=True
+        ).stdout
+        assert f"overlay={overlay}" in note
+
+    entries = [
+        json.loads(line)
+        for line in Path(".forked/logs/forked-build.log").read_text().splitlines()
+        if line.strip()
+    ]
+    builds = {entry["overlay"] for entry in entries if entry["event"] == "forked.build"}
+    assert builds == {"overlay/alpha", "overlay/both"}
+    rollup = entries[-1]
+    assert rollup["event"] == "forked.build-all"
+    assert rollup["exit_code"] == 0
+    assert [item["id"] for item in rollup["overlays"]] == ["alpha", "both"]
+    head = git_repo.git("rev-parse", "--abbrev-ref", "HEAD", capture_output=True)
+    assert head.stdout.strip() == "trunk"
+
+
+def test_build_all_profiles_rejects_single_overlay_flags(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["build", "--all-profiles", "--overlay", "alpha"])
+    assert result.exit_code == 2
+
+
+@pytest.mark.parametrize(
+    ("failure", "exit_code", "error"),
+    [
+        (typer.Exit(code=0), 0, None),
+        (typer.Exit(code=7), 7, None),
+        (ValueError("corrupt cache"), 1, "corrupt cache"),
+        (OSError("disk full"), 1, "disk full"),
+    ],
+)
+def test_overlay_job_reports_every_outcome(monkeypatch, failure, exit_code, error):
+    def _build_overlay(*args, **kwargs):
+        raise failure
+
+    monkeypatch.setattr(build, "build_overlay", _build_overlay)
+
+    result = build._build_overlay_job(Config(), "dev", None, {})
+
+    assert (result.overlay_id, result.exit_code, result.error) == ("dev", exit_code, error)
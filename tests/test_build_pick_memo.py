@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from forked import cache
+from forked.build import build_overlay
+from forked.cache import PickMemo
+from forked.config import Config
+from forked.resolver import resolve_selection
+
+
+def _commit_patch(git_repo, branch: str, filename: str, content: str, base: str = "trunk"):
+    git_repo.git("checkout", "-B", branch, base)
+    git_repo.write(filename, content)
+    git_repo.git("add", filename)
+    git_repo.git("commit", "-m", f"{branch}: {filename}")
+
+
+def _rev(git_repo, spec: str) -> str:
+    return git_repo.git("rev-parse", spec, capture_output=True).stdout.strip()
+
+
+def test_rebuild_reuses_memoised_prefix(git_repo, monkeypatch, capsys):
+    monkeypatch.chdir(git_repo.path)
+    exclude = git_repo.path / ".git" / "info" / "exclude"
+    exclude.write_text(exclude.read_text() + ".forked/\n")
+    _commit_patch(git_repo, "patch/a", "a.txt", "a\n")
+    _commit_patch(git_repo, "patch/b", "b.txt", "b\n")
+    git_repo.git("checkout", "trunk")
+
+    cfg = Config()
+    cfg.patches.order = ["patch/a", "patch/b"]
+    cfg.worktree.enabled = False
+    cfg.upstream.branch = "trunk"
+    selection = resolve_selection(cfg)
+
+    build_overlay(cfg, "memo", selection, use_worktree=False, write_git_note=False)
+    first_tip = _rev(git_repo, "overlay/memo")
+    first_a = _rev(git_repo, "overlay/memo~1")
+    memo = json.loads(Path(".forked/cache/cherry-pick-memo.json").read_text())
+    assert len(memo["picks"]) == 2
+    capsys.readouterr()
+
+    git_repo.git("checkout", "trunk")
+    build_overlay(cfg, "memo", selection, use_worktree=False, write_git_note=False)
+    assert _rev(git_repo, "overlay/memo") == first_tip
+    assert "Reused 2 cached cherry-pick(s)" in capsys.readouterr().out
+
+    _commit_patch(git_repo, "patch/b", "b.txt", "b2\n", base="patch/b")
+    git_repo.git("checkout", "trunk")
+    build_overlay(cfg, "memo", selection, use_worktree=False, write_git_note=False)
+    assert _rev(git_repo, "overlay/memo~2") == first_a
+    assert (git_repo.path / "b.txt").read_text() == "b2\n"
+    assert "Reused 2 cached cherry-pick(s)" in capsys.readouterr().out
+    git_repo.git("checkout", "trunk")
+
+
+def test_pick_memo_evicts_least_recently_used(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    monkeypatch.setattr(cache, "PICK_MEMO_MAX_ENTRIES", 2)
+    head = _rev(git_repo, "HEAD")
+    clock = iter(range(100, 200))
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+
+    memo = PickMemo.load(git_repo.path)
+    memo.put("p1", "c1", head)
+    memo.put("p2", "c2", head)
+    memo.save()
+    hit = PickMemo.load(git_repo.path)
+    assert hit.get("p1", "c1") == head
+    hit.put("p3", "c3", head)
+    hit.save()
+
+    saved = json.loads(Path(".forked/cache/cherry-pick-memo.json").read_text())
+    assert sorted(saved["picks"]) == ["p1:c1", "p3:c3"]
+    assert sorted(saved["last_used"]) == ["p1:c1", "p3:c3"]
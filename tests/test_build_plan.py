@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+from forked.plan import plan_build
+
+
+def _commit(git_repo, filename: str, content: str, message: str):
+    git_repo.write(filename, content)
+    git_repo.git("add", filename)
+    git_repo.git("commit", "-m", message)
+
+
+def _rev(git_repo, *args: str) -> str:
+    return git_repo.git(*args, capture_output=True).stdout.strip()
+
+
+def test_plan_build_matches_per_branch_git_queries(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.git("checkout", "-b", "patch/a")
+    _commit(git_repo, "a1.txt", "1\n", "a one")
+    _commit(git_repo, "a2.txt", "2\n", "a two")
+    git_repo.git("checkout", "-b", "patch/merged", "trunk")
+    git_repo.git("checkout", "trunk")
+    _commit(git_repo, "trunk.txt", "t\n", "trunk moves on")
+    git_repo.git("checkout", "-b", "patch/b")
+    _commit(git_repo, "b.txt", "b\n", "b only")
+    git_repo.git("checkout", "trunk")
+
+    plan = plan_build("trunk", ["patch/a", "patch/merged", "patch/b"])
+
+    assert plan.trunk_sha == _rev(git_repo, "rev-parse", "trunk")
+    assert plan.commit_count == 3
+    assert plan.estimated_cost == 3
+    for patch in plan.patches:
+        expected_base = _rev(git_repo, "merge-base", "trunk", patch.branch)
+        assert patch.merge_base == expected_base
+        expected = _rev(git_repo, "rev-list", "--reverse", f"{expected_base}..{patch.branch}")
+        assert [commit.sha for commit in patch.commits] == expected.split()
+    assert [commit.summary for commit in plan.patches[0].commits] == ["a one", "a two"]
+    assert plan.patches[1].commits == ()
+
+
+def test_build_plan_cli_leaves_worktree_untouched(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    cfg = load_config()
+    cfg.upstream.branch = "trunk"
+    cfg.patches.order = ["patch/a"]
+    write_config(cfg)
+    Path(".gitignore").write_text(".forked/\n")
+    git_repo.git("add", "forked.yml", ".gitignore")
+    git_repo.git("commit", "-m", "configure forked")
+    git_repo.git("push", "upstream", "trunk")
+    git_repo.git("checkout", "-b", "patch/a")
+    _commit(git_repo, "a.txt", "a\n", "add a")
+    git_repo.git("checkout", "-b", "scratch", "trunk")
+
+    result = CliRunner().invoke(app, ["build", "--plan", "--json"])
+    assert result.exit_code == 0, result.stdout
+
+    payload = json.loads(result.stdout)
+    overlay_plan = payload["overlays"][next(iter(payload["overlays"]))]
+    assert overlay_plan["estimated_cost"] == 1
+    assert overlay_plan["patches"][0]["commits"][0]["summary"] == "add a"
+    assert _rev(git_repo, "rev-parse", "--abbrev-ref", "HEAD") == "scratch"
+    assert not (git_repo.path / "a.txt").exists()
+    assert git_repo.git("branch", "--list", "overlay/*", capture_output=True).stdout == ""
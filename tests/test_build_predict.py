@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _commit(git_repo, filename: str, content: str, message: str):
+    git_repo.write(filename, content)
+    git_repo.git("add", filename)
+    git_repo.git("commit", "-m", message)
+
+
+def _prepare_repo(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    cfg = load_config()
+    cfg.upstream.branch = "trunk"
+    cfg.patches.order = ["patch/a", "patch/b"]
+    cfg.path_bias.ours = ["shared.txt"]
+    write_config(cfg)
+    Path(".gitignore").write_text(".forked/\n")
+    git_repo.write("shared.txt", "base\n")
+    git_repo.git("add", "forked.yml", ".gitignore", "shared.txt")
+    git_repo.git("commit", "-m", "configure forked")
+    git_repo.git("push", "upstream", "trunk")
+
+    git_repo.git("checkout", "-b", "patch/a", "trunk")
+    _commit(git_repo, "a.txt", "a\n", "add a")
+    git_repo.git("checkout", "-b", "patch/b", "trunk")
+    _commit(git_repo, "shared.txt", "patch\n", "patch shared")
+    git_repo.git("checkout", "-b", "scratch", "trunk")
+
+
+def test_predict_reports_clean_stack(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["build", "--predict", "--json"])
+    assert result.exit_code == 0, result.stdout
+
+    prediction = next(iter(json.loads(result.stdout)["overlays"].values()))
+    assert prediction["status"] == "clean"
+    assert prediction["applied"] == prediction["estimated_cost"] == 2
+    assert prediction["first_conflict"] is None
+
+
+def test_predict_reports_first_conflict_without_touching_worktree(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+    git_repo.git("checkout", "trunk")
+    _commit(git_repo, "shared.txt", "upstream\n", "upstream shared")
+    git_repo.git("push", "upstream", "trunk")
+    git_repo.git("checkout", "scratch")
+
+    result = runner.invoke(app, ["build", "--predict", "--json"])
+    assert result.exit_code == 10, result.stdout
+
+    prediction = next(iter(json.loads(result.stdout)["overlays"].values()))
+    stop = prediction["first_conflict"]
+    assert prediction["status"] == "conflict"
+    assert prediction["applied"] == 1
+    assert stop["patch_branch"] == "patch/b"
+    assert stop["summary"] == "patch shared"
+    assert [entry["path"] for entry in stop["files"]] == ["shared.txt"]
+    assert stop["files"][0]["precedence"]["recommended"] == "ours"
+    assert stop["auto_resolvable"] is True
+
+    head = git_repo.git("rev-parse", "--abbrev-ref", "HEAD", capture_output=True)
+    assert head.stdout.strip() == "scratch"
+    assert (git_repo.path / "shared.txt").read_text() == "base\n"
+    assert git_repo.git("status", "--porcelain", capture_output=True).stdout == ""
@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _patch(git_repo, branch: str, filename: str, content: str):
+    git_repo.git("checkout", "-B", branch, "trunk")
+    git_repo.write(filename, content)
+    git_repo.git("add", filename)
+    git_repo.git("commit", "-m", f"{branch}: {filename}")
+
+
+def _rev(git_repo, spec: str) -> str:
+    return git_repo.git("rev-parse", spec, capture_output=True).stdout.strip()
+
+
+def _prepare_stack(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    cfg = load_config()
+    cfg.upstream.branch = "trunk"
+    cfg.patches.order = ["patch/a", "patch/b", "patch/c"]
+    write_config(cfg)
+    Path(".gitignore").write_text(".forked/\n")
+    git_repo.write("app.py", "base\n")
+    git_repo.git("add", "forked.yml", ".gitignore", "app.py")
+    git_repo.git("commit", "-m", "configure forked")
+
+    _patch(git_repo, "patch/a", "a.txt", "a\n")
+    _patch(git_repo, "patch/b", "app.py", "feature\n")
+    _patch(git_repo, "patch/c", "c.txt", "c\n")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("app.py", "upstream\n")
+    git_repo.git("commit", "-am", "upstream change")
+    git_repo.git("push", "upstream", "trunk")
+
+
+def test_build_resume_continues_after_resolved_conflict(git_repo, monkeypatch):
+    _prepare_stack(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["build", "--id", "dev", "--no-worktree", "--emit-conflicts"])
+    assert result.exit_code == 10, result.stdout
+    journal = json.loads(Path(".forked/journal/build-dev.json").read_text())
+    assert journal["stopped_at"] == _rev(git_repo, "patch/b")
+    assert len(journal["done"]) == 1
+    picked_a = journal["head"]
+
+    git_repo.write("app.py", "resolved\n")
+    git_repo.git("add", "app.py")
+    git_repo.git("-c", "core.editor=true", "cherry-pick", "--continue")
+
+    result = runner.invoke(app, ["build", "--resume"])
+    assert result.exit_code == 0, result.stdout
+    assert "Resuming after 2 completed pick(s)" in result.stdout
+
+    assert _rev(git_repo, "overlay/dev~2") == picked_a
+    assert (git_repo.path / "app.py").read_text() == "resolved\n"
+    assert (git_repo.path / "c.txt").exists()
+    assert not Path(".forked/journal/build-dev.json").exists()
+
+
+def test_build_resume_refuses_while_cherry_pick_in_progress(git_repo, monkeypatch):
+    _prepare_stack(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["build", "--id", "dev", "--no-worktree", "--emit-conflicts"])
+    assert result.exit_code == 10, result.stdout
+
+    result = runner.invoke(app, ["build", "--resume", "--id", "dev"])
+    assert result.exit_code == 2
+
+
+def test_sync_resume_skips_rebased_branches(git_repo, monkeypatch):
+    _prepare_stack(git_repo, monkeypatch)
+
+    result = runner.invoke(app, ["sync", "--emit-conflicts"])
+    assert result.exit_code == 10, result.stdout
+    rebased_a = _rev(git_repo, "patch/a")
+    journal = json.loads(Path(".forked/journal/sync.json").read_text())
+    assert journal["done"] == ["patch/a"]
+    assert journal["stopped_at"] == "patch/b"
+
+    git_repo.write("app.py", "resolved\n")
+    git_repo.git("add", "app.py")
+    git_repo.git("-c", "core.editor=true", "rebase", "--continue")
+
+    result = runner.invoke(app, ["sync", "--resume"])
+    assert result.exit_code == 0, result.stdout
+    assert "[sync] patch/a: resumed" in result.stdout
+    assert "[sync] patch/c: rebased" in result.stdout
+    assert _rev(git_repo, "patch/a") == rebased_a
+    trunk = _rev(git_repo, "trunk")
+    merge_base = git_repo.git("merge-base", "trunk", "patch/c", capture_output=True)
+    assert merge_base.stdout.strip() == trunk
+    assert not Path(".forked/journal/sync.json").exists()
@@ -0,0 +1,137 @@
+from forked import gitutil as g
+from forked.build import build_overlay
+from forked.config import Config
+from forked.resolver import resolve_selection
+
+
+def _make_config(patches: list[str]) -> Config:
+    cfg = Config()
+    cfg.patches.order = patches
+    cfg.worktree.enabled = False
+    cfg.upstream.branch = "trunk"
+    return cfg
+
+
+def _ignore_forked_dir(git_repo):
+    exclude = git_repo.path / ".git" / "info" / "exclude"
+    exclude.write_text(exclude.read_text() + ".forked/\n")
+
+
+def _rev(git_repo, spec: str) -> str:
+    return git_repo.git("rev-parse", spec, capture_output=True).stdout.strip()
+
+
+def _message(git_repo, spec: str) -> str:
+    return git_repo.git("cat-file", "commit", spec, capture_output=True).stdout.split("\n\n", 1)[1]
+
+
+def test_tree_engine_matches_cherry_pick_results(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _ignore_forked_dir(git_repo)
+    git_repo.git("checkout", "-b", "patch/one")
+    git_repo.write("one.txt", "one\n")
+    git_repo.git("add", "one.txt")
+    git_repo.git("commit", "-m", "add one")
+    git_repo.write("README.md", "initial\npatched\n")
+    git_repo.git("commit", "-am", "touch readme", "-m", "Signed-off-by: CI <ci@example.com>")
+    git_repo.git("checkout", "trunk")
+
+    cfg = _make_config(["patch/one"])
+    selection = resolve_selection(cfg)
+
+    build_overlay(cfg, "classic", selection, use_worktree=False, write_git_note=False)
+    git_repo.git("checkout", "trunk")
+    _, _, telemetry = build_overlay(
+        cfg, "tree", selection, use_worktree=False, write_git_note=False, engine="tree"
+    )
+
+    assert telemetry["patches"][0]["commit_count"] == 2
+    assert _rev(git_repo, "overlay/tree^{tree}") == _rev(git_repo, "overlay/classic^{tree}")
+    for suffix in ("", "~1"):
+        assert _message(git_repo, f"overlay/tree{suffix}") == _message(
+            git_repo, f"overlay/classic{suffix}"
+        )
+    assert git_repo.git("status", "--porcelain", capture_output=True).stdout == ""
+    git_repo.git("checkout", "trunk")
+
+
+def test_tree_engine_falls_back_to_worktree_on_conflict(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _ignore_forked_dir(git_repo)
+    git_repo.git("checkout", "-b", "patch/clean")
+    git_repo.write("clean.txt", "clean\n")
+    git_repo.git("add", "clean.txt")
+    git_repo.git("commit", "-m", "clean change")
+    git_repo.git("checkout", "-b", "patch/conflict", "trunk")
+    git_repo.write("README.md", "feature\n")
+    git_repo.git("commit", "-am", "feature change")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("README.md", "upstream\n")
+    git_repo.git("commit", "-am", "upstream change")
+    git_repo.git("push", "upstream", "trunk")
+
+    cfg = _make_config(["patch/clean", "patch/conflict"])
+    cfg.path_bias.theirs = ["README.md"]
+    selection = resolve_selection(cfg)
+
+    _, _, telemetry = build_overlay(
+        cfg,
+        "fallback",
+        selection,
+        use_worktree=False,
+        write_git_note=False,
+        on_conflict="bias",
+        engine="tree",
+    )
+
+    assert [entry["status"] for entry in telemetry["patches"]] == ["applied", "applied"]
+    assert telemetry["conflicts"][0]["result"] == "auto-continued"
+    assert (git_repo.path / "README.md").read_text() == "feature\n"
+    assert (git_repo.path / "clean.txt").exists()
+    git_repo.git("checkout", "trunk")
+
+
+def test_tree_engine_returns_to_memory_after_worktree_pick(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _ignore_forked_dir(git_repo)
+    git_repo.git("checkout", "-b", "patch/conflict")
+    git_repo.write("README.md", "feature\n")
+    git_repo.git("commit", "-am", "feature change")
+    git_repo.git("checkout", "-b", "patch/after", "trunk")
+    for name in ("after-1.txt", "after-2.txt"):
+        git_repo.write(name, f"{name}\n")
+        git_repo.git("add", name)
+        git_repo.git("commit", "-m", f"add {name}")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("README.md", "upstream\n")
+    git_repo.git("commit", "-am", "upstream change")
+    git_repo.git("push", "upstream", "trunk")
+
+    cfg = _make_config(["patch/conflict", "patch/after"])
+    cfg.path_bias.theirs = ["README.md"]
+    selection = resolve_selection(cfg)
+
+    picks = []
+    real_run = g.sp.run
+
+    def _counting_run(args, *rest, **kwargs):
+        if args[:2] == ["git", "cherry-pick"]:
+            picks.append(args[2])
+        return real_run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(g.sp, "run", _counting_run)
+    _, _, telemetry = build_overlay(
+        cfg,
+        "memory",
+        selection,
+        use_worktree=False,
+        write_git_note=False,
+        on_conflict="bias",
+        engine="tree",
+    )
+
+    assert picks == ["-x", "--continue"]
+    assert [entry["status"] for entry in telemetry["patches"]] == ["applied", "applied"]
+    assert (git_repo.path / "README.md").read_text() == "feature\n"
+    assert (git_repo.path / "after-2.txt").exists()
+    git_repo.git("checkout", "trunk")
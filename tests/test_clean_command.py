@@ -6,6 +6,7 @@ from typer.testing import CliRunner
 
 from forked.cli import app
 from forked.config import load_config, write_config, write_skeleton
+from forked.conflicts import ConflictContext, create_conflict_writer
 
 runner = CliRunner()
 
@@ -120,3 +121,140 @@ def test_clean_conflict_pruning(git_repo, monkeypatch):
     assert not old_json.exists()
     assert not old_dir.exists()
     assert latest_json.exists()
+
+
+def test_clean_conflict_pruning_survives_corrupt_index(git_repo, monkeypatch):
+    _configure_repo(git_repo, monkeypatch)
+    conflicts_dir = Path(".forked/conflicts")
+    conflicts_dir.mkdir(parents=True, exist_ok=True)
+    (conflicts_dir / "index.sqlite").write_bytes(b"not a sqlite database" * 64)
+    old_json = conflicts_dir / "overlay-dev-1.json"
+    old_json.write_text("{}")
+    (conflicts_dir / "overlay-dev-2.json").write_text("{}")
+    old_time = time.time() - (20 * 24 * 3600)
+    os.utime(old_json, (old_time, old_time))
+
+    result = runner.invoke(app, ["clean", "--conflicts", "--no-dry-run", "--confirm"])
+    assert result.exit_code == 0, result.output
+    assert "Unable to update conflict index" in result.output
+    assert not old_json.exists()
+
+
+def test_clean_conflicts_reclaims_unreferenced_blobs(git_repo, monkeypatch):
+    _configure_repo(git_repo, monkeypatch)
+    git_repo.write("shared.txt", "base\n")
+    git_repo.write("old.txt", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/x")
+    git_repo.write("shared.txt", "patch\n")
+    git_repo.write("old.txt", "old patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("shared.txt", "upstream\n")
+    git_repo.write("old.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/x", check=False).returncode != 0
+
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/dev",
+        overlay_id="dev",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/x",
+        patch_commit="patch/x",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    for overlay_id in ("overlay-dev-1", "overlay-dev-2"):
+        writer = create_conflict_writer(
+            load_config(),
+            git_repo.path,
+            emit_conflicts="__AUTO__",
+            conflict_blobs_dir="__AUTO__",
+            overlay_id=overlay_id,
+        )
+        writer.next_bundle(context, [])
+        if overlay_id == "overlay-dev-1":
+            # The newer wave only still conflicts on shared.txt.
+            git_repo.git("checkout", "--theirs", "old.txt")
+            git_repo.git("add", "old.txt")
+    git_repo.git("cherry-pick", "--abort")
+
+    conflicts_dir = Path(".forked/conflicts")
+    old_theirs = conflicts_dir / "overlay-dev-1" / "wave-1" / "old.txt" / "theirs.txt"
+    shared = [
+        conflicts_dir / overlay_id / "wave-1" / "shared.txt" / "theirs.txt"
+        for overlay_id in ("overlay-dev-1", "overlay-dev-2")
+    ]
+    assert shared[0].samefile(shared[1])
+    store = conflicts_dir / "objects"
+    old_object = next(p for p in store.glob("*/*") if p.read_text() == "old patch\n")
+    shared_object = next(p for p in store.glob("*/*") if p.samefile(shared[0]))
+    assert old_theirs.samefile(old_object)
+
+    old_time = time.time() - (20 * 24 * 3600)
+    for path in conflicts_dir.glob("overlay-dev-1*"):
+        os.utime(path, (old_time, old_time))
+
+    result = runner.invoke(app, ["clean", "--conflicts", "--no-dry-run", "--confirm"])
+    assert result.exit_code == 0, result.stdout
+    assert not (conflicts_dir / "overlay-dev-1").exists()
+    assert not old_object.exists()
+    assert shared_object.exists()
+    assert shared[1].read_text() == "patch\n"
+    assert (conflicts_dir / "overlay-dev-2-1.json").exists()
+
+
+def test_clean_conflicts_keeps_blobs_symlinked_from_external_exports(
+    git_repo, monkeypatch, tmp_path
+):
+    _configure_repo(git_repo, monkeypatch)
+    git_repo.write("shared.txt", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/x")
+    git_repo.write("shared.txt", "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("shared.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/x", check=False).returncode != 0
+
+    def _no_hardlinks(src, dst):
+        raise OSError("cross-device link")
+
+    # Exports on another filesystem cannot be hardlinked and fall back to symlinks.
+    monkeypatch.setattr(os, "link", _no_hardlinks)
+    exports = tmp_path / "exports"
+    writer = create_conflict_writer(
+        load_config(),
+        git_repo.path,
+        emit_conflicts="__AUTO__",
+        conflict_blobs_dir=str(exports),
+        overlay_id="dev",
+    )
+    writer.next_bundle(
+        ConflictContext(
+            mode="build",
+            overlay="overlay/dev",
+            overlay_id="dev",
+            trunk="trunk",
+            upstream="upstream/trunk",
+            patch_branch="patch/x",
+            patch_commit="patch/x",
+            merge_base="HEAD~1",
+            feature=None,
+            resume={},
+        ),
+        [],
+    )
+    git_repo.git("cherry-pick", "--abort")
+    theirs = next(exports.rglob("theirs.txt"))
+    assert theirs.is_symlink()
+
+    result = runner.invoke(app, ["clean", "--conflicts", "--no-dry-run", "--confirm"])
+    assert result.exit_code == 0, result.stdout
+    assert theirs.read_text() == "patch\n"
@@ -4,7 +4,9 @@ from pathlib import Path
 import yaml
 from typer.testing import CliRunner
 
+from forked import gitutil as g
 from forked.cli import app
+from forked.conflicts import apply_recommendations
 
 
 def _configure_forked(repo_path: Path, patches: list[str]) -> None:
@@ -88,3 +90,50 @@ def test_conflict_bundle_v2_build(git_repo, monkeypatch):
     assert log_entry["event"] == "forked.build"
     assert log_entry["status"] == "conflict"
     assert log_entry["conflicts"][0]["bundle"].endswith("test-1.json")
+
+
+def test_apply_recommendations_batches_git_calls(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    names = [f"dir {n}/file-{n}.txt" for n in range(6)]
+    for name in names:
+        git_repo.write(name, "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/many")
+    for name in names:
+        git_repo.write(name, "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    for name in names:
+        git_repo.write(name, "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/many", check=False).returncode != 0
+
+    choices = ["ours", "theirs", "none"] * 2
+    bundle = {
+        "files": [
+            {"path": name, "precedence": {"recommended": choice}}
+            for name, choice in zip(names, choices, strict=True)
+        ]
+    }
+    calls = []
+    real_run = g.run
+
+    def _counting_run(args, *rest, **kwargs):
+        calls.append(args[0])
+        return real_run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(g, "run", _counting_run)
+    actions = apply_recommendations(bundle, cwd=None)
+
+    assert actions == [(n, c) for n, c in zip(names, choices, strict=True) if c != "none"]
+    assert calls == ["checkout", "checkout", "add"]
+    unmerged = real_run(["diff", "--name-only", "--diff-filter=U"]).stdout.splitlines()
+    assert unmerged == [
+        name for name, choice in zip(names, choices, strict=True) if choice == "none"
+    ]
+    for name, choice in zip(names, choices, strict=True):
+        if choice != "none":
+            expected = "upstream\n" if choice == "ours" else "patch\n"
+            assert (git_repo.path / name).read_text() == expected
+    git_repo.git("cherry-pick", "--abort")
@@ -0,0 +1,311 @@
+import gzip
+import json
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from forked import conflicts
+from forked import gitutil as g
+from forked.config import Config
+from forked.conflicts import ConflictContext, create_conflict_writer
+
+
+def _git_bytes(repo: Path, *args: str) -> str:
+    cp = subprocess.run(["git", *args], cwd=repo, capture_output=True, check=False)
+    return cp.stdout.decode()
+
+
+def _strip_headers(diff: str) -> str:
+    return re.sub(r"^(diff --git|---|\+\+\+) .*\n", "", diff, flags=re.MULTILINE)
+
+
+def test_bundle_diffs_and_zdiff3_match_file_based_git(git_repo, monkeypatch, tmp_path):
+    monkeypatch.chdir(git_repo.path)
+    base = "".join(f"line {n}\n" for n in range(1, 21))
+    git_repo.write("src/app.py", base)
+    git_repo.write("notes.txt", "keep\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+
+    git_repo.git("checkout", "-b", "patch/x")
+    git_repo.write("src/app.py", base.replace("line 3\n", "ours 3\n").replace("line 18", "ours 18"))
+    git_repo.write("notes.txt", "patched\n")
+    git_repo.git("commit", "-am", "patch")
+    patch_sha = git_repo.git("rev-parse", "HEAD", capture_output=True).stdout.strip()
+
+    git_repo.git("checkout", "trunk")
+    git_repo.write("src/app.py", base.replace("line 3\n", "up 3\n").replace("line 10", "up 10"))
+    git_repo.write("notes.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", patch_sha, check=False).returncode != 0
+
+    writer = create_conflict_writer(
+        Config(), git_repo.path, emit_conflicts="__AUTO__", conflict_blobs_dir=None, overlay_id="x"
+    )
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/x",
+        overlay_id="x",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/x",
+        patch_commit=patch_sha,
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    _, bundle = writer.next_bundle(context, [])
+    git_repo.git("cherry-pick", "--abort")
+
+    for entry in bundle["files"]:
+        sides = {}
+        for name, oid in entry["oids"].items():
+            sides[name] = tmp_path / f"{entry['path'].replace('/', '_')}.{name}"
+            sides[name].write_bytes(
+                subprocess.run(
+                    ["git", "cat-file", "blob", oid], cwd=git_repo.path, capture_output=True
+                ).stdout
+            )
+        for key, (old, new) in {
+            "base_vs_ours_unified": ("base", "ours"),
+            "base_vs_theirs_unified": ("base", "theirs"),
+            "ours_vs_theirs_unified": ("ours", "theirs"),
+        }.items():
+            expected = _git_bytes(
+                git_repo.path, "diff", "--no-index", "-U3", str(sides[old]), str(sides[new])
+            )
+            diff = entry["diffs"][key]
+            assert diff.startswith(f"diff --git a/{entry['path']} b/{entry['path']}\n")
+            assert _strip_headers(diff) == _strip_headers(expected)
+
+        merged = _git_bytes(
+            git_repo.path,
+            "merge-file",
+            "-p",
+            "--zdiff3",
+            "-L",
+            "ours",
+            "-L",
+            "base",
+            "-L",
+            "theirs",
+            str(sides["ours"]),
+            str(sides["base"]),
+            str(sides["theirs"]),
+        )
+        assert entry["merge_result"] == {"style": "zdiff3", "content": merged}
+
+
+def test_parallel_collection_matches_sequential_order(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    names = [f"pkg/m{n:02d}.txt" for n in range(12)]
+    for name in names:
+        git_repo.write(name, "base\n")
+    git_repo.write("logo.bin", "\x00base")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+
+    git_repo.git("checkout", "-b", "patch/many")
+    for name in [*names, "logo.bin"]:
+        git_repo.write(name, "\x00patch" if name.endswith(".bin") else "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    for name in [*names, "logo.bin"]:
+        git_repo.write(name, "\x00upstream" if name.endswith(".bin") else "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/many", check=False).returncode != 0
+
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/many",
+        overlay_id="many",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/many",
+        patch_commit="patch/many",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    bundles = []
+    for jobs in (1, 5):
+        writer = create_conflict_writer(
+            Config(),
+            git_repo.path,
+            emit_conflicts="__AUTO__",
+            conflict_blobs_dir=str(git_repo.path / f".blobs-{jobs}"),
+            overlay_id=f"many-{jobs}",
+            jobs=jobs,
+        )
+        bundles.append(writer.next_bundle(context, [])[1]["files"])
+    git_repo.git("cherry-pick", "--abort")
+
+    sequential, parallel = bundles
+    assert [entry["path"] for entry in parallel] == sorted(["logo.bin", *names])
+    for left, right in zip(sequential, parallel, strict=True):
+        assert left["blobs_dir"].replace(".blobs-1", ".blobs-5") == right["blobs_dir"]
+        left.pop("blobs_dir")
+        right.pop("blobs_dir")
+        assert left == right
+    assert parallel[0]["binary"] is True
+    assert parallel[1]["merge_result"]["content"].startswith("<<<<<<< ours\n")
+    assert (
+        git_repo.path / ".blobs-5" / "wave-1" / "pkg" / "m11.txt" / "theirs.txt"
+    ).read_text() == "patch\n"
+
+
+def test_streamed_bundle_round_trips_to_json_bundle(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    monkeypatch.setattr(conflicts, "COLLECT_BATCH_SIZE", 2)
+    names = [f"m{n}.txt" for n in range(5)]
+    for name in names:
+        git_repo.write(name, "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/s")
+    for name in names:
+        git_repo.write(name, "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    for name in names:
+        git_repo.write(name, "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/s", check=False).returncode != 0
+
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/s",
+        overlay_id="s",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/s",
+        patch_commit="patch/s",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={"rebuild": "forked build --id s"},
+    )
+    paths = {}
+    for bundle_format in ("json", "ndjson.gz"):
+        writer = create_conflict_writer(
+            Config(),
+            git_repo.path,
+            emit_conflicts=".forked/conflicts/s.json",
+            conflict_blobs_dir=None,
+            overlay_id="s",
+            bundle_format=bundle_format,
+        )
+        paths[bundle_format], returned = writer.next_bundle(context, [])
+        assert [entry["path"] for entry in returned["files"]] == names
+    git_repo.git("cherry-pick", "--abort")
+
+    assert paths["ndjson.gz"].name == "s-1.ndjson.gz"
+    with gzip.open(paths["ndjson.gz"], "rt") as fh:
+        records = [json.loads(line)["record"] for line in fh]
+    assert records == ["header", *["file"] * len(names), "trailer"]
+    streamed = conflicts.read_bundle(paths["ndjson.gz"])
+    assert streamed == json.loads(paths["json"].read_text())
+    assert list(conflicts.iter_bundle_files(paths["json"])) == streamed["files"]
+
+    truncated = paths["ndjson.gz"].with_name("cut.ndjson")
+    with gzip.open(paths["ndjson.gz"], "rt") as fh:
+        truncated.write_text("".join(fh.readlines()[:-1]))
+    with pytest.raises(RuntimeError, match="truncated"):
+        list(conflicts.iter_bundle_files(truncated))
+
+
+def test_oversized_stages_skip_diffs_and_stream_exports(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.write("big.txt", "base\n" * 100)
+    git_repo.write("small.txt", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/big")
+    git_repo.write("big.txt", "patch\n" * 100)
+    git_repo.write("small.txt", "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("big.txt", "upstream\n" * 100)
+    git_repo.write("small.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/big", check=False).returncode != 0
+
+    cfg = Config()
+    cfg.conflicts.diff_size_limit = 256
+    writer = create_conflict_writer(
+        cfg,
+        git_repo.path,
+        emit_conflicts="__AUTO__",
+        conflict_blobs_dir="__AUTO__",
+        overlay_id="big",
+    )
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/big",
+        overlay_id="big",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/big",
+        patch_commit="patch/big",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    _, bundle = writer.next_bundle(context, [])
+    git_repo.git("cherry-pick", "--abort")
+
+    big, small = bundle["files"]
+    assert big["binary"] is True
+    assert big["size_bytes"] == len("upstream\n" * 100)
+    assert big["diffs"]["base_vs_ours_unified"] is None
+    assert big["merge_result"] is None
+    assert (Path(big["blobs_dir"]) / "theirs.txt").read_text() == "patch\n" * 100
+    assert small["binary"] is False
+    assert small["diffs"]["base_vs_ours_unified"] is not None
+
+
+def test_merge_result_is_null_without_merge_tree_write_tree(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.write("app.txt", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/old-git")
+    git_repo.write("app.txt", "patch\n")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("app.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/old-git", check=False).returncode != 0
+
+    monkeypatch.setattr(g, "supports_merge_tree", lambda: False)
+    writer = create_conflict_writer(
+        Config(), git_repo.path, emit_conflicts="__AUTO__", conflict_blobs_dir=None, overlay_id="o"
+    )
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/o",
+        overlay_id="o",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/old-git",
+        patch_commit="patch/old-git",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    _, bundle = writer.next_bundle(context, [])
+    git_repo.git("cherry-pick", "--abort")
+
+    (entry,) = bundle["files"]
+    assert entry["merge_result"] is None
+    assert entry["diffs"]["ours_vs_theirs_unified"] is not None
+
+
+def test_binary_probe_reads_a_bounded_prefix():
+    text = ("é" * conflicts.BINARY_PROBE_BYTES).encode()
+    # A prefix that splits a multi-byte character is still text.
+    assert not conflicts._is_probably_binary(text[:7], truncated=True)
+    assert conflicts._is_probably_binary(text[:7])
+    assert not conflicts._is_probably_binary(text + b"\x00")
+    assert conflicts._is_probably_binary(b"ok\x00")
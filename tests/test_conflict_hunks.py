@@ -0,0 +1,165 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+import typer
+import yaml
+
+from forked import gitutil as g
+from forked.config import Config, HunkRule, load_config
+from forked.conflicts import (
+    ConflictContext,
+    apply_recommendations,
+    create_conflict_writer,
+    resolve_hunks,
+)
+
+
+def _context(patch_sha: str) -> ConflictContext:
+    return ConflictContext(
+        mode="build",
+        overlay="overlay/x",
+        overlay_id="x",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/x",
+        patch_commit=patch_sha,
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+
+
+def _merge_file(tmp_path: Path, repo: Path, oids: dict[str, str], flag: str) -> bytes:
+    sides = []
+    for name in ("ours", "base", "theirs"):
+        side = tmp_path / name
+        side.write_bytes(
+            subprocess.run(
+                ["git", "cat-file", "blob", oids[name]], cwd=repo, capture_output=True, check=True
+            ).stdout
+        )
+        sides.append(str(side))
+    cp = subprocess.run(["git", "merge-file", "-p", flag, *sides], capture_output=True)
+    return cp.stdout
+
+
+def test_hunk_rules_resolve_and_record_each_hunk(git_repo, monkeypatch, tmp_path):
+    monkeypatch.chdir(git_repo.path)
+    base = "".join(f"line {n}\n" for n in range(1, 21))
+    git_repo.write("CHANGELOG.md", "# Changes\n- base\n")
+    git_repo.write("src/app.py", base)
+    git_repo.write("logo.bin", "\0base")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+
+    git_repo.git("checkout", "-b", "patch/x")
+    git_repo.write("CHANGELOG.md", "# Changes\n- patch entry\n- base\n")
+    patched = base.replace("line 3\n", "patch 3  # FORKED-KEEP\n").replace("line 17", "patch 17")
+    git_repo.write("src/app.py", patched)
+    git_repo.write("logo.bin", "\0patch")
+    git_repo.git("commit", "-am", "patch")
+    patch_sha = git_repo.git("rev-parse", "HEAD", capture_output=True).stdout.strip()
+
+    git_repo.git("checkout", "trunk")
+    git_repo.write("CHANGELOG.md", "# Changes\n- upstream entry\n- base\n")
+    git_repo.write("src/app.py", base.replace("line 3\n", "up 3\n").replace("line 17", "up 17"))
+    git_repo.write("logo.bin", "\0upstream")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", patch_sha, check=False).returncode != 0
+
+    cfg = Config()
+    cfg.path_bias.hunks = [
+        HunkRule(paths=["CHANGELOG.md", "*.bin"], strategy="union"),
+        HunkRule(paths=["src/**"], strategy="ours", keep_theirs_matching="FORKED-KEEP"),
+    ]
+    writer = create_conflict_writer(
+        cfg, git_repo.path, emit_conflicts="__AUTO__", conflict_blobs_dir=None, overlay_id="x"
+    )
+    _, bundle = writer.next_bundle(_context(patch_sha), [])
+    files = {entry["path"]: entry for entry in bundle["files"]}
+
+    changelog = files["CHANGELOG.md"]
+    assert changelog["precedence"]["recommended"] == "hunks"
+    assert changelog["hunks"]["strategy"] == "union"
+    assert changelog["hunks"]["resolved"] == [
+        {"index": 0, "line": 2, "ours_lines": 1, "theirs_lines": 1, "resolution": "union"}
+    ]
+    app = files["src/app.py"]
+    assert [hunk["resolution"] for hunk in app["hunks"]["resolved"]] == ["theirs", "ours"]
+    logo = files["logo.bin"]
+    assert logo["precedence"]["recommended"] == "none"
+    assert logo["hunks"]["resolved"] is None
+
+    expected_union = _merge_file(tmp_path, git_repo.path, changelog["oids"], "--union")
+    actions = apply_recommendations(bundle, cwd=None)
+
+    assert sorted(actions) == [("CHANGELOG.md", "hunks"), ("src/app.py", "hunks")]
+    assert Path("CHANGELOG.md").read_bytes() == expected_union
+    assert Path("src/app.py").read_text() == base.replace(
+        "line 3\n", "patch 3  # FORKED-KEEP\n"
+    ).replace("line 17", "up 17")
+    unmerged = git_repo.git("diff", "--name-only", "--diff-filter=U", capture_output=True)
+    assert unmerged.stdout.splitlines() == ["logo.bin"]
+    git_repo.git("cherry-pick", "--abort")
+
+
+def test_separator_lines_outside_and_inside_hunks(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+
+    def _blob(text: str) -> str:
+        return subprocess.run(
+            ["git", "hash-object", "-w", "--stdin"],
+            input=text,
+            text=True,
+            capture_output=True,
+            check=True,
+        ).stdout.strip()
+
+    heading = "Changes\n=======\n\n"
+    tail = "".join(f"line {n}\n" for n in range(1, 8))
+    base = _blob(heading + "- base\n" + tail)
+    upstream = _blob(heading + "- upstream\n" + tail)
+    patch = _blob(heading + "- patch\n" + tail)
+    patch_heading = _blob(heading + "Patch\n=======\n" + tail)
+
+    (outside, inside) = resolve_hunks(
+        [((base, upstream, patch), "union", None), ((base, upstream, patch_heading), "ours", None)]
+    )
+
+    assert outside is not None
+    content, hunks = outside
+    assert content.decode() == heading + "- upstream\n- patch\n" + tail
+    assert [hunk["resolution"] for hunk in hunks] == ["union"]
+    # The patch side brings its own "=======" line, so the hunk boundary is ambiguous.
+    assert inside is None
+
+
+def test_hunk_resolution_is_skipped_without_merge_tree_write_tree(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    monkeypatch.setattr(g, "supports_merge_tree", lambda: False)
+    blob = g.ensure_empty_blob()
+
+    assert resolve_hunks([((blob, blob, blob), "ours", None)]) == [None]
+
+
+@pytest.mark.parametrize(
+    ("rule", "message"),
+    [
+        ({"paths": [], "strategy": "ours"}, "non-empty list of paths"),
+        ({"paths": ["docs/**"], "strategy": "ours", "pattern": "x"}, "unknown key(s): pattern"),
+        ({"paths": ["docs/**"], "strategy": "merge"}, "strategy of ours, theirs, union"),
+        ({"paths": ["docs/**"], "keep_theirs_matching": "KEEP("}, "invalid keep_theirs_matching"),
+    ],
+)
+def test_invalid_hunk_rules_are_rejected_at_load(tmp_path, capsys, rule, message):
+    cfg_path = tmp_path / "forked.yml"
+    cfg_path.write_text(yaml.safe_dump({"path_bias": {"hunks": [rule]}}))
+
+    with pytest.raises(typer.Exit) as excinfo:
+        load_config(cfg_path)
+
+    assert excinfo.value.exit_code == 3
+    out = capsys.readouterr().out
+    assert "path_bias.hunks[0]" in out
+    assert message in out
@@ -0,0 +1,105 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import Config, write_skeleton
+from forked.conflicts import (
+    ConflictContext,
+    create_conflict_writer,
+    record_conflict_outcomes,
+)
+
+runner = CliRunner()
+
+
+def _context(branch: str) -> ConflictContext:
+    return ConflictContext(
+        mode="build",
+        overlay="overlay/q",
+        overlay_id="q",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch=branch,
+        patch_commit=branch,
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+
+
+def test_bundles_are_indexed_and_queryable(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    Path(".git/info/exclude").write_text(".forked/\nforked.yml\n")
+    for name in ("hot.txt", "cold.txt"):
+        git_repo.write(name, "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    for branch, files in (("patch/a", ["hot.txt", "cold.txt"]), ("patch/b", ["hot.txt"])):
+        git_repo.git("checkout", "-b", branch, "trunk")
+        for name in files:
+            git_repo.write(name, f"{branch}\n")
+        git_repo.git("commit", "-am", branch)
+    git_repo.git("checkout", "trunk")
+    git_repo.write("hot.txt", "upstream\n")
+    git_repo.write("cold.txt", "upstream\n")
+    git_repo.git("commit", "-am", "upstream")
+
+    cfg = Config()
+    cfg.path_bias.theirs = ["hot.txt"]
+    writer = create_conflict_writer(
+        cfg, git_repo.path, emit_conflicts="__AUTO__", conflict_blobs_dir=None, overlay_id="q"
+    )
+    records = []
+    for branch in ("patch/a", "patch/b"):
+        assert git_repo.git("cherry-pick", branch, check=False).returncode != 0
+        bundle_path, _ = writer.next_bundle(_context(branch), [])
+        git_repo.git("cherry-pick", "--abort")
+        records.append({"bundle": str(bundle_path), "result": "stopped"})
+    records[1]["result"] = "auto-continued"
+    records[1]["auto_actions"] = [{"path": "hot.txt", "resolution": "theirs"}]
+    record_conflict_outcomes(git_repo.path, records)
+
+    result = runner.invoke(app, ["conflicts", "query", "--since", "30d", "--json"])
+    assert result.exit_code == 0, result.stdout
+    rows = json.loads(result.stdout)
+    assert [(row["path"], row["conflicts"], row["bundles"]) for row in rows] == [
+        ("hot.txt", 2, 2),
+        ("cold.txt", 1, 1),
+    ]
+
+    listed = runner.invoke(
+        app, ["conflicts", "query", "--group-by", "none", "--outcome", "auto-theirs", "--json"]
+    )
+    [row] = json.loads(listed.stdout)
+    assert (row["patch_branch"], row["path"], row["recommended"]) == (
+        "patch/b",
+        "hot.txt",
+        "theirs",
+    )
+
+    by_branch = runner.invoke(
+        app, ["conflicts", "query", "--group-by", "patch_branch", "--path", "*.txt"]
+    )
+    assert by_branch.exit_code == 0, by_branch.stdout
+    assert "patch/a" in by_branch.stdout
+
+    # Clean drops the index rows of the bundles it removes.
+    old = time.time() - 20 * 24 * 3600
+    os.utime(records[0]["bundle"], (old, old))
+    cleaned = runner.invoke(app, ["clean", "--conflicts", "--no-dry-run", "--confirm"])
+    assert cleaned.exit_code == 0, cleaned.stdout
+    with sqlite3.connect(".forked/conflicts/index.sqlite") as conn:
+        bundles = [row[0] for row in conn.execute("SELECT bundle FROM bundles")]
+    assert bundles == [".forked/conflicts/q-2.json"]
+
+    # Bundles written before the index existed are picked up by --reindex.
+    os.remove(".forked/conflicts/index.sqlite")
+    reindexed = runner.invoke(app, ["conflicts", "query", "--reindex", "--json"])
+    assert reindexed.exit_code == 0, reindexed.stdout
+    assert [row["path"] for row in json.loads(reindexed.stdout)] == ["hot.txt"]
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import Config
+from forked.conflicts import ConflictContext, create_conflict_writer
+
+runner = CliRunner()
+
+
+def _conflict(git_repo):
+    git_repo.write("app.py", "".join(f"line {n}\n" for n in range(10)))
+    git_repo.write("logo.bin", "\x00base")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "patch/x")
+    git_repo.write("app.py", "".join(f"patch {n}\n" for n in range(10)))
+    git_repo.write("logo.bin", "\x00patch")
+    git_repo.git("commit", "-am", "patch")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("app.py", "".join(f"upstream {n}\n" for n in range(10)))
+    git_repo.write("logo.bin", "\x00upstream")
+    git_repo.git("commit", "-am", "upstream")
+    assert git_repo.git("cherry-pick", "patch/x", check=False).returncode != 0
+
+
+def test_lazy_bundle_diffs_are_computed_and_cached_on_demand(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _conflict(git_repo)
+    context = ConflictContext(
+        mode="build",
+        overlay="overlay/x",
+        overlay_id="x",
+        trunk="trunk",
+        upstream="upstream/trunk",
+        patch_branch="patch/x",
+        patch_commit="patch/x",
+        merge_base="HEAD~1",
+        feature=None,
+        resume={},
+    )
+    bundles = {}
+    for lazy in (False, True):
+        writer = create_conflict_writer(
+            Config(),
+            git_repo.path,
+            emit_conflicts=f".forked/conflicts/{'lazy' if lazy else 'inline'}.json",
+            conflict_blobs_dir=None,
+            overlay_id="x",
+            lazy_diffs=lazy,
+        )
+        bundles[lazy] = writer.next_bundle(context, [])
+    git_repo.git("cherry-pick", "--abort")
+
+    lazy_path, lazy_bundle = bundles[True]
+    assert lazy_bundle["lazy_diffs"] is True
+    assert all(entry["diffs"] is None for entry in lazy_bundle["files"])
+    inline = {entry["path"]: entry for entry in bundles[False][1]["files"]}
+
+    listing = runner.invoke(app, ["conflicts", "show", str(lazy_path)])
+    assert listing.exit_code == 0, listing.stdout
+    assert "app.py: recommended=" in listing.stdout
+    assert "logo.bin (binary)" in listing.stdout
+
+    args = ["conflicts", "show", str(lazy_path), "--path", "app.py", "--diff", "ours-theirs"]
+    shown = runner.invoke(app, args)
+    assert shown.exit_code == 0, shown.stdout
+    assert shown.stdout == inline["app.py"]["diffs"]["ours_vs_theirs_unified"]
+    cached = list(Path(".forked/cache/conflict-diffs").glob("*/*.diff"))
+    assert len(cached) == 1
+
+    as_json = runner.invoke(app, [*args[:-2], "--diff", "base-theirs", "--json"])
+    assert as_json.exit_code == 0, as_json.stdout
+    [entry] = json.loads(as_json.stdout)
+    assert entry["diff"] == inline["app.py"]["diffs"]["base_vs_theirs_unified"]
+
+    missing = runner.invoke(app, ["conflicts", "show", str(lazy_path), "--path", "nope.txt"])
+    assert missing.exit_code == 2
@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked import gitutil as g
+from forked.cli import app
+from forked.config import Feature, OverlayProfile, load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _patch(git_repo, branch: str, filename: str, content: str):
+    git_repo.git("checkout", "-B", branch, "trunk")
+    git_repo.write(filename, content)
+    git_repo.git("add", filename)
+    git_repo.git("commit", "-m", f"{branch}: {filename}")
+
+
+def _prepare_repo(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    write_skeleton()
+    cfg = load_config()
+    cfg.patches.order = ["patch/a", "patch/b", "patch/c"]
+    cfg.features = {
+        "alpha": Feature(patches=["patch/a"]),
+        "beta": Feature(patches=["patch/b"]),
+        "gamma": Feature(patches=["patch/c"]),
+    }
+    cfg.overlays = {"ab": OverlayProfile(features=["alpha", "beta"])}
+    write_config(cfg)
+    Path(".gitignore").write_text(".forked/\n")
+    git_repo.write("shared.txt", "base\n")
+    git_repo.git("add", "forked.yml", ".gitignore", "shared.txt")
+    git_repo.git("commit", "-m", "configure forked")
+
+    _patch(git_repo, "patch/a", "a.txt", "a\n")
+    _patch(git_repo, "patch/b", "shared.txt", "beta\n")
+    _patch(git_repo, "patch/c", "shared.txt", "gamma\n")
+    git_repo.git("checkout", "trunk")
+
+
+def _cells(result):
+    assert result.exit_code == 0, result.stdout
+    payload = json.loads(result.stdout)
+    return {cell["name"]: cell for cell in payload["cells"]}
+
+
+def test_feature_matrix_flags_conflicting_pairs(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+
+    cells = _cells(runner.invoke(app, ["feature", "matrix", "--profiles", "--json", "-j", "2"]))
+
+    assert {name: cell["status"] for name, cell in cells.items()} == {
+        "alpha": "clean",
+        "beta": "clean",
+        "gamma": "clean",
+        "alpha+beta": "clean",
+        "alpha+gamma": "clean",
+        "beta+gamma": "conflict",
+        "ab": "clean",
+    }
+    stop = cells["beta+gamma"]["stop"]
+    assert stop["patch_branch"] == "patch/c"
+    assert stop["paths"] == ["shared.txt"]
+    assert cells["ab"]["kind"] == "profile"
+    assert not any(cell["cached"] for cell in cells.values())
+    head = git_repo.git("rev-parse", "--abbrev-ref", "HEAD", capture_output=True)
+    assert head.stdout.strip() == "trunk"
+    assert git_repo.git("status", "--porcelain", capture_output=True).stdout == ""
+
+
+def test_feature_matrix_recomputes_only_changed_cells(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+    _cells(runner.invoke(app, ["feature", "matrix", "--json"]))
+
+    git_repo.git("checkout", "patch/a")
+    git_repo.write("a.txt", "a2\n")
+    git_repo.git("commit", "-am", "alpha again")
+    git_repo.git("checkout", "trunk")
+
+    cells = _cells(runner.invoke(app, ["feature", "matrix", "--json"]))
+    recomputed = {name for name, cell in cells.items() if not cell["cached"]}
+    assert recomputed == {"alpha", "alpha+beta", "alpha+gamma"}
+
+    table = runner.invoke(app, ["feature", "matrix"])
+    assert table.exit_code == 0, table.stdout
+    assert "beta+gamma" in table.stdout
+    assert "6 cell(s), 6 from cache" in table.stdout
+
+
+def test_feature_matrix_keeps_profile_named_like_a_feature_apart(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+    cfg = load_config()
+    cfg.overlays = {"gamma": OverlayProfile(features=["beta", "gamma"])}
+    write_config(cfg)
+
+    result = runner.invoke(app, ["feature", "matrix", "--profiles", "--json"])
+    assert result.exit_code == 0, result.stdout
+    cells = {(cell["kind"], cell["name"]): cell for cell in json.loads(result.stdout)["cells"]}
+
+    assert cells[("feature", "gamma")]["status"] == "clean"
+    assert cells[("feature", "gamma")]["features"] == ["gamma"]
+    assert cells[("profile", "gamma")]["status"] == "conflict"
+    assert cells[("profile", "gamma")]["features"] == ["beta", "gamma"]
+
+
+def test_matrix_requires_merge_tree_write_tree(git_repo, monkeypatch):
+    _prepare_repo(git_repo, monkeypatch)
+    monkeypatch.setattr(g, "git_version", lambda: (2, 37, 1))
+
+    result = runner.invoke(app, ["feature", "matrix"])
+
+    assert result.exit_code == 2
+    assert "feature matrix needs Git 2.38 or newer" in result.output
+    assert "found 2.37.1" in result.output
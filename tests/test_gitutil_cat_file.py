@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from forked import gitutil as g
+
+
+def test_cat_file_reader_serves_contents_sizes_and_paths(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.write("docs/with space.txt", "hello\n")
+    git_repo.git("add", "docs/with space.txt")
+    git_repo.git("commit", "-m", "add doc")
+
+    expected = git_repo.git(
+        "rev-parse", "trunk:docs/with space.txt", capture_output=True
+    ).stdout.strip()
+
+    assert g.blob_hash("trunk", "docs/with space.txt") == expected
+    assert g.blob_hash("trunk", "missing.txt") is None
+    assert g.object_size(expected) == len("hello\n")
+    assert g.read_blob(expected) == b"hello\n"
+    assert g.read_blob("trunk:README.md") == b"initial\n"
+    assert g.object_info("trunk:docs")[1] == "tree"
+    assert g.read_blob("0" * 40) is None
+
+
+def test_cat_file_pool_is_bounded_under_concurrency(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    pool = g.CatFilePool(str(git_repo.path), size=2)
+
+    def _read(_):
+        with pool.acquire() as reader:
+            result = reader.read("trunk:README.md")
+        assert result is not None
+        return result[2]
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_read, range(32)))
+        assert results == [b"initial\n"] * 32
+        assert pool._created <= 2
+    finally:
+        pool.close()
+
+
+def test_stream_blob_chunks_and_prefix_reads(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    payload = "".join(f"row {n}\n" for n in range(5000))
+    git_repo.write("big.txt", payload)
+    git_repo.git("add", "big.txt")
+    git_repo.git("commit", "-m", "add big")
+
+    chunks: list[bytes] = []
+    assert g.stream_blob("trunk:big.txt", chunks.append, chunk_size=4096) == len(payload)
+    assert max(len(chunk) for chunk in chunks) == 4096
+    assert b"".join(chunks) == payload.encode()
+    assert g.stream_blob("0" * 40, chunks.append) is None
+    # The pooled reader stays in sync after a streamed read.
+    assert g.read_blob("trunk:README.md") == b"initial\n"
+
+    assert g.read_blob_prefix("trunk:big.txt", 12) == payload.encode()[:12]
+    assert g.read_blob_prefix("0" * 40, 12) is None
+    # Prefix reads go through the pooled reader and skip the rest of the blob.
+    assert g.read_blob("trunk:README.md") == b"initial\n"
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _branch(git_repo, name: str, path: str, content: str):
+    git_repo.git("checkout", "-b", name, "trunk")
+    git_repo.write(path, content)
+    git_repo.git("add", path)
+    git_repo.git("commit", "-m", f"{name} change")
+    git_repo.git("checkout", "trunk")
+
+
+def test_guard_all_evaluates_every_overlay_and_rolls_up(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    (git_repo.path / ".git" / "info" / "exclude").write_text(".forked/\nforked.yml\n")
+    write_skeleton()
+    cfg = load_config()
+    cfg.guards.sentinels.must_match_upstream = ["api/**"]
+    write_config(cfg)
+    git_repo.write("api/contract.yaml", "base\n")
+    git_repo.git("add", "api/contract.yaml")
+    git_repo.git("commit", "-m", "contract")
+    _branch(git_repo, "overlay/clean", "notes.txt", "fine\n")
+    _branch(git_repo, "overlay/drift", "api/contract.yaml", "changed\n")
+    _branch(git_repo, "patch/other", "api/contract.yaml", "ignored\n")
+
+    result = runner.invoke(app, ["guard", "--all", "--mode", "block", "-j", "2"])
+    assert result.exit_code == 2, result.stdout
+
+    rollup = json.loads(Path(".forked/reports/guard-rollup.json").read_text())
+    assert rollup["exit_code"] == 2
+    entries = {entry["overlay"]: entry for entry in rollup["overlays"]}
+    assert sorted(entries) == ["overlay/clean", "overlay/drift"]
+    assert entries["overlay/clean"]["exit_code"] == 0
+    assert entries["overlay/drift"]["exit_code"] == 2
+    assert entries["overlay/drift"]["violations"] == ["sentinels"]
+    drift = json.loads(Path(entries["overlay/drift"]["report"]).read_text())
+    assert drift["report_version"] == 2
+    assert drift["sentinels"]["must_match_upstream"] == ["api/contract.yaml"]
+
+    log_lines = Path(".forked/logs/forked-guard.log").read_text().splitlines()
+    assert json.loads(log_lines[-1])["event"] == "forked.guard-all"
+
+    result = runner.invoke(app, ["guard", "--all", "--match", "overlay/cl*", "--mode", "block"])
+    assert result.exit_code == 0, result.stdout
+    rollup = json.loads(Path(".forked/reports/guard-rollup.json").read_text())
+    assert [entry["overlay"] for entry in rollup["overlays"]] == ["overlay/clean"]
+    assert rollup["overlays"][0]["cache"] == "hit"
+
+    result = runner.invoke(app, ["guard", "--all", "--overlay", "overlay/clean"])
+    assert result.exit_code == 2
+
+
+def test_guard_all_follows_configured_overlay_prefix(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    (git_repo.path / ".git" / "info" / "exclude").write_text(".forked/\nforked.yml\n")
+    write_skeleton()
+    cfg = load_config()
+    cfg.branches.overlay_prefix = "ovl-"
+    write_config(cfg)
+    _branch(git_repo, "ovl-dev", "notes.txt", "dev\n")
+    _branch(git_repo, "ovl-team/qa", "notes.txt", "qa\n")
+    _branch(git_repo, "overlay/legacy", "notes.txt", "legacy\n")
+
+    result = runner.invoke(app, ["guard", "--all"])
+    assert result.exit_code == 0, result.stdout
+
+    rollup = json.loads(Path(".forked/reports/guard-rollup.json").read_text())
+    assert rollup["pattern"] == "ovl-"
+    assert [entry["overlay"] for entry in rollup["overlays"]] == ["ovl-dev", "ovl-team/qa"]
@@ -0,0 +1,69 @@
+from dataclasses import asdict
+
+from forked import gitutil as g
+from forked.config import Config
+from forked.guards import run_checks
+
+
+def _results(guard_run):
+    return {name: asdict(result) for name, result in guard_run.builtin.items()}
+
+
+def test_guard_cache_hits_and_advances_overlay_incrementally(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    (git_repo.path / ".git" / "info" / "exclude").write_text(".forked/\n")
+    base_text = "".join(f"line {n}\n" for n in range(1, 11))
+    git_repo.write("shared.txt", base_text)
+    git_repo.write("docs/guide.md", base_text)
+    git_repo.write("branding/logo.txt", "upstream\n")
+    git_repo.write("branding/theme.txt", "upstream\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "overlay/dev")
+    git_repo.write("shared.txt", base_text + "overlay\n")
+    git_repo.write("branding/logo.txt", "ours\n")
+    git_repo.git("commit", "-am", "overlay")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("shared.txt", "upstream\n" + base_text)
+    git_repo.git("commit", "-am", "upstream")
+
+    cfg = Config()
+    cfg.guards.sentinels.must_diverge_from_upstream = ["branding/**"]
+    cfg.guards.size_caps.max_loc = 100
+    base = g.merge_base("trunk", "overlay/dev")
+
+    first = run_checks(cfg, "trunk", "overlay/dev", base, verbose=True, use_cache=True)
+    assert first.cache == "miss"
+    again = run_checks(cfg, "trunk", "overlay/dev", base, verbose=True, use_cache=True)
+    assert again.cache == "hit"
+    assert _results(again) == _results(first)
+
+    cfg.guards.size_caps.max_loc = 1
+    reconfigured = run_checks(cfg, "trunk", "overlay/dev", base, verbose=True, use_cache=True)
+    assert reconfigured.cache == "rechecked"
+    assert reconfigured.builtin["size_caps"].violation == {"files": 2, "loc": 3}
+
+    git_repo.git("checkout", "overlay/dev")
+    git_repo.git("mv", "docs/guide.md", "docs/manual.md")
+    git_repo.write("branding/theme.txt", "ours\n")
+    git_repo.write("branding/new.txt", "ours\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "overlay moves on")
+    git_repo.git("checkout", "trunk")
+
+    moved = run_checks(cfg, "trunk", "overlay/dev", base, verbose=True, use_cache=True)
+    fresh = run_checks(cfg, "trunk", "overlay/dev", base, verbose=True)
+    assert moved.cache == "incremental"
+    assert fresh.cache == "off"
+    assert _results(moved) == _results(fresh)
+    assert moved.builtin["sentinels"].debug["matched_must_diverge"] == [
+        "branding/logo.txt",
+        "branding/new.txt",
+        "branding/theme.txt",
+    ]
+
+    git_repo.write("trunk-only.txt", "t\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "trunk moves")
+    new_base = g.merge_base("trunk", "overlay/dev")
+    assert run_checks(cfg, "trunk", "overlay/dev", new_base, use_cache=True).cache == "miss"
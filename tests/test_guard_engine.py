@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forked import gitutil as g
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+from forked.guards import run_checks
+
+runner = CliRunner()
+
+PLUGIN = """
+from forked.guards import CheckResult
+
+
+def todo_markers(context):
+    flagged = [c.path for c in context.diff.overlay_changes if c.path.endswith(".todo")]
+    return CheckResult(report={"files": flagged}, violation=flagged or None)
+"""
+
+
+def _seed(git_repo):
+    base = "".join(f"line {n}\n" for n in range(1, 11))
+    git_repo.write("shared.txt", base)
+    git_repo.write("moved.txt", base)
+    git_repo.write("vendor/lib.txt", "upstream\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("checkout", "-b", "overlay/dev")
+    git_repo.write("shared.txt", base + "overlay\n")
+    git_repo.git("mv", "moved.txt", "renamed.txt")
+    git_repo.write("notes.todo", "later\n")
+    git_repo.write("image.bin", "\0\1\2")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "overlay")
+    git_repo.git("checkout", "trunk")
+    git_repo.write("shared.txt", "upstream\n" + base)
+    git_repo.git("commit", "-am", "upstream")
+
+
+def test_engine_matches_per_check_git_queries_with_one_diff(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _seed(git_repo)
+    write_skeleton()
+    cfg = load_config()
+    cfg.guards.size_caps.max_files = 1
+    cfg.guards.sentinels.must_match_upstream = ["vendor/**", "renamed.txt"]
+    base = g.merge_base("trunk", "overlay/dev")
+
+    diff_calls = []
+    real_run = g.sp.run
+
+    def _counting_run(args, *rest, **kwargs):
+        if args[:2] == ["git", "diff-tree"] or args[:2] == ["git", "diff"]:
+            diff_calls.append(args[1])
+        return real_run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(g.sp, "run", _counting_run)
+    guard_run = run_checks(cfg, "trunk", "overlay/dev", base)
+    builtins, plugins = guard_run.builtin, guard_run.plugins
+
+    assert diff_calls == ["diff-tree"]
+    assert plugins == {}
+    assert builtins["both_touched"].report == sorted(
+        set(g.changed_paths(base, "trunk")) & set(g.changed_paths(base, "overlay/dev"))
+    )
+    numstat = g.run(["diff", "--numstat", "trunk...overlay/dev"]).stdout.splitlines()
+    loc = sum(int(part) for line in numstat for part in line.split("\t")[:2] if part.isdigit())
+    assert builtins["size_caps"].report == {
+        "files_changed": len(numstat),
+        "loc": loc,
+        "violations": True,
+    }
+    assert builtins["sentinels"].report["must_match_upstream"] == ["renamed.txt"]
+
+
+def test_guard_runs_user_plugins_from_config(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _seed(git_repo)
+    Path("forked_guard_plugin_test.py").write_text(PLUGIN)
+    write_skeleton()
+    cfg = load_config()
+    cfg.guards.plugins = {"todo": "forked_guard_plugin_test:todo_markers"}
+    write_config(cfg)
+
+    result = runner.invoke(app, ["guard", "--overlay", "overlay/dev", "--mode", "block"])
+    assert result.exit_code == 2, result.stdout
+
+    payload = json.loads(Path(".forked/report.json").read_text())
+    assert payload["report_version"] == 2
+    assert payload["both_touched"] == ["shared.txt"]
+    assert payload["checks"] == {"todo": {"files": ["notes.todo"]}}
+    assert payload["violations"]["todo"] == ["notes.todo"]
+
+    cfg.guards.plugins = {"broken": "forked_guard_plugin_test:missing"}
+    write_config(cfg)
+    result = runner.invoke(app, ["guard", "--overlay", "overlay/dev"])
+    assert result.exit_code == 3
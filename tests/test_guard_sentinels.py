@@ -0,0 +1,42 @@
+from forked.config import Config
+from forked.guards import sentinels
+
+
+def test_sentinels_merge_join_classifies_paths(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.write("config/same.yml", "same\n")
+    git_repo.write("config/changed.yml", "base\n")
+    git_repo.write("config/trunk-only.yml", "trunk\n")
+    git_repo.write("branding/logo.txt", "upstream\n")
+    git_repo.write("branding/untouched.txt", "upstream\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "seed")
+
+    git_repo.git("checkout", "-b", "overlay/dev")
+    git_repo.write("config/changed.yml", "overlay\n")
+    git_repo.write("config/overlay-only.yml", "overlay\n")
+    git_repo.git("rm", "-q", "config/trunk-only.yml")
+    git_repo.write("branding/logo.txt", "ours\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "overlay changes")
+    git_repo.git("checkout", "trunk")
+
+    cfg = Config()
+    cfg.guards.sentinels.must_match_upstream = ["config/**"]
+    cfg.guards.sentinels.must_diverge_from_upstream = ["branding/**"]
+
+    result, debug = sentinels(cfg, "trunk", "overlay/dev", return_debug=True)
+
+    assert result["must_match_upstream"] == [
+        "config/changed.yml",
+        "config/overlay-only.yml",
+        "config/trunk-only.yml",
+    ]
+    assert result["must_diverge_from_upstream"] == ["branding/untouched.txt"]
+    assert debug["matched_must_match"] == [
+        "config/changed.yml",
+        "config/overlay-only.yml",
+        "config/same.yml",
+        "config/trunk-only.yml",
+    ]
+    assert debug["matched_must_diverge"] == ["branding/logo.txt", "branding/untouched.txt"]
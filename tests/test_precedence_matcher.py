@@ -0,0 +1,61 @@
+from fnmatch import fnmatch
+
+from forked.config import Config, Feature, Sentinels
+from forked.conflicts import precedence_matcher, precedence_payload
+
+
+def _reference(cfg: Config, path: str, feature_names: list[str]) -> tuple[str, str, str]:
+    """The original rule-by-rule fnmatch walk."""
+    must_match = list(cfg.guards.sentinels.must_match_upstream)
+    must_diverge = list(cfg.guards.sentinels.must_diverge_from_upstream)
+    for name in feature_names:
+        must_match.extend(cfg.features[name].sentinels.must_match_upstream)
+        must_diverge.extend(cfg.features[name].sentinels.must_diverge_from_upstream)
+    if any(fnmatch(path, p) for p in must_match):
+        return "must_match_upstream", "none", "ours"
+    if any(fnmatch(path, p) for p in must_diverge):
+        return "must_diverge_from_upstream", "none", "theirs"
+    if any(fnmatch(path, p) for p in cfg.path_bias.ours):
+        return "none", "ours", "ours"
+    if any(fnmatch(path, p) for p in cfg.path_bias.theirs):
+        return "none", "theirs", "theirs"
+    return "none", "none", "none"
+
+
+def test_compiled_matcher_agrees_with_fnmatch_rule_walk():
+    cfg = Config()
+    cfg.guards.sentinels.must_match_upstream = ["api/contracts/**"]
+    cfg.guards.sentinels.must_diverge_from_upstream = ["branding/*.svg"]
+    cfg.path_bias.ours = ["config/forked/**", "*.lock", "docs/[a-c]*.md"]
+    cfg.path_bias.theirs = ["vendor/**", "*.lock", "api/**"]
+    cfg.features = {
+        "pay": Feature(sentinels=Sentinels(must_diverge_from_upstream=["vendor/pay/*"])),
+    }
+    paths = [
+        "api/contracts/v1.yaml",
+        "api/other.yaml",
+        "branding/logo.svg",
+        "branding/nested/logo.svg",
+        "config/forked/app.toml",
+        "poetry.lock",
+        "sub/yarn.lock",
+        "docs/alpha.md",
+        "docs/zeta.md",
+        "vendor/pay/sdk.py",
+        "vendor/lib/x.py",
+        "src/main.py",
+        "weird[1].txt",
+    ]
+    for features in ([], ["pay"]):
+        matcher = precedence_matcher(cfg, features)
+        assert precedence_matcher(cfg, features) is matcher
+        for path in paths:
+            payload = precedence_payload(cfg, path, features, matcher)
+            got = (payload["sentinel"], payload["path_bias"], payload["recommended"])
+            assert got == _reference(cfg, path, features), (features, path)
+
+
+def test_matcher_without_rules_matches_nothing():
+    payload = precedence_payload(Config(), "anything.txt", [])
+    assert payload["recommended"] == "none"
+    assert payload["rationale"] == "no sentinel or path bias matched"
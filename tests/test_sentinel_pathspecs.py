@@ -0,0 +1,104 @@
+from forked import gitutil as g
+from forked.config import Config
+from forked.guards import GuardDiff, _make_spec, glob_pathspecs, sentinels
+
+
+def _tree(git_repo) -> str:
+    return git_repo.git("rev-parse", "HEAD^{tree}", capture_output=True).stdout.strip()
+
+
+PATHS = [
+    "config/app.yml",
+    "config/nested/db.yml",
+    "services/api/config/app.yml",
+    "services/api/config.yml",
+    "docs/readme.md",
+    "docs/config",
+    "branding/logo.svg",
+    "branding/theme/colors.css",
+    "src/pkg/module.py",
+    "src/pkg/generated_pb2.py",
+    "a b/space file.txt",
+    "top.txt",
+]
+
+PATTERNS = [
+    ["config/**"],
+    ["config/"],
+    ["config"],
+    ["/config"],
+    ["**/config/**"],
+    ["*.yml"],
+    ["src/**/*.py", "!src/**/*_pb2.py"],
+    ["branding/*"],
+    ["docs/*.md", "top.txt"],
+    ["a b/*"],
+    ["services/**/app.yml"],
+    ["?op.txt"],
+    ["br[a-z]nding/**"],
+]
+
+
+def test_glob_pathspecs_list_every_python_match(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    for path in PATHS:
+        git_repo.write(path, f"{path}\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "tree")
+    tree = _tree(git_repo)
+    every = g.tree_paths(tree)
+
+    for patterns in PATTERNS:
+        specs = glob_pathspecs(patterns)
+        assert specs, patterns
+        spec = _make_spec(patterns)
+        expected = sorted(path for path in every if spec.match_file(path))
+        candidates = g.tree_paths(tree, specs)
+        assert set(candidates) <= set(every)
+        assert sorted(path for path in candidates if spec.match_file(path)) == expected, patterns
+
+
+def test_untranslatable_globs_fall_back_to_full_listing(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    for patterns in (["conf**"], ["**.yml"], ["\\#literal"], ["[[:alpha:]]*"], [" padded"]):
+        assert glob_pathspecs(patterns) is None, patterns
+    assert glob_pathspecs(["# comment", "", "!keep.txt"]) == []
+
+    git_repo.write("config.yml", "base\n")
+    git_repo.write("other/config.yml", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    git_repo.git("branch", "overlay/dev")
+    cfg = Config()
+    cfg.guards.sentinels.must_diverge_from_upstream = ["**config.yml"]
+    report, debug = sentinels(cfg, "trunk", "overlay/dev", return_debug=True)
+    assert report["must_diverge_from_upstream"] == ["config.yml", "other/config.yml"]
+    assert debug["matched_must_diverge"] == ["config.yml", "other/config.yml"]
+
+
+def test_advanced_diff_keeps_sentinel_matches(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    git_repo.write("config/app.yml", "base\n")
+    git_repo.write("src/main.py", "base\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "base")
+    base_tree = _tree(git_repo)
+    diff = GuardDiff.from_trees(base_tree, base_tree, base_tree)
+    assert diff.overlay_matches(["config/**"]) == ["config/app.yml"]
+    assert diff.overlay_matches(["**.yml"]) == ["config/app.yml"]
+
+    git_repo.git("rm", "-q", "config/app.yml")
+    git_repo.write("config/new.yml", "new\n")
+    git_repo.write("src/extra.txt", "new\n")
+    git_repo.git("add", ".")
+    git_repo.git("commit", "-m", "move")
+    advanced = diff.advance(_tree(git_repo))
+    assert advanced is not None
+    assert advanced.overlay_matches(["config/**"]) == ["config/new.yml"]
+    # Only matched paths are kept, even for globs that fall back to a full listing.
+    assert advanced.to_dict()["overlay_matches"] == {
+        "config/**": ["config/new.yml"],
+        "**.yml": ["config/new.yml"],
+    }
+    restored = GuardDiff.from_dict(advanced.to_dict())
+    assert restored.overlay_matches(["**.yml"]) == ["config/new.yml"]
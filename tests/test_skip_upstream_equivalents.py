@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from forked.build import _upstream_equivalent_commits, build_overlay
@@ -33,3 +34,21 @@ def test_skip_upstream_equivalents_omits_duplicate_commits(git_repo, monkeypatch
     overlay_branch = telemetry["overlay"]
     overlay_tip = Path(".git") / "refs" / "heads" / overlay_branch
     assert overlay_tip.exists()
+
+
+def test_patch_id_index_is_reused_across_plans(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    _prepare_feature_branch(git_repo)
+
+    first = _upstream_equivalent_commits("trunk", "patch/payments/01")
+    index = json.loads(Path(".forked/cache/patch-ids.json").read_text())["patch_ids"]
+    assert len(index) == 3
+
+    git_repo.git("checkout", "trunk")
+    git_repo.write("later.txt", "later\n")
+    git_repo.git("add", "later.txt")
+    git_repo.git("commit", "-m", "trunk advances")
+
+    assert _upstream_equivalent_commits("trunk", "patch/payments/01") == first
+    index = json.loads(Path(".forked/cache/patch-ids.json").read_text())["patch_ids"]
+    assert len(index) == 4
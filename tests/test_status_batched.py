@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from forked import gitutil as g
+from forked.cli import app
+from forked.config import load_config, write_config, write_skeleton
+
+runner = CliRunner()
+
+
+def _commit(git_repo, path: str, content: str):
+    git_repo.write(path, content)
+    git_repo.git("add", path)
+    git_repo.git("commit", "-q", "-m", f"edit {path}")
+
+
+def _seed(git_repo) -> dict[str, str]:
+    _commit(git_repo, "a.txt", "base\n")
+    git_repo.git("branch", "patch/old")
+    git_repo.git("branch", "patch/same")
+    git_repo.git("checkout", "-q", "-b", "patch/ahead")
+    _commit(git_repo, "b.txt", "one\n")
+    _commit(git_repo, "b.txt", "two\n")
+    git_repo.git("checkout", "-q", "trunk")
+    for n in range(3):
+        _commit(git_repo, "a.txt", f"trunk {n}\n")
+    git_repo.git("checkout", "-q", "-b", "patch/merged", "patch/ahead")
+    git_repo.git("merge", "-q", "--no-edit", "trunk")
+    _commit(git_repo, "c.txt", "after merge\n")
+    git_repo.git("checkout", "-q", "--orphan", "patch/unrelated")
+    _commit(git_repo, "d.txt", "unrelated\n")
+    git_repo.git("checkout", "-q", "trunk")
+    refs = g.ref_snapshot(["refs/heads/patch/"])
+    return {refname: oid for refname, (oid, _) in refs.items()}
+
+
+@pytest.mark.parametrize("version", [(2, 39, 0), None])
+def test_ahead_behind_matches_rev_list_counts(git_repo, monkeypatch, version):
+    monkeypatch.chdir(git_repo.path)
+    tips = _seed(git_repo)
+    if version is not None:
+        monkeypatch.setattr(g, "git_version", lambda: version)
+    elif g.git_version() < (2, 41, 0):
+        pytest.skip("%(ahead-behind) needs git 2.41")
+    trunk = git_repo.git("rev-parse", "trunk", capture_output=True).stdout.strip()
+
+    counts = g.ahead_behind(trunk, tips)
+
+    expected = {}
+    for refname in tips:
+        out = git_repo.git(
+            "rev-list", "--left-right", "--count", f"trunk...{refname}", capture_output=True
+        )
+        behind, ahead = out.stdout.split()
+        expected[refname] = (int(ahead), int(behind))
+    assert counts == expected
+    assert counts["refs/heads/patch/same"] == (0, 3)
+
+
+def test_status_git_calls_do_not_grow_with_patches(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    (git_repo.path / ".git" / "info" / "exclude").write_text("forked.yml\n")
+    tips = _seed(git_repo)
+    write_skeleton()
+    cfg = load_config()
+
+    calls: list[list[str]] = []
+    real_run = g.sp.run
+
+    def _counting_run(args, *rest, **kwargs):
+        if args[0] == "git":
+            calls.append(args)
+        return real_run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(g.sp, "run", _counting_run)
+    totals = []
+    for order in (["patch/ahead"], [name.removeprefix("refs/heads/") for name in tips]):
+        cfg.patches.order = [*order, "patch/missing"]
+        write_config(cfg)
+        calls.clear()
+        result = runner.invoke(app, ["status", "--json"])
+        assert result.exit_code == 0, result.stdout
+        totals.append(len(calls))
+
+    assert totals[0] == totals[1]
+    payload = json.loads(result.stdout[result.stdout.index("{") :])
+    patches = {entry["name"]: entry for entry in payload["patches"]}
+    assert (patches["patch/merged"]["ahead"], patches["patch/merged"]["behind"]) == (4, 0)
+    assert patches["patch/missing"]["sha"] is None
+
+
+def test_status_resolves_patches_that_are_not_local_branches(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo.path)
+    (git_repo.path / ".git" / "info" / "exclude").write_text("forked.yml\n")
+    tips = _seed(git_repo)
+    git_repo.git("push", "-q", "upstream", "patch/ahead:patch/remote-only")
+    git_repo.git("fetch", "-q", "upstream")
+    git_repo.git("tag", "patch-tag", "patch/merged")
+    write_skeleton()
+    cfg = load_config()
+    cfg.patches.order = ["patch/ahead", "upstream/patch/remote-only", "patch-tag"]
+    write_config(cfg)
+
+    result = runner.invoke(app, ["status", "--json"])
+    assert result.exit_code == 0, result.stdout
+    payload = json.loads(result.stdout[result.stdout.index("{") :])
+    patches = {entry["name"]: entry for entry in payload["patches"]}
+    assert patches["upstream/patch/remote-only"]["sha"] == tips["refs/heads/patch/ahead"]
+    assert (patches["upstream/patch/remote-only"]["ahead"], patches["patch-tag"]["ahead"]) == (2, 4)
+    assert patches["patch-tag"]["sha"] == tips["refs/heads/patch/merged"]
+    assert patches["patch-tag"]["behind"] == 0